@@ -1,371 +1,33 @@
 import streamlit as st
-import pandas as pd
-import re
-import io
-import requests
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm, mm
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
-
-# Matplotlib Backend Fix
-plt_backend = 'Agg'
-try:
-    import matplotlib.pyplot as plt
-    plt.switch_backend(plt_backend)
-except:
-    pass
+from functools import partial
+from hesaplama import MODEL_DERINLIKLERI, siniflandirici, manuel_hesapla
+from onbellek import belge_onbellegi, girdi_ozeti
+from olcumleme import Olcer, arka_plan, OLCUM_LOGU
+
+# Açılışta yalnızca hesaplama çekirdeği yüklenir. pandas, ReportLab, openpyxl / xlrd ilk
+# kullanıldıkları anda içe aktarılır; manuel hesaplayıcı bunların hiçbirini beklemez.
+# (ithalat_butcesi.py açılış süresini ve bu kuralı denetler)
+
+def belge_olusturucu(ad):
+    # belgeler modülü (ReportLab) ilk belge istendiğinde yüklenir
+    # İndirme anında (çalıştırma dışında) üretildiği için süresi arka plan ölçerine yazılır
+    def olustur(*girdiler):
+        with arka_plan.asama(ad) as kayit:
+            import belgeler
+            sonuc = getattr(belgeler, ad)(*girdiler)
+            if kayit is not None: kayit['bayt'] = sonuc.getbuffer().nbytes
+        return sonuc
+    return olustur
 
 # =============================================================================
 # 1. AYARLAR
 # =============================================================================
 st.set_page_config(page_title="Nixrad Operasyon", layout="wide")
 
-AYARLAR = {
-    'HAVLUPAN': {'PAY_GENISLIK': 1.5, 'PAY_YUKSEKLIK': 0.5, 'PAY_DERINLIK': 0.5},
-    'RADYATOR': {'PAY_GENISLIK': 3.5, 'PAY_YUKSEKLIK': 0.5, 'PAY_DERINLIK': 3.0}
-}
-
-MODEL_DERINLIKLERI = {
-    'nirvana': 5.0, 'kumbaros': 4.5, 'floransa': 4.8, 'prag': 4.0,
-    'lizyantus': 4.0, 'lisa': 4.5, 'akasya': 4.0, 'hazal': 3.0,
-    'aspar': 4.0, 'livara': 4.5, 'livera': 4.5
-}
-
-ZORUNLU_HAVLUPANLAR = ['hazal', 'lisa', 'lizyantus', 'kumbaros']
-
-MODEL_AGIRLIKLARI = {
-    'nirvana': 1.10, 'prag': 0.71, 'livara': 0.81, 'livera': 0.81,
-    'akasya': 0.75, 'aspar': 1.05, 'lizyantus': 0.750, 'kumbaros': 0.856
-}
-
-HAVLUPAN_BORU_CETVELI = {
-    'lizyantus': {70: 6, 100: 8, 120: 10, 150: 12},
-    'kumbaros': {70: 5, 100: 7, 120: 8, 150: 10}
-}
-
-RENKLER = ["BEYAZ", "ANTRASIT", "SIYAH", "KROM", "ALTIN", "GRI", "KIRMIZI", "BRONZ", "INOX", "MAT SIYAH", "MAT BEYAZ", "RAL"]
-
-# =============================================================================
-# 2. YARDIMCI FONKSİYONLAR
-# =============================================================================
-
-def tr_clean_for_pdf(text):
-    if not isinstance(text, str): return str(text)
-    text = text.replace('\n', '<br/>')
-    mapping = {'ğ': 'g', 'Ğ': 'G', 'ş': 's', 'Ş': 'S', 'ı': 'i', 'İ': 'I', 'ç': 'c', 'Ç': 'C', 'ö': 'o', 'Ö': 'O', 'ü': 'u', 'Ü': 'U'}
-    for k, v in mapping.items(): text = text.replace(k, v)
-    return text
-
-def tr_lower(text): return text.replace('İ', 'i').replace('I', 'ı').lower()
-def tr_upper(text): return text.replace('i', 'İ').replace('ı', 'I').upper()
-
-def isim_kisalt(stok_adi):
-    return tr_clean_for_pdf(tr_upper(stok_adi).strip())
-
-def get_standart_paket_icerigi(tip, model_adi):
-    amb = "GENEL AMBALAJLAMA (Karton+ balon + Strec)"
-    if tip == 'HAVLUPAN': return [(1, "Adet", "1/2 PURJOR"), (1, "Takim", "3 LU HAVLUPAN MONTAJ SETI"), (3, "Adet", "DUBEL"), (3, "Adet", "MONTAJ VIDASI"), (1, "Set", amb)]
-    else:
-        ayak = f"{tr_clean_for_pdf(model_adi)} AYAK TAKIMI" if model_adi != "STANDART" else "RADYATOR AYAK TAKIMI"
-        return [(1, "Adet", "1/2 KOR TAPA"), (1, "Adet", "1/2 PURJOR"), (1, "Takim", ayak), (8, "Adet", "DUBEL"), (8, "Adet", "MONTAJ VIDASI"), (1, "Set", amb)]
-
-def agirlik_hesapla(stok_adi, genislik_cm, yukseklik_cm, model_key):
-    if model_key not in MODEL_AGIRLIKLARI: return 0
-    
-    if model_key not in ['lizyantus', 'kumbaros']:
-        dilim_match = re.search(r'(\d+)\s*DILIM', tr_upper(stok_adi))
-        if dilim_match: dilim_sayisi = int(dilim_match.group(1))
-        else:
-            if model_key in ['nirvana', 'prag']: dilim_sayisi = round((genislik_cm + 1) / 8)
-            elif model_key == 'akasya': dilim_sayisi = round((genislik_cm + 3) / 6)
-            elif model_key in ['livara', 'livera']: dilim_sayisi = round((genislik_cm + 0.5) / 6)
-            elif model_key == 'aspar': dilim_sayisi = round((genislik_cm + 1) / 10)
-            else: return 0
-        kg_per_dilim = (yukseklik_cm / 60) * MODEL_AGIRLIKLARI[model_key]
-        return round(dilim_sayisi * kg_per_dilim, 2)
-    else:
-        boru_sayisi = 0
-        if model_key in HAVLUPAN_BORU_CETVELI:
-            if int(yukseklik_cm) in HAVLUPAN_BORU_CETVELI[model_key]:
-                boru_sayisi = HAVLUPAN_BORU_CETVELI[model_key][int(yukseklik_cm)]
-            else:
-                div = 12.5 if model_key == 'lizyantus' else 15.0
-                boru_sayisi = round(yukseklik_cm / div)
-        else: boru_sayisi = round(yukseklik_cm / 7.5)
-        ref_agirlik = MODEL_AGIRLIKLARI.get(model_key, 0)
-        genislik_katsayisi = genislik_cm / 50.0
-        agirlik = boru_sayisi * ref_agirlik * genislik_katsayisi
-        return round(agirlik, 2)
-
-def hesapla_ve_analiz_et(stok_adi, adet):
-    if not isinstance(stok_adi, str): return None
-    stok_adi_islenen = tr_lower(stok_adi)
-    base_derinlik, bulunan_model_key = 4.5, "standart"
-    bulunan_model_adi = "Standart"
-    for model, derinlik in MODEL_DERINLIKLERI.items():
-        if model in stok_adi_islenen:
-            base_derinlik, bulunan_model_key = derinlik, model
-            bulunan_model_adi = "Livara" if model == 'livera' else model.capitalize()
-            break
-    
-    is_havlupan_name = 'havlupan' in stok_adi_islenen or any(z in stok_adi_islenen for z in ZORUNLU_HAVLUPANLAR)
-    tip = 'HAVLUPAN' if is_havlupan_name else 'RADYATOR'
-    
-    reçete = get_standart_paket_icerigi(tip, tr_upper(bulunan_model_adi))
-    
-    paylar = AYARLAR[tip].copy()
-    if bulunan_model_key == 'prag':
-        paylar['PAY_DERINLIK'] = 2.0
-
-    boyutlar = re.search(r'(\d+)\s*[/xX]\s*(\d+)', stok_adi)
-    
-    if boyutlar:
-        v1, v2 = int(boyutlar.group(1)) / 10, int(boyutlar.group(2)) / 10
-        if tip == 'HAVLUPAN': genislik, yukseklik = v1, v2
-        else: yukseklik, genislik = v1, v2
-            
-        k_en, k_boy, k_derin = genislik + paylar['PAY_GENISLIK'], yukseklik + paylar['PAY_YUKSEKLIK'], base_derinlik + paylar['PAY_DERINLIK']
-        desi = round((k_en * k_boy * k_derin) / 3000, 2)
-        agirlik_sonuc = agirlik_hesapla(stok_adi, genislik, yukseklik, bulunan_model_key)
-        
-        return {
-            'Adet': int(adet), 
-            'Reçete': reçete,
-            'Etiket': {'kisa_isim': isim_kisalt(stok_adi), 'boyut_str': f"{k_en}x{k_boy}x{k_derin}cm", 'desi_val': desi},
-            'Toplam_Desi': desi * adet, 
-            'Toplam_Agirlik': agirlik_sonuc * adet,
-            'Ürün': isim_kisalt(stok_adi),
-            'Ölçü': f"{k_en}x{k_boy}x{k_derin}cm",
-            'Birim_Desi': desi,
-            'Toplam_Agirlik_Gosterim': round(agirlik_sonuc * adet, 1)
-        }
-    return None
-
-def manuel_hesapla(model_secimi, genislik, yukseklik, adet=1):
-    model_lower = model_secimi.lower()
-    is_h = 'havlupan' in model_lower or any(z in model_lower for z in ZORUNLU_HAVLUPANLAR)
-    tip = 'HAVLUPAN' if is_h else 'RADYATOR'
-    base_derinlik, model_key = 4.5, "standart"
-    for m_key, m_val in MODEL_DERINLIKLERI.items():
-        if m_key in model_lower: base_derinlik, model_key = m_val, m_key; break
-    
-    paylar = AYARLAR[tip].copy()
-    if 'prag' in model_lower:
-        paylar['PAY_DERINLIK'] = 2.0
-    
-    k_en, k_boy, k_derin = genislik + paylar['PAY_GENISLIK'], yukseklik + paylar['PAY_YUKSEKLIK'], base_derinlik + paylar['PAY_DERINLIK']
-    desi = round((k_en * k_boy * k_derin) / 3000, 2)
-    birim_kg = agirlik_hesapla("", genislik, yukseklik, model_key)
-    return desi, f"{k_en}x{k_boy}x{k_derin}cm", round(birim_kg * adet, 2)
-
-# =============================================================================
-# PDF FONKSİYONLARI
-# =============================================================================
-def create_cargo_pdf(proje_toplam_desi, toplam_parca, musteri_bilgileri, etiket_listesi):
-    buffer = io.BytesIO(); doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=1*cm, leftMargin=1*cm, topMargin=1*cm, bottomMargin=1*cm); elements = []
-    styles = getSampleStyleSheet()
-    style_normal = ParagraphStyle('n', parent=styles['Normal'], fontSize=10, leading=12)
-    style_header = ParagraphStyle('h', parent=styles['Normal'], fontSize=14, leading=16, fontName='Helvetica-Bold', textColor=colors.darkred)
-    gonderen_info = [Paragraph("<b>GONDEREN FIRMA:</b>", style_normal), Paragraph("NIXRAD / KARPAN DIZAYN A.S.", style_header), Paragraph("Yeni Cami OSB Mah. 3.Cad. No:1 Kavak/SAMSUN", style_normal), Paragraph("Tel: 0262 658 11 58", style_normal)]
-    odeme_clean = tr_clean_for_pdf(musteri_bilgileri.get('ODEME_TIPI', 'ALICI'))
-    odeme_info = [Paragraph("<b>ODEME TIPI:</b>", style_normal), Spacer(1, 0.5*cm), Paragraph(f"<b>{odeme_clean} ODEMELI</b>", ParagraphStyle('big', fontSize=14, alignment=TA_CENTER, fontName='Helvetica-Bold'))]
-    t_header = Table([[gonderen_info, odeme_info]], colWidths=[13*cm, 6*cm], style=TableStyle([('BOX', (0,0), (-1,-1), 1, colors.black), ('GRID', (0,0), (-1,-1), 1, colors.black), ('VALIGN', (0,0), (-1,-1), 'TOP'), ('PADDING', (0,0), (-1,-1), 8), ('BACKGROUND', (0,0), (-1,-1), colors.whitesmoke)]))
-    elements.append(t_header); elements.append(Spacer(1, 0.5*cm))
-    alici_ad = tr_clean_for_pdf(musteri_bilgileri.get('AD_SOYAD', '.....'))
-    alici_tel = musteri_bilgileri.get('TELEFON', '.....')
-    
-    clean_adres = tr_clean_for_pdf(musteri_bilgileri.get('ADRES', 'Adres Girilmedi'))
-    a4_il_ilce = tr_clean_for_pdf(musteri_bilgileri.get('IL_ILCE', ''))
-    if a4_il_ilce:
-        clean_adres += f"<br/><b>{a4_il_ilce.upper()}</b>"
-
-    alici_content = [Paragraph("<b>ALICI MUSTERI:</b>", style_normal), Paragraph(f"<b>{alici_ad}</b>", ParagraphStyle('alici_ad_huge', fontSize=22, leading=26, fontName='Helvetica-Bold', spaceBefore=6, spaceAfter=12)), Paragraph(f"<b>Tel:</b> {alici_tel}", ParagraphStyle('tel_big', fontSize=12, leading=14)), Spacer(1, 0.5*cm), Paragraph(f"<b>ADRES:</b><br/>{clean_adres}", ParagraphStyle('adres_style_big', fontSize=15, leading=20))]
-    t_alici = Table([[alici_content]], colWidths=[19*cm], style=TableStyle([('BOX', (0,0), (-1,-1), 2, colors.black), ('PADDING', (0,0), (-1,-1), 15)]))
-    elements.append(t_alici); elements.append(Spacer(1, 0.5*cm))
-    elements.append(Paragraph("<b>PAKET ICERIK OZETI:</b>", ParagraphStyle('b', fontSize=10, fontName='Helvetica-Bold'))); elements.append(Spacer(1, 0.2*cm))
-    
-    pkt_data = [['Koli No', 'Urun Adi', 'Olcu', 'Desi']] + [[f"#{p['sira_no']}", tr_clean_for_pdf(p['kisa_isim']), p['boyut_str'], str(p['desi_val'])] for i, p in enumerate(etiket_listesi) if i < 15]
-    
-    t_pkt = Table(pkt_data, colWidths=[2*cm, 11*cm, 4*cm, 2*cm], style=TableStyle([('GRID', (0,0), (-1,-1), 0.5, colors.grey), ('BACKGROUND', (0,0), (-1,0), colors.lightgrey), ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'), ('ALIGN', (0,0), (-1,-1), 'LEFT'), ('FONTSIZE', (0,0), (-1,-1), 9)]))
-    elements.append(t_pkt); elements.append(Spacer(1, 0.5*cm))
-    summary_data = [[f"TOPLAM PARCA: {toplam_parca}", f"TOPLAM DESI: {proje_toplam_desi:.2f}"]]
-    t_sum = Table(summary_data, colWidths=[9.5*cm, 9.5*cm], style=TableStyle([('ALIGN', (0,0), (0,0), 'LEFT'), ('ALIGN', (1,0), (1,0), 'RIGHT'), ('FONTNAME', (0,0), (-1,-1), 'Helvetica-Bold'), ('FONTSIZE', (0,0), (-1,-1), 14), ('TEXTCOLOR', (1,0), (1,0), colors.blue), ('LINEBELOW', (0,0), (-1,-1), 2, colors.black)]))
-    elements.append(t_sum); elements.append(Spacer(1, 1*cm))
-    
-    warning_title = Paragraph("<b>DIKKAT KIRILIR !</b>", ParagraphStyle('WT', fontSize=26, alignment=TA_CENTER, textColor=colors.white, fontName='Helvetica-Bold'))
-    warning_text = """SAYIN MUSTERIMIZ,<br/>GELEN KARGONUZUN BULUNDUGU PAKETLERIN SAGLAM VE PAKETLERDE EZIKLIK OLMADIGINI KONTROL EDEREK ALINIZ. EKSIK VEYA HASARLI MALZEME VARSA LUTFEN KARGO GOREVLISINE AYNI GUN TUTANAK TUTTURUNUZ."""
-    warning_para = Paragraph(warning_text, ParagraphStyle('warn', alignment=TA_CENTER, textColor=colors.white, fontSize=11, leading=14, fontName='Helvetica-Bold'))
-    t_warn = Table([[warning_title], [warning_para]], colWidths=[19*cm], style=TableStyle([('BACKGROUND', (0,0), (-1,-1), colors.black), ('BOX', (0,0), (-1,-1), 1, colors.black), ('ALIGN', (0,0), (-1,-1), 'CENTER'), ('PADDING', (0,0), (-1,-1), 10), ('BOTTOMPADDING', (0,0), (-1,0), 10)]))
-    elements.append(t_warn)
-    doc.build(elements); buffer.seek(0); return buffer
-
-def create_production_pdf(tum_malzemeler, etiket_listesi, musteri_bilgileri):
-    buffer = io.BytesIO(); doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=0.5*cm, leftMargin=0.5*cm, topMargin=1*cm, bottomMargin=1*cm); elements = []
-    styles = getSampleStyleSheet()
-    cust_name = tr_clean_for_pdf(musteri_bilgileri.get('AD_SOYAD', 'Isim Girilmedi'))
-    elements.append(Paragraph(f"URETIM & PAKETLEME EMRI - {cust_name}", ParagraphStyle('Title', fontSize=16, alignment=TA_CENTER, fontName='Helvetica-Bold', spaceAfter=15)))
-    data = [['MALZEME ADI', 'ADET', 'KONTROL']] + [[Paragraph(tr_clean_for_pdf(m), ParagraphStyle('malz_style', fontSize=10, fontName='Helvetica')), f"{int(v)}" if v%1==0 else f"{v:.1f}", "___"] for m, v in tum_malzemeler.items()]
-    t = Table(data, colWidths=[14*cm, 2*cm, 3*cm], style=TableStyle([('GRID', (0,0), (-1,-1), 1, colors.black), ('BACKGROUND', (0,0), (-1,0), colors.lightgrey), ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'), ('ALIGN', (1,0), (-1,-1), 'CENTER'), ('ALIGN', (2,0), (-1,-1), 'CENTER'), ('VALIGN', (0,0), (-1,-1), 'MIDDLE'), ('PADDING', (0,0), (-1,-1), 6)]))
-    elements.append(t); elements.append(Spacer(1, 1*cm))
-    signature_data = [["PAKETLEYEN PERSONEL", "", ""], ["Adi Soyadi: ....................................", "", ""], ["Imza: ....................................", "", ""]]
-    t_sig = Table(signature_data, colWidths=[8*cm, 2*cm, 8*cm], style=TableStyle([('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'), ('ALIGN', (0,0), (-1,-1), 'LEFT'), ('BOTTOMPADDING', (0,0), (-1,-1), 10)]))
-    elements.append(t_sig); elements.append(Spacer(1, 0.5*cm)); elements.append(Paragraph("-" * 120, ParagraphStyle('sep', alignment=TA_CENTER))); elements.append(Paragraph("ASAGIDAKI ETIKETLERI KESIP KOLILERE YAPISTIRINIZ (6x6 cm)", ParagraphStyle('Small', fontSize=8, alignment=TA_CENTER))); elements.append(Spacer(1, 0.5*cm))
-    
-    sticker_data, row = [], []
-    style_num = ParagraphStyle('n', parent=styles['Normal'], alignment=TA_RIGHT, fontSize=14, textColor=colors.black, fontName='Helvetica-Bold')
-    style_cust = ParagraphStyle('c_bold', alignment=TA_CENTER, fontSize=10, fontName='Helvetica-Bold', textColor=colors.black)
-    
-    for p in etiket_listesi:
-        isim, boyut, desi, no = tr_clean_for_pdf(p['kisa_isim']), p['boyut_str'], str(p['desi_val']), str(p['sira_no'])
-        cust_short = tr_clean_for_pdf(musteri_bilgileri.get('AD_SOYAD', '')[:25])
-        content = [[Paragraph(f"<b>#{no}</b>", style_num)], [Paragraph(f"<b>{isim}</b>", ParagraphStyle('C', alignment=TA_CENTER, fontSize=9))], [Paragraph(f"{boyut}", ParagraphStyle('C', alignment=TA_CENTER, fontSize=8))], [Spacer(1, 0.2*cm)], [Paragraph(f"<b>Desi: {desi}</b>", ParagraphStyle('L', alignment=TA_LEFT, fontSize=11))], [Paragraph(f"<b>{cust_short}</b>", style_cust)]]
-        box = Table(content, colWidths=[5.8*cm], rowHeights=[0.8*cm, 1.2*cm, 0.5*cm, 0.5*cm, 0.8*cm, 0.5*cm], style=TableStyle([('BOX', (0,0), (-1,-1), 1, colors.black), ('VALIGN', (0,0), (-1,-1), 'MIDDLE'), ('TOPPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 0)]))
-        row.append(box)
-        if len(row)==3: sticker_data.append(row); row = []
-    if row: 
-        while len(row)<3: row.append("")
-        sticker_data.append(row)
-    if sticker_data: elements.append(Table(sticker_data, colWidths=[6.5*cm]*3, style=TableStyle([('VALIGN', (0,0), (-1,-1), 'TOP'), ('BOTTOMPADDING', (0,0), (-1,-1), 15)])))
-    doc.build(elements); buffer.seek(0); return buffer
-
-# =============================================================================
-# GÜNCELLENMİŞ TERMAL ETİKET (TAM OPTİMİZE EDİLMİŞ ALAN YERLEŞİMİ)
-# =============================================================================
-def create_thermal_labels_8x12_rotated(etiket_listesi, musteri_bilgileri, toplam_etiket_sayisi):
-    buffer = io.BytesIO()
-    p_width, p_height = 80*mm, 120*mm
-    c = canvas.Canvas(buffer, pagesize=(p_width, p_height))
-    
-    logo_url = "https://static.ticimax.cloud/74661/Uploads/HeaderTasarim/Header1/b2d2993a-93a3-4b7f-86be-cd5911e270b6.jpg"
-
-    for p in etiket_listesi:
-        c.saveState()
-        c.rotate(90)
-        c.translate(0, -p_width)
-        d_width, d_height = 120*mm, 80*mm
-
-        # 1. Logo
-        try:
-            response = requests.get(logo_url)
-            logo_img = ImageReader(io.BytesIO(response.content))
-            c.drawImage(logo_img, 4*mm, d_height - 11*mm, width=28*mm, height=11*mm, mask='auto')
-        except: pass
-
-        no_str = f"PAKET: {p['sira_no']} / {toplam_etiket_sayisi}"
-        alici_ad = tr_clean_for_pdf(musteri_bilgileri.get('AD_SOYAD', 'MUSTERI ADI'))
-        alici_adres = tr_clean_for_pdf(musteri_bilgileri.get('ADRES', 'ADRES GIRILMEDI')).replace('<br/>', ' ')
-        alici_tel = musteri_bilgileri.get('TELEFON', 'TELEFON YOK')
-        urun_adi = tr_clean_for_pdf(p['kisa_isim'])
-        desi_text = f"DESI : {p['desi_val']}"
-        odeme_tipi_val = tr_clean_for_pdf(musteri_bilgileri.get('ODEME_TIPI', 'ALICI')) + " ODEME"
-        il_ilce_metni = tr_clean_for_pdf(musteri_bilgileri.get('IL_ILCE', '')).upper()
-
-        # 2. Gonderen Bilgileri (Sabit Üst Kısım)
-        c.setFont("Helvetica-Bold", 8)
-        c.drawString(38*mm, d_height - 4*mm, "GONDEREN FIRMA: NIXRAD / KARPAN DIZAYN A.S.")
-        c.setFont("Helvetica", 7)
-        c.drawString(38*mm, d_height - 8*mm, "Yeni Cami OSB Mah. 3.Cad. No:1 Kavak/SAMSUN   Tel: 0262 658 11 58")
-        
-        c.setLineWidth(0.4)
-        c.line(3*mm, d_height - 13*mm, d_width - 3*mm, d_height - 13*mm)
-        
-        # 3. Alici Musteri
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(5*mm, d_height - 18*mm, "ALICI MUSTERI:")
-        
-        ad_font = 17 
-        while c.stringWidth(alici_ad, "Helvetica-Bold", ad_font) > (d_width - 10*mm) and ad_font > 7:
-            ad_font -= 1
-        
-        c.setFont("Helvetica-Bold", ad_font)
-        c.drawString(5*mm, d_height - 24*mm, alici_ad)
-        c.line(3*mm, d_height - 27*mm, d_width - 3*mm, d_height - 27*mm)
-        
-        # 4. Adres Kutusu (Alan DEvasa Büyütüldü)
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(5*mm, d_height - 32*mm, "ADRES :")
-        
-        adres_uzunluk = len(alici_adres)
-        if adres_uzunluk <= 70: adres_font, adres_lead = 14, 16
-        elif adres_uzunluk <= 110: adres_font, adres_lead = 12, 14
-        elif adres_uzunluk <= 160: adres_font, adres_lead = 10, 12
-        else: adres_font, adres_lead = 8, 10
-            
-        text_obj = c.beginText(24*mm, d_height - 32*mm)
-        text_obj.setFont("Helvetica", adres_font)
-        text_obj.setLeading(adres_lead)
-        
-        max_text_width = d_width - 27*mm 
-        words = alici_adres.split()
-        line = ""
-        for word in words:
-            if c.stringWidth(line + word, "Helvetica", adres_font) < max_text_width:
-                line += word + " "
-            else:
-                if line == "": 
-                    text_obj.textLine(word)
-                else:
-                    text_obj.textLine(line)
-                    line = word + " "
-        if line:
-            text_obj.textLine(line)
-        c.drawText(text_obj)
-        
-        # İl / İlçe ve Telefon Aynı Satırda (Adres kutusunun alt tabanına sabitlendi)
-        bottom_adres_y = d_height - 54*mm
-        
-        if il_ilce_metni:
-            il_ilce_font = adres_font + 1 
-            c.setFont("Helvetica-Bold", il_ilce_font) 
-            c.drawString(24*mm, bottom_adres_y, il_ilce_metni)
-            
-        c.setFont("Helvetica-Bold", 12)
-        c.drawRightString(d_width - 5*mm, bottom_adres_y, f"TEL : {alici_tel}")
-            
-        c.line(3*mm, d_height - 57*mm, d_width - 3*mm, d_height - 57*mm)
-        
-        # 5. Urun Adi
-        urun_font = 15 
-        while c.stringWidth(urun_adi, "Helvetica-Bold", urun_font) > (d_width - 10*mm) and urun_font > 6:
-            urun_font -= 1
-            
-        c.setFont("Helvetica-Bold", urun_font)
-        c.drawString(5*mm, d_height - 63*mm, urun_adi)
-
-        # 6. Desi, Odeme Tipi, Paket No (Tek satırda yan yana)
-        y_info = d_height - 71*mm
-        
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(5*mm, y_info, desi_text)
-        
-        c.setFont("Helvetica-Bold", 13)
-        c.drawCentredString(d_width / 2.0, y_info, odeme_tipi_val)
-        
-        c.setFont("Helvetica-Bold", 14)
-        c.drawRightString(d_width - 5*mm, y_info, no_str)
-        
-        # 7. Kargo Teslimat Uyarı Notu
-        c.setLineWidth(0.2)
-        c.line(3*mm, d_height - 74*mm, d_width - 3*mm, d_height - 74*mm)
-        
-        uyari_1 = tr_clean_for_pdf("LÜTFEN KARGONUZU TESLİM ALIRKEN PAKETİ KONTROL EDİNİZ. HASAR VEYA EKSİK ÜRÜN VARSA")
-        uyari_2 = tr_clean_for_pdf("AYNI GÜN KARGO GÖREVLİSİNE TUTANAK TUTTURUNUZ. AKSİ HALDE SORUMLULUK ALICIYA AİTTİR.")
-        
-        c.setFont("Helvetica-Bold", 5.5)
-        c.drawCentredString(d_width / 2.0, d_height - 76.5*mm, uyari_1)
-        c.drawCentredString(d_width / 2.0, d_height - 78.5*mm, uyari_2)
-
-        c.restoreState()
-        c.showPage()
-    
-    c.save()
-    buffer.seek(0)
-    return buffer
+# Tanılama paneli açıksa (ya da JSON log istenmişse) bu çalıştırmanın aşamaları ölçülür
+olcum_acik = st.session_state.get('olcum_acik', False) or bool(OLCUM_LOGU)
+olcer = Olcer(etkin=olcum_acik)
+if olcum_acik and st.session_state.get('olcum_profil'): olcer.profil_baslat()
 
 # =============================================================================
 # 3. WEB ARAYÜZÜ
@@ -401,131 +63,143 @@ tab_dosya, tab_manuel = st.tabs(["📂 Dosya ile Hesapla", "🧮 Manuel Hesaplay
 with tab_dosya:
     uploaded_file = st.file_uploader("Dia Excel/CSV Dosyasını Yükleyin", type=['xls', 'xlsx', 'csv'])
 
-    if 'ham_veri' not in st.session_state: st.session_state['ham_veri'] = []
-    if 'malzeme_listesi' not in st.session_state: st.session_state['malzeme_listesi'] = {}
+    if 'siparis' not in st.session_state: st.session_state['siparis'] = None
 
     if uploaded_file:
         if st.button("Dosyayı Analiz Et ve Düzenle"):
             try:
-                if uploaded_file.name.endswith('.csv'):
-                    try: df_raw = pd.read_csv(uploaded_file, encoding='utf-8')
-                    except: df_raw = pd.read_csv(uploaded_file, encoding='cp1254')
+                from ice_aktarim import dia_dosyasi_oku
+                from siparis_analizi import siparisi_analiz_et
+                from siparis_modeli import SiparisModeli
+                from yukleme_onbellegi import yukleme_onbellegi
+                # Aynı baytlar daha önce okunup analiz edildiyse (bu ya da başka bir oturumda) sonuç önbellekten gelir
+                veri = uploaded_file.getvalue()
+                with olcer.asama('yukleme_onbellegi', dosya=uploaded_file.name):
+                    anahtar = yukleme_onbellegi.anahtar(uploaded_file.name, veri)
+                    yukleme = yukleme_onbellegi.bul(anahtar)
+                if yukleme is None:
+                    # Kodlama ve başlık satırı dosyanın başından bulunur, yalnızca gerekli iki sütun okunur
+                    with olcer.asama('okuma', dosya=uploaded_file.name):
+                        df = dia_dosyasi_oku(uploaded_file.name, uploaded_file)
+                    ham_veri, malzeme_listesi = None, None
+                    if df is not None:
+                        # Tüm döküm sütun bazında tek geçişte analiz edilir
+                        with olcer.asama('analiz'):
+                            ham_veri, malzeme_listesi = siparisi_analiz_et(df)
+                    yukleme = yukleme_onbellegi.koy(anahtar, df, ham_veri, malzeme_listesi)
                 else:
-                    df_raw = pd.read_excel(uploaded_file)
-                
-                header_index = -1
-                for i, row in df_raw.iterrows():
-                    if "Stok Adı" in " ".join([str(v) for v in row.values]): header_index = i; break
-                
-                if header_index != -1:
-                    new_header = df_raw.iloc[header_index]
-                    df = df_raw[header_index + 1:].copy()
-                    df.columns = [str(col).strip() for col in new_header]
-                    try: df = df[['Stok Adı', 'Miktar']]
-                    except: df = df.iloc[:, [0, 2]]; df.columns = ['Stok Adı', 'Miktar']
-                    df = df.dropna(subset=['Stok Adı'])
-                    
-                    st.session_state['ham_veri'] = [] 
-                    st.session_state['malzeme_listesi'] = {} 
-                    
-                    for index, row in df.iterrows():
-                        try: adet = float(row['Miktar'])
-                        except: adet = 0
-                        stok_adi = str(row['Stok Adı']); stok_lower = tr_lower(stok_adi)
-                        
-                        if adet > 0:
-                            is_vana_accessory = ('vana' in stok_lower) and ('nirvana' not in stok_lower)
-                            is_other_accessory = any(x in stok_lower for x in ['volan', 'tapa', 'aksesuar', 'set', 'termo', 'köşe'])
-                            
-                            if is_vana_accessory or is_other_accessory:
-                                 key = f"{stok_adi} (Adet)"
-                                 st.session_state['malzeme_listesi'][key] = st.session_state['malzeme_listesi'].get(key, 0) + adet
-                            
-                            elif 'radyatör' in stok_lower or 'havlupan' in stok_lower or 'radyator' in stok_lower:
-                                analiz = hesapla_ve_analiz_et(stok_adi, adet)
-                                if analiz:
-                                    for miktar, birim, ad in analiz['Reçete']:
-                                        key = f"{ad} ({birim})"
-                                        st.session_state['malzeme_listesi'][key] = st.session_state['malzeme_listesi'].get(key, 0) + (miktar * adet)
-                                    
-                                    st.session_state['ham_veri'].append({
-                                        "Ürün": analiz['Etiket']['kisa_isim'],
-                                        "Adet": int(adet),
-                                        "Ölçü": analiz['Etiket']['boyut_str'],
-                                        "Birim Desi": analiz['Etiket']['desi_val'],
-                                        "Toplam Ağırlık": analiz['Toplam_Agirlik_Gosterim']
-                                    })
+                    olcer.say(f'yukleme_onbellegi_{yukleme.kaynak}')
+
+                if yukleme.df is not None:
+                    ham_veri, malzeme_listesi = yukleme.ham_veri, yukleme.malzeme_listesi
+                    olcer.say('dosya_satiri', len(yukleme.df))
+                    olcer.say('urun_satiri', len(ham_veri))
+                    st.session_state['siparis'] = SiparisModeli(ham_veri, malzeme_listesi) if ham_veri else None
                 else:
                     st.error("Dosyada 'Stok Adı' başlığı bulunamadı.")
             except Exception as e:
                 st.error(f"Hata: {e}")
 
-    if st.session_state['ham_veri']:
+    siparis = st.session_state['siparis']
+    if siparis is not None:
         st.divider()
         ozet_alani = st.container()
         st.info("📝 Aşağıdaki tablodan Ürün Adı, Adet, Ölçü ve Desi bilgilerini düzenleyebilirsiniz.")
         
-        edited_df = st.data_editor(
-            pd.DataFrame(st.session_state['ham_veri']),
-            num_rows="dynamic",
-            use_container_width=True,
-            column_config={
-                "Adet": st.column_config.NumberColumn(format="%d"),
-                "Birim Desi": st.column_config.NumberColumn(format="%.2f"),
-                "Toplam Ağırlık": st.column_config.NumberColumn(format="%.1f")
-            }
-        )
-
-        toplam_parca = edited_df["Adet"].sum()
-        proje_toplam_desi = (edited_df["Birim Desi"] * edited_df["Adet"]).sum()
-        proje_toplam_agirlik = edited_df["Toplam Ağırlık"].sum()
+        # Tablo her çalıştırmada aynı kalır; yapılan düzenlemeler editörün delta durumundan modele işlenir
+        with olcer.asama('siparis_editoru'):
+            st.data_editor(
+                siparis.tablo,
+                key="siparis_editor",
+                num_rows="dynamic",
+                use_container_width=True,
+                # k_en / k_boy / k_derin (ortak koli planı için) gizli kalır
+                column_order=("Ürün", "Adet", "Ölçü", "Birim Desi", "Toplam Ağırlık"),
+                column_config={
+                    "Adet": st.column_config.NumberColumn(format="%d"),
+                    "Birim Desi": st.column_config.NumberColumn(format="%.2f"),
+                    "Toplam Ağırlık": st.column_config.NumberColumn(format="%.1f")
+                }
+            )
+
+        with olcer.asama('delta'):
+            degisen = siparis.guncelle(st.session_state.get('siparis_editor'))
+        olcer.say('degisen_satir', len(degisen))
+        toplam_parca, proje_toplam_desi, proje_toplam_agirlik = siparis.toplamlar()
 
         with ozet_alani:
             st.subheader("📊 Proje Özeti")
+            # Ortak koli planı açıksa koli / desi toplamları, kargo fişi ve termal etiketler plandaki
+            # kolilerden üretilir; üretim emri ürün başına etiketle kalır.
+            konsolide = st.toggle("📦 Küçük ürünleri ortak kolilerde birleştir", key='konsolidasyon')
+            plan = None
+            if konsolide:
+                with olcer.asama('konsolidasyon'):
+                    plan = siparis.sevk_plani
+                toplam_parca, proje_toplam_desi = plan.toplam_parca, plan.toplam_desi
             c1, c2, c3 = st.columns(3)
-            c1.metric("📦 Toplam Koli", int(toplam_parca))
-            c2.metric("📐 Toplam Desi", f"{proje_toplam_desi:.2f}")
+            if plan is not None:
+                c1.metric("📦 Toplam Koli", int(toplam_parca), delta=int(toplam_parca - plan.onceki_parca), delta_color="inverse")
+                c2.metric("📐 Toplam Desi", f"{proje_toplam_desi:.2f}", delta=f"{proje_toplam_desi - plan.onceki_desi:.2f}", delta_color="inverse")
+            else:
+                c1.metric("📦 Toplam Koli", int(toplam_parca))
+                c2.metric("📐 Toplam Desi", f"{proje_toplam_desi:.2f}")
             c3.metric("⚖️ Toplam Ağırlık", f"{proje_toplam_agirlik:.1f} KG")
             kopyalanacak_metin = f"toplam desi {proje_toplam_desi:.2f}  toplam ağırlık {proje_toplam_agirlik:.1f}"
             st.code(kopyalanacak_metin, language="text")
+            if plan is not None:
+                if plan.ortak_koli_sayisi:
+                    with st.expander(f"Ortak koliler ({plan.ortak_koli_sayisi})"): st.dataframe(plan.tablo(), use_container_width=True)
+                else:
+                    st.caption("Bu siparişte ortak koli desiyi düşürmüyor; ürünler kendi kolilerinde gider.")
             st.divider() 
 
         st.subheader("🛠️ Malzeme Çek Listesi (Düzenlenebilir)")
-        malz_df = pd.DataFrame([{"Malzeme": k, "Adet": v} for k,v in st.session_state['malzeme_listesi'].items()])
-        edited_malz_df = st.data_editor(
-            malz_df,
-            key="malzeme_editor",
-            num_rows="dynamic",
-            use_container_width=True,
-            column_config={"Adet": st.column_config.NumberColumn(format="%.1f")}
-        )
-        final_malzeme_listesi = dict(zip(edited_malz_df['Malzeme'], edited_malz_df['Adet']))
-
-        final_etiket_listesi = []
-        global_counter = 1
-        for index, row in edited_df.iterrows():
-            qty = int(row['Adet'])
-            for i in range(qty):
-                final_etiket_listesi.append({
-                    'sira_no': global_counter,
-                    'kisa_isim': row['Ürün'],
-                    'boyut_str': row['Ölçü'],
-                    'desi_val': row['Birim Desi']
-                })
-                global_counter += 1
+        with olcer.asama('malzeme_editoru'):
+            edited_malz_df = st.data_editor(
+                siparis.malzeme_tablosu,
+                key="malzeme_editor",
+                num_rows="dynamic",
+                use_container_width=True,
+                column_config={"Adet": st.column_config.NumberColumn(format="%.1f")}
+            )
+            final_malzeme_listesi = dict(zip(edited_malz_df['Malzeme'], edited_malz_df['Adet']))
+
+        with olcer.asama('etiket_listesi'):
+            final_etiket_listesi = siparis.etiket_listesi
+        olcer.say('etiket', len(final_etiket_listesi))
+        kargo_etiketleri = plan.etiket_listesi if plan is not None else final_etiket_listesi
 
         st.divider()
         st.subheader("🖨️ Düzenlenmiş Çıktı Al")
-        col_pdf1, col_pdf2, col_pdf3 = st.columns(3)
+        col_pdf1, col_pdf2, col_pdf3, col_zpl = st.columns(4)
         
-        pdf_cargo = create_cargo_pdf(proje_toplam_desi, toplam_parca, musteri_data, final_etiket_listesi)
-        col_pdf1.download_button(label="📄 1. KARGO FİŞİ (A4)", data=pdf_cargo, file_name="Kargo_Fisi.pdf", mime="application/pdf", use_container_width=True)
+        # Belgeler tıklanana kadar üretilmez: download_button'a veri yerine çağrılabilir verilir,
+        # belge de girdilerinin özetiyle önbellekten gelir. Üretim emri müşteriden sadece adı
+        # kullandığı için telefon/adres değişikliği onu bozmaz.
+        uretim_musteri = {'AD_SOYAD': musteri_data['AD_SOYAD']}
+        belgeler = {
+            'kargo': (belge_olusturucu('create_cargo_pdf'), (proje_toplam_desi, toplam_parca, musteri_data, kargo_etiketleri)),
+            'uretim': (belge_olusturucu('create_production_pdf'), (final_malzeme_listesi, final_etiket_listesi, uretim_musteri)),
+            'termal': (belge_olusturucu('create_thermal_labels_8x12_rotated'), (kargo_etiketleri, musteri_data, int(toplam_parca))),
+            'zpl': (belge_olusturucu('create_thermal_labels_zpl'), (kargo_etiketleri, musteri_data, int(toplam_parca))),
+        }
 
-        pdf_production = create_production_pdf(final_malzeme_listesi, final_etiket_listesi, musteri_data)
-        col_pdf2.download_button(label="🏭 2. ÜRETİM & ETİKETLER", data=pdf_production, file_name="Uretim_ve_Etiketler.pdf", mime="application/pdf", use_container_width=True)
+        # Tablolar iki çalıştırma boyunca değişmediyse en çok indirilen termal etiket arka planda hazırlanır.
+        with olcer.asama('tablo_ozeti'):
+            tablo_ozeti = girdi_ozeti(siparis.etiket_ozeti, final_malzeme_listesi, musteri_data, konsolide)
+        if st.session_state.get('_tablo_ozeti') == tablo_ozeti:
+            belge_onbellegi.hazirla('termal', belgeler['termal'][0], *belgeler['termal'][1])
+        st.session_state['_tablo_ozeti'] = tablo_ozeti
 
-        pdf_thermal = create_thermal_labels_8x12_rotated(final_etiket_listesi, musteri_data, int(toplam_parca))
-        col_pdf3.download_button(label="🏷️ 3. TERMAL ETİKET (Yan)", data=pdf_thermal, file_name="Termal_Etiketler.pdf", mime="application/pdf", use_container_width=True)
+        def belge_verisi(tur):
+            olusturucu, girdiler = belgeler[tur]
+            return partial(belge_onbellegi.getir, tur, olusturucu, *girdiler)
+
+        col_pdf1.download_button(label="📄 1. KARGO FİŞİ (A4)", data=belge_verisi('kargo'), file_name="Kargo_Fisi.pdf", mime="application/pdf", use_container_width=True)
+        col_pdf2.download_button(label="🏭 2. ÜRETİM & ETİKETLER", data=belge_verisi('uretim'), file_name="Uretim_ve_Etiketler.pdf", mime="application/pdf", use_container_width=True)
+        col_pdf3.download_button(label="🏷️ 3. TERMAL ETİKET (Yan)", data=belge_verisi('termal'), file_name="Termal_Etiketler.pdf", mime="application/pdf", use_container_width=True)
+        col_zpl.download_button(label="🦓 4. TERMAL ETİKET (ZPL)", data=belge_verisi('zpl'), file_name="Termal_Etiketler.zpl", mime="text/plain", use_container_width=True)
 
 with tab_manuel:
     st.header("🧮 Hızlı Desi Hesaplama Aracı")
@@ -535,8 +209,7 @@ with tab_manuel:
     with col_m1:
         display_models = ["Standart Radyatör", "Havlupan"] + [m.capitalize() for m in MODEL_DERINLIKLERI.keys() if m != 'livera']
         secilen_model = st.selectbox("Model Seçin", display_models)
-        model_lower = secilen_model.lower()
-        is_havlupan = 'havlupan' in model_lower or any(z in model_lower for z in ZORUNLU_HAVLUPANLAR)
+        is_havlupan = siniflandirici.siniflandir(secilen_model).tip == 'HAVLUPAN'
         
         if is_havlupan:
             label_1, label_2 = "Genişlik (cm)", "Yükseklik (cm)"
@@ -551,25 +224,89 @@ with tab_manuel:
         
     if st.button("➕ Listeye Ekle", type="primary"):
         g_input, y_input = (val_1, val_2) if is_havlupan else (val_2, val_1)
-        birim_desi, boyut_str, birim_kg = manuel_hesapla(secilen_model, g_input, y_input, m_adet)
+        birim_desi, boyut_str, toplam_kg = manuel_hesapla(secilen_model, g_input, y_input, m_adet)
+        # Sayılar sayı olarak saklanır; birimler yalnızca tabloda biçimlenir
         st.session_state['manuel_liste'].append({
             "Model": secilen_model, "Ölçü (ExB)": f"{g_input} x {y_input}", "Kutulu Ölçü": boyut_str,
             "Adet": m_adet, "Birim Desi": birim_desi, "Toplam Desi": round(birim_desi * m_adet, 2),
-            "Toplam Ağırlık": f"{birim_kg:.2f} KG"
+            "Toplam Ağırlık": toplam_kg
         })
         st.success("Eklendi!")
 
+    # Toplu mod: liste / tablo / ızgara tek seferde vektörel hesaplanır ve aynı listeye eklenir
+    with st.expander("📋 Toplu Hesap (liste, tablo ya da model × ölçü ızgarası)"):
+        kaynak = st.radio("Girdi", ["Liste yapıştır", "Tablo yükle", "Model × ölçü ızgarası"], horizontal=True, key='toplu_kaynak')
+        try:
+            toplu_df, hatali = None, []
+            if kaynak == "Liste yapıştır":
+                metin = st.text_area("Her satıra bir ürün: model, ölçü 1 x ölçü 2 (cm), adet. Ölçü sırası yukarıdaki alanlarla aynı (havlupanda genişlik x yükseklik, radyatörde yükseklik x genişlik).",
+                                     placeholder="Nirvana 60x100 3\nHavlupan 50x70 2", key='toplu_liste')
+                if st.button("Hesapla ve Ekle", key='toplu_liste_hesapla') and metin.strip():
+                    from teklif import liste_hesapla
+                    toplu_df, hatali = liste_hesapla(metin)
+            elif kaynak == "Tablo yükle":
+                tablo_dosyasi = st.file_uploader("Model, Genişlik, Yükseklik, Adet sütunlu tablo (cm)", type=['csv', 'xlsx'], key='toplu_tablo')
+                if tablo_dosyasi and st.button("Hesapla ve Ekle", key='toplu_tablo_hesapla'):
+                    from teklif import tablo_hesapla
+                    toplu_df = tablo_hesapla(tablo_dosyasi.name, tablo_dosyasi)
+            else:
+                izgara_modelleri = st.multiselect("Modeller", display_models, key='izgara_modeller')
+                c_iz1, c_iz2, c_iz3 = st.columns([2, 2, 1])
+                izgara_yukseklik = c_iz1.text_input("Yükseklikler (cm)", "60, 90", help="Virgülle ayrılmış değerler ya da başlangıç-bitiş:adım (ör. 40-100:10)", key='izgara_yukseklik')
+                izgara_genislik = c_iz2.text_input("Genişlikler (cm)", "40-160:20", help="Virgülle ayrılmış değerler ya da başlangıç-bitiş:adım (ör. 40-160:20)", key='izgara_genislik')
+                izgara_adet = c_iz3.number_input("Adet", min_value=1, value=1, key='izgara_adet')
+                if st.button("Hesapla ve Ekle", key='izgara_hesapla') and izgara_modelleri:
+                    from teklif import izgara_hesapla, degerler_ayristir
+                    toplu_df = izgara_hesapla(izgara_modelleri, degerler_ayristir(izgara_yukseklik), degerler_ayristir(izgara_genislik), izgara_adet)
+            if toplu_df is not None:
+                st.session_state['manuel_liste'].extend(toplu_df.to_dict('records'))
+                st.success(f"{len(toplu_df)} satır eklendi.")
+            if hatali: st.warning("Okunamayan satırlar: " + " | ".join(hatali[:10]) + (" ..." if len(hatali) > 10 else ""))
+        except ValueError as e:
+            st.error(f"Hata: {e}")
+
     if st.session_state['manuel_liste']:
         st.divider()
+        import pandas as pd
         df_manuel = pd.DataFrame(st.session_state['manuel_liste'])
-        st.dataframe(df_manuel, use_container_width=True)
+        st.dataframe(df_manuel, use_container_width=True, column_config={
+            "Birim Desi": st.column_config.NumberColumn(format="%.2f"),
+            "Toplam Desi": st.column_config.NumberColumn(format="%.2f"),
+            "Toplam Ağırlık": st.column_config.NumberColumn(format="%.2f KG"),
+        })
         t_adet = df_manuel['Adet'].sum()
         t_desi = df_manuel['Toplam Desi'].sum()
-        try: t_kg = sum([float(x['Toplam Ağırlık'].replace(' KG','')) for x in st.session_state['manuel_liste']])
-        except: t_kg = 0
+        t_kg = df_manuel['Toplam Ağırlık'].sum()
         
         c_tot1, c_tot2, c_tot3 = st.columns(3)
-        c_tot1.metric("Toplam Parça", t_adet); c_tot2.metric("Genel Toplam Desi", f"{t_desi:.2f}"); c_tot3.metric("Genel Toplam Ağırlık", f"{t_kg:.2f} KG")
-        
-        if st.button("🗑️ Listeyi Temizle"):
+        c_tot1.metric("Toplam Parça", int(t_adet)); c_tot2.metric("Genel Toplam Desi", f"{t_desi:.2f}"); c_tot3.metric("Genel Toplam Ağırlık", f"{t_kg:.2f} KG")
+
+        from teklif import teklif_excel, teklif_csv
+        c_ind1, c_ind2, c_ind3 = st.columns(3)
+        c_ind1.download_button("📥 Teklif Tablosu (Excel)", data=partial(teklif_excel, st.session_state['manuel_liste']), file_name="Desi_Teklifi.xlsx",
+                               mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", use_container_width=True)
+        c_ind2.download_button("📥 Teklif Tablosu (CSV)", data=partial(teklif_csv, st.session_state['manuel_liste']), file_name="Desi_Teklifi.csv",
+                               mime="text/csv", use_container_width=True)
+        if c_ind3.button("🗑️ Listeyi Temizle", use_container_width=True):
             st.session_state['manuel_liste'] = []; st.rerun()
+
+# =============================================================================
+# TANILAMA
+# =============================================================================
+profil_metni = olcer.profil_bitir()
+with st.expander("🔧 Tanılama"):
+    st.checkbox("Aşama sürelerini ölç", key='olcum_acik')
+    st.checkbox("Her çalıştırmada cProfile profili al", key='olcum_profil', disabled=not olcum_acik)
+    if olcum_acik:
+        rapor = olcer.rapor()
+        st.caption(f"Bu çalıştırma: {rapor['toplam_ms']:.0f} ms")
+        if rapor['asamalar']: st.dataframe(rapor['asamalar'], use_container_width=True)
+        if rapor['sayaclar']: st.json(rapor['sayaclar'])
+        st.caption("Son belge üretimleri ve logo yüklemeleri")
+        if arka_plan.asamalar: st.dataframe(list(arka_plan.asamalar)[::-1], use_container_width=True)
+        import varliklar
+        from yukleme_onbellegi import yukleme_onbellegi
+        st.json({'belge_onbellegi': belge_onbellegi.istatistik(), 'logo_onbellegi': varliklar.varlik_onbellegi.istatistik(),
+                 'yukleme_onbellegi': yukleme_onbellegi.istatistik()})
+        if profil_metni: st.code(profil_metni, language="text")
+olcer.logla()
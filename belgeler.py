@@ -0,0 +1,398 @@
+import io
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Flowable
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm, mm
+from reportlab.lib.enums import TA_CENTER
+from reportlab.pdfgen import canvas
+
+from hesaplama import paket_listesi, tr_clean_for_pdf
+from metin_sigdirma import font_sigdir, satir_kir
+from pdf_akisi import AkisPDF
+from zpl_akisi import ZplYazici
+from varliklar import logo_getir
+
+# =============================================================================
+# PDF FONKSİYONLARI
+# =============================================================================
+def _aralik(bas, son): return f"#{bas}" if bas == son else f"#{bas}-#{son}"
+
+def kargo_manifestosu(etiket_listesi):
+    # Koli listesinin koşuları üzerinden tek geçiş (koli sayısından bağımsız): aynı (ürün, ölçü, desi) tek satır olur,
+    # ardışık numaralar birleştirilir. İlk görülme sırasıyla (koli no aralıkları, ürün, ölçü, adet, desi).
+    # etiket_listesi: PaketListesi ya da koli sözlüklerinden oluşan liste
+    satirlar = {}
+    for urun, olcu, desi, adet, bas in paket_listesi(etiket_listesi).kosular():
+        satir = satirlar.get((urun, olcu, desi))
+        if satir is None: satir = satirlar[(urun, olcu, desi)] = [[], 0]
+        araliklar = satir[0]
+        if araliklar and araliklar[-1][1] + 1 == bas: araliklar[-1][1] = bas + adet - 1
+        else: araliklar.append([bas, bas + adet - 1])
+        satir[1] += adet
+    return [(', '.join(_aralik(b, s) for b, s in araliklar), urun, olcu, adet, desi)
+            for (urun, olcu, desi), (araliklar, adet) in satirlar.items()]
+
+def create_cargo_pdf(proje_toplam_desi, toplam_parca, musteri_bilgileri, etiket_listesi):
+    buffer = io.BytesIO(); doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=1*cm, leftMargin=1*cm, topMargin=1*cm, bottomMargin=1*cm); elements = []
+    styles = getSampleStyleSheet()
+    style_normal = ParagraphStyle('n', parent=styles['Normal'], fontSize=10, leading=12)
+    style_header = ParagraphStyle('h', parent=styles['Normal'], fontSize=14, leading=16, fontName='Helvetica-Bold', textColor=colors.darkred)
+    gonderen_info = [Paragraph("<b>GONDEREN FIRMA:</b>", style_normal), Paragraph("NIXRAD / KARPAN DIZAYN A.S.", style_header), Paragraph("Yeni Cami OSB Mah. 3.Cad. No:1 Kavak/SAMSUN", style_normal), Paragraph("Tel: 0262 658 11 58", style_normal)]
+    odeme_clean = tr_clean_for_pdf(musteri_bilgileri.get('ODEME_TIPI', 'ALICI'))
+    odeme_info = [Paragraph("<b>ODEME TIPI:</b>", style_normal), Spacer(1, 0.5*cm), Paragraph(f"<b>{odeme_clean} ODEMELI</b>", ParagraphStyle('big', fontSize=14, alignment=TA_CENTER, fontName='Helvetica-Bold'))]
+    t_header = Table([[gonderen_info, odeme_info]], colWidths=[13*cm, 6*cm], style=TableStyle([('BOX', (0,0), (-1,-1), 1, colors.black), ('GRID', (0,0), (-1,-1), 1, colors.black), ('VALIGN', (0,0), (-1,-1), 'TOP'), ('PADDING', (0,0), (-1,-1), 8), ('BACKGROUND', (0,0), (-1,-1), colors.whitesmoke)]))
+    elements.append(t_header); elements.append(Spacer(1, 0.5*cm))
+    alici_ad = tr_clean_for_pdf(musteri_bilgileri.get('AD_SOYAD', '.....'))
+    alici_tel = musteri_bilgileri.get('TELEFON', '.....')
+    
+    clean_adres = tr_clean_for_pdf(musteri_bilgileri.get('ADRES', 'Adres Girilmedi'))
+    a4_il_ilce = tr_clean_for_pdf(musteri_bilgileri.get('IL_ILCE', ''))
+    if a4_il_ilce:
+        clean_adres += f"<br/><b>{a4_il_ilce.upper()}</b>"
+
+    alici_content = [Paragraph("<b>ALICI MUSTERI:</b>", style_normal), Paragraph(f"<b>{alici_ad}</b>", ParagraphStyle('alici_ad_huge', fontSize=22, leading=26, fontName='Helvetica-Bold', spaceBefore=6, spaceAfter=12)), Paragraph(f"<b>Tel:</b> {alici_tel}", ParagraphStyle('tel_big', fontSize=12, leading=14)), Spacer(1, 0.5*cm), Paragraph(f"<b>ADRES:</b><br/>{clean_adres}", ParagraphStyle('adres_style_big', fontSize=15, leading=20))]
+    t_alici = Table([[alici_content]], colWidths=[19*cm], style=TableStyle([('BOX', (0,0), (-1,-1), 2, colors.black), ('PADDING', (0,0), (-1,-1), 15)]))
+    elements.append(t_alici); elements.append(Spacer(1, 0.5*cm))
+    elements.append(Paragraph("<b>PAKET ICERIK OZETI:</b>", ParagraphStyle('b', fontSize=10, fontName='Helvetica-Bold'))); elements.append(Spacer(1, 0.2*cm))
+    
+    # Aynı ürün / ölçü / desideki koliler tek satırda, koli numarası aralıklarıyla; uzun listeler başlık tekrarlanarak sayfalara bölünür
+    pkt_data = [['Koli No', 'Urun Adi', 'Olcu', 'Adet', 'Desi']]
+    for araliklar, urun, olcu, adet, desi in kargo_manifestosu(etiket_listesi):
+        pkt_data.append(['\n'.join(satir_kir(araliklar, 'Helvetica', 9, 3.5*cm - 12)), tr_clean_for_pdf(urun), olcu, str(adet), str(desi)])
+
+    # Sütuna sığmayan uzun ürün adları hücre taşmasın diye kendi satırında küçültülür (6 punto'ya kadar)
+    sigdirma = [('FONTSIZE', (1, r), (1, r), fs) for r, row in enumerate(pkt_data[1:], 1) if (fs := font_sigdir(row[1], 'Helvetica', 9*cm - 12, 9, 6)) < 9]
+    t_pkt = Table(pkt_data, colWidths=[3.5*cm, 9*cm, 3.5*cm, 1.2*cm, 1.8*cm], repeatRows=1, style=TableStyle([('GRID', (0,0), (-1,-1), 0.5, colors.grey), ('BACKGROUND', (0,0), (-1,0), colors.lightgrey), ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'), ('ALIGN', (0,0), (-1,-1), 'LEFT'), ('ALIGN', (3,0), (3,-1), 'CENTER'), ('VALIGN', (0,0), (-1,-1), 'MIDDLE'), ('FONTSIZE', (0,0), (-1,-1), 9)] + sigdirma))
+    elements.append(t_pkt); elements.append(Spacer(1, 0.5*cm))
+    summary_data = [[f"TOPLAM PARCA: {toplam_parca}", f"TOPLAM DESI: {proje_toplam_desi:.2f}"]]
+    t_sum = Table(summary_data, colWidths=[9.5*cm, 9.5*cm], style=TableStyle([('ALIGN', (0,0), (0,0), 'LEFT'), ('ALIGN', (1,0), (1,0), 'RIGHT'), ('FONTNAME', (0,0), (-1,-1), 'Helvetica-Bold'), ('FONTSIZE', (0,0), (-1,-1), 14), ('TEXTCOLOR', (1,0), (1,0), colors.blue), ('LINEBELOW', (0,0), (-1,-1), 2, colors.black)]))
+    elements.append(t_sum); elements.append(Spacer(1, 1*cm))
+    
+    warning_title = Paragraph("<b>DIKKAT KIRILIR !</b>", ParagraphStyle('WT', fontSize=26, alignment=TA_CENTER, textColor=colors.white, fontName='Helvetica-Bold'))
+    warning_text = """SAYIN MUSTERIMIZ,<br/>GELEN KARGONUZUN BULUNDUGU PAKETLERIN SAGLAM VE PAKETLERDE EZIKLIK OLMADIGINI KONTROL EDEREK ALINIZ. EKSIK VEYA HASARLI MALZEME VARSA LUTFEN KARGO GOREVLISINE AYNI GUN TUTANAK TUTTURUNUZ."""
+    warning_para = Paragraph(warning_text, ParagraphStyle('warn', alignment=TA_CENTER, textColor=colors.white, fontSize=11, leading=14, fontName='Helvetica-Bold'))
+    t_warn = Table([[warning_title], [warning_para]], colWidths=[19*cm], style=TableStyle([('BACKGROUND', (0,0), (-1,-1), colors.black), ('BOX', (0,0), (-1,-1), 1, colors.black), ('ALIGN', (0,0), (-1,-1), 'CENTER'), ('PADDING', (0,0), (-1,-1), 10), ('BOTTOMPADDING', (0,0), (-1,0), 10)]))
+    elements.append(t_warn)
+    doc.build(elements); buffer.seek(0); return buffer
+
+def create_production_pdf(tum_malzemeler, etiket_listesi, musteri_bilgileri):
+    buffer = io.BytesIO(); doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=0.5*cm, leftMargin=0.5*cm, topMargin=1*cm, bottomMargin=1*cm); elements = []
+    cust_name = tr_clean_for_pdf(musteri_bilgileri.get('AD_SOYAD', 'Isim Girilmedi'))
+    elements.append(Paragraph(f"URETIM & PAKETLEME EMRI - {cust_name}", ParagraphStyle('Title', fontSize=16, alignment=TA_CENTER, fontName='Helvetica-Bold', spaceAfter=15)))
+    malz_style = ParagraphStyle('malz_style', fontSize=10, fontName='Helvetica')
+    data = [['MALZEME ADI', 'ADET', 'KONTROL']] + [[Paragraph(tr_clean_for_pdf(m), malz_style), f"{int(v)}" if v%1==0 else f"{v:.1f}", "___"] for m, v in tum_malzemeler.items()]
+    t = Table(data, colWidths=[14*cm, 2*cm, 3*cm], style=TableStyle([('GRID', (0,0), (-1,-1), 1, colors.black), ('BACKGROUND', (0,0), (-1,0), colors.lightgrey), ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'), ('ALIGN', (1,0), (-1,-1), 'CENTER'), ('ALIGN', (2,0), (-1,-1), 'CENTER'), ('VALIGN', (0,0), (-1,-1), 'MIDDLE'), ('PADDING', (0,0), (-1,-1), 6)]))
+    elements.append(t); elements.append(Spacer(1, 1*cm))
+    signature_data = [["PAKETLEYEN PERSONEL", "", ""], ["Adi Soyadi: ....................................", "", ""], ["Imza: ....................................", "", ""]]
+    t_sig = Table(signature_data, colWidths=[8*cm, 2*cm, 8*cm], style=TableStyle([('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'), ('ALIGN', (0,0), (-1,-1), 'LEFT'), ('BOTTOMPADDING', (0,0), (-1,-1), 10)]))
+    elements.append(t_sig); elements.append(Spacer(1, 0.5*cm)); elements.append(Paragraph("-" * 120, ParagraphStyle('sep', alignment=TA_CENTER))); elements.append(Paragraph("ASAGIDAKI ETIKETLERI KESIP KOLILERE YAPISTIRINIZ (6x6 cm)", ParagraphStyle('Small', fontSize=8, alignment=TA_CENTER))); elements.append(Spacer(1, 0.5*cm))
+    
+    if etiket_listesi: elements.append(EtiketIzgarasi(etiket_listesi, tr_clean_for_pdf(musteri_bilgileri.get('AD_SOYAD', '')[:25])))
+    doc.build(elements); buffer.seek(0); return buffer
+
+# =============================================================================
+# ÜRETİM ETİKET IZGARASI
+# =============================================================================
+# Kesilip kolilere yapıştırılan etiketler her biri için ayrı Table/Paragraph
+# kurulmadan, sabit bir ızgaraya doğrudan canvas'a çizilir. Izgara platypus
+# akışında tek bir Flowable'dır; sayfaya sığmayan satırlar split ile sonraki sayfaya geçer.
+ETIKET_KUTU = (5.8*cm, 4.3*cm)
+ETIKET_HUCRE_GENISLIK = 6.5*cm
+ETIKET_SUTUN = 3
+ETIKET_BOSLUK = (6, 3, 15)  # hücre içi sol, üst, alt boşluk (pt)
+ETIKET_SATIR_YUKSEKLIK = ETIKET_KUTU[1] + ETIKET_BOSLUK[1] + ETIKET_BOSLUK[2]
+# Kutu içi bantlar yukarıdan aşağı: numara, ürün adı, ölçü, boşluk, desi, müşteri
+ETIKET_BANTLAR = [0.8*cm, 1.2*cm, 0.5*cm, 0.5*cm, 0.8*cm, 0.5*cm]
+ETIKET_ISIM_FONTLARI = [(9, 12), (8, 10), (7, 8.5)]  # (punto, satır aralığı); ad sığana kadar küçülür
+
+class EtiketIzgarasi(Flowable):
+    def __init__(self, etiketler, musteri_kisa):
+        Flowable.__init__(self)
+        self.etiketler, self.musteri_kisa = etiketler, musteri_kisa
+        self.hAlign = 'CENTER'
+        self.width = ETIKET_HUCRE_GENISLIK * ETIKET_SUTUN
+
+    def _satir_sayisi(self): return -(-len(self.etiketler) // ETIKET_SUTUN)
+
+    def wrap(self, availWidth, availHeight):
+        self.height = self._satir_sayisi() * ETIKET_SATIR_YUKSEKLIK
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        sigan = int(availHeight // ETIKET_SATIR_YUKSEKLIK)
+        if sigan <= 0: return []
+        if sigan >= self._satir_sayisi(): return [self]
+        n = sigan * ETIKET_SUTUN
+        return [EtiketIzgarasi(self.etiketler[:n], self.musteri_kisa), EtiketIzgarasi(self.etiketler[n:], self.musteri_kisa)]
+
+    def draw(self):
+        c = self.canv
+        c.setLineWidth(1)
+        sol, ust, _ = ETIKET_BOSLUK
+        for i, p in enumerate(self.etiketler):
+            satir, sutun = divmod(i, ETIKET_SUTUN)
+            x = sutun * ETIKET_HUCRE_GENISLIK + sol
+            y = self.height - satir * ETIKET_SATIR_YUKSEKLIK - ust  # kutunun üst kenarı
+            _uretim_etiketi_ciz(c, x, y, p, self.musteri_kisa)
+
+def _uretim_etiketi_ciz(c, x, y, p, musteri_kisa):
+    g, h = ETIKET_KUTU
+    ic = 6  # yazı için yatay iç boşluk
+    c.rect(x, y - h, g, h)
+    bantlar, ust = [], y
+    for b in ETIKET_BANTLAR: bantlar.append((ust - b, b)); ust -= b
+    orta = lambda i, punto: bantlar[i][0] + bantlar[i][1] / 2 - punto * 0.35  # bandın ortasına taban çizgisi
+
+    c.setFont("Helvetica-Bold", 14)
+    c.drawRightString(x + g - ic, orta(0, 14), f"#{p['sira_no']}")
+
+    isim = tr_clean_for_pdf(p['kisa_isim'])
+    for punto, aralik in ETIKET_ISIM_FONTLARI:
+        satirlar = satir_kir(isim, "Helvetica-Bold", punto, g - 2*ic)
+        if len(satirlar) * aralik <= bantlar[1][1]: break
+    c.setFont("Helvetica-Bold", punto)
+    ilk = bantlar[1][0] + bantlar[1][1] / 2 + (len(satirlar) - 1) * aralik / 2 - punto * 0.35
+    for k, s in enumerate(satirlar): c.drawCentredString(x + g / 2, ilk - k * aralik, s.rstrip())
+
+    c.setFont("Helvetica", 8)
+    c.drawCentredString(x + g / 2, orta(2, 8), str(p['boyut_str']))
+    c.setFont("Helvetica-Bold", 11)
+    c.drawString(x + ic, orta(4, 11), f"Desi: {p['desi_val']}")
+    if musteri_kisa:
+        c.setFont("Helvetica-Bold", font_sigdir(musteri_kisa, "Helvetica-Bold", g - 2*ic, 10, 6))
+        c.drawCentredString(x + g / 2, orta(5, 10), musteri_kisa)
+
+# =============================================================================
+# GÜNCELLENMİŞ TERMAL ETİKET (TAM OPTİMİZE EDİLMİŞ ALAN YERLEŞİMİ)
+# =============================================================================
+# Etiket üç katmanda çizilir:
+#   statik : logo, gönderen bloğu, çizgiler, başlıklar ve uyarı notu (tüm etiketlerde aynı)
+#   sipariş: alıcı adı, adres, il/ilçe, telefon, ödeme tipi (siparişin tüm kolilerinde aynı)
+#   koli   : ürün adı, desi, PAKET n / N
+# İlk ikisi bir kez form XObject olarak çizilir; her sayfa yalnızca koli alanlarını damgalar.
+TERMAL_SAYFA = (80*mm, 120*mm)
+TERMAL_ALAN = (120*mm, 80*mm)  # 90° döndürülmüş çizim alanı
+
+def create_thermal_labels_8x12_rotated(etiket_listesi, musteri_bilgileri, toplam_etiket_sayisi):
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=TERMAL_SAYFA)
+    
+    # Logo süreç geneli önbellekten bir kez alınır; etiket döngüsü ağa hiç çıkmaz.
+    logo_img = logo_getir()
+
+    c.beginForm('termal_sablon', upperx=TERMAL_ALAN[0], uppery=TERMAL_ALAN[1])
+    _termal_statik_ciz(c, logo_img)
+    _termal_siparis_ciz(c, musteri_bilgileri)
+    c.endForm()
+
+    for p in etiket_listesi:
+        _termal_dondur(c)
+        c.doForm('termal_sablon')
+        _termal_koli_ciz(c, p, toplam_etiket_sayisi)
+        c.restoreState()
+        c.showPage()
+    
+    c.save()
+    buffer.seek(0)
+    return buffer
+
+def _termal_dondur(c):
+    # Sayfa dikey, etiket yatay basılır; çağıran restoreState ile kapatır
+    c.saveState()
+    c.rotate(90)
+    c.translate(0, -TERMAL_SAYFA[0])
+
+# c bir ReportLab canvas'ı ya da pdf_akisi.AkisSayfasi olabilir
+def _termal_statik_ciz(c, logo_img):
+    d_width, d_height = TERMAL_ALAN
+
+    # 1. Logo
+    if logo_img is not None:
+        c.drawImage(logo_img, 4*mm, d_height - 11*mm, width=28*mm, height=11*mm, mask='auto')
+
+    # 2. Gonderen Bilgileri (Sabit Üst Kısım)
+    c.setFont("Helvetica-Bold", 8)
+    c.drawString(38*mm, d_height - 4*mm, "GONDEREN FIRMA: NIXRAD / KARPAN DIZAYN A.S.")
+    c.setFont("Helvetica", 7)
+    c.drawString(38*mm, d_height - 8*mm, "Yeni Cami OSB Mah. 3.Cad. No:1 Kavak/SAMSUN   Tel: 0262 658 11 58")
+    
+    c.setLineWidth(0.4)
+    c.line(3*mm, d_height - 13*mm, d_width - 3*mm, d_height - 13*mm)
+    
+    # 3. Alici Musteri / 4. Adres başlıkları ve bölüm çizgileri
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(5*mm, d_height - 18*mm, "ALICI MUSTERI:")
+    c.line(3*mm, d_height - 27*mm, d_width - 3*mm, d_height - 27*mm)
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(5*mm, d_height - 32*mm, "ADRES :")
+    c.line(3*mm, d_height - 57*mm, d_width - 3*mm, d_height - 57*mm)
+
+    # 7. Kargo Teslimat Uyarı Notu
+    c.setLineWidth(0.2)
+    c.line(3*mm, d_height - 74*mm, d_width - 3*mm, d_height - 74*mm)
+    
+    uyari_1 = tr_clean_for_pdf("LÜTFEN KARGONUZU TESLİM ALIRKEN PAKETİ KONTROL EDİNİZ. HASAR VEYA EKSİK ÜRÜN VARSA")
+    uyari_2 = tr_clean_for_pdf("AYNI GÜN KARGO GÖREVLİSİNE TUTANAK TUTTURUNUZ. AKSİ HALDE SORUMLULUK ALICIYA AİTTİR.")
+    
+    c.setFont("Helvetica-Bold", 5.5)
+    c.drawCentredString(d_width / 2.0, d_height - 76.5*mm, uyari_1)
+    c.drawCentredString(d_width / 2.0, d_height - 78.5*mm, uyari_2)
+
+def _termal_siparis_ciz(c, musteri_bilgileri):
+    d_width, d_height = TERMAL_ALAN
+
+    alici_ad = tr_clean_for_pdf(musteri_bilgileri.get('AD_SOYAD', 'MUSTERI ADI'))
+    alici_adres = tr_clean_for_pdf(musteri_bilgileri.get('ADRES', 'ADRES GIRILMEDI')).replace('<br/>', ' ')
+    alici_tel = musteri_bilgileri.get('TELEFON', 'TELEFON YOK')
+    odeme_tipi_val = tr_clean_for_pdf(musteri_bilgileri.get('ODEME_TIPI', 'ALICI')) + " ODEME"
+    il_ilce_metni = tr_clean_for_pdf(musteri_bilgileri.get('IL_ILCE', '')).upper()
+
+    # 3. Alici Musteri
+    ad_font = font_sigdir(alici_ad, "Helvetica-Bold", d_width - 10*mm, 17, 7)
+    c.setFont("Helvetica-Bold", ad_font)
+    c.drawString(5*mm, d_height - 24*mm, alici_ad)
+    
+    # 4. Adres Kutusu (Alan DEvasa Büyütüldü)
+    adres_uzunluk = len(alici_adres)
+    if adres_uzunluk <= 70: adres_font, adres_lead = 14, 16
+    elif adres_uzunluk <= 110: adres_font, adres_lead = 12, 14
+    elif adres_uzunluk <= 160: adres_font, adres_lead = 10, 12
+    else: adres_font, adres_lead = 8, 10
+        
+    text_obj = c.beginText(24*mm, d_height - 32*mm)
+    text_obj.setFont("Helvetica", adres_font)
+    text_obj.setLeading(adres_lead)
+    
+    for line in satir_kir(alici_adres, "Helvetica", adres_font, d_width - 27*mm):
+        text_obj.textLine(line)
+    c.drawText(text_obj)
+    
+    # İl / İlçe ve Telefon Aynı Satırda (Adres kutusunun alt tabanına sabitlendi)
+    bottom_adres_y = d_height - 54*mm
+    
+    if il_ilce_metni:
+        il_ilce_font = adres_font + 1 
+        c.setFont("Helvetica-Bold", il_ilce_font) 
+        c.drawString(24*mm, bottom_adres_y, il_ilce_metni)
+        
+    c.setFont("Helvetica-Bold", 12)
+    c.drawRightString(d_width - 5*mm, bottom_adres_y, f"TEL : {alici_tel}")
+
+    # 6. Odeme Tipi (desi ve paket no ile aynı satırın ortası)
+    c.setFont("Helvetica-Bold", 13)
+    c.drawCentredString(d_width / 2.0, d_height - 71*mm, odeme_tipi_val)
+
+def _termal_koli_ciz(c, p, toplam_etiket_sayisi):
+    d_width, d_height = TERMAL_ALAN
+
+    no_str = f"PAKET: {p['sira_no']} / {toplam_etiket_sayisi}"
+    urun_adi = tr_clean_for_pdf(p['kisa_isim'])
+    desi_text = f"DESI : {p['desi_val']}"
+
+    # 5. Urun Adi
+    urun_font = font_sigdir(urun_adi, "Helvetica-Bold", d_width - 10*mm, 15, 6)
+    c.setFont("Helvetica-Bold", urun_font)
+    c.drawString(5*mm, d_height - 63*mm, urun_adi)
+
+    # 6. Desi ve Paket No (Tek satırda yan yana)
+    y_info = d_height - 71*mm
+    
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(5*mm, y_info, desi_text)
+    
+    c.setFont("Helvetica-Bold", 14)
+    c.drawRightString(d_width - 5*mm, y_info, no_str)
+
+# =============================================================================
+# ZPL TERMAL ETİKET (ZEBRA)
+# Aynı üç katmanlı çizim zpl_akisi ile ZPL komutlarına çevrilir. Statik ve
+# sipariş katmanları yazıcıya bir kez format olarak kaydedilir; her etiket
+# formatı çağırıp yalnızca ürün, desi ve PAKET n / N alanlarını gönderir.
+# logo=False: logosuz üretir; logo yerine bir ImageReader da verilebilir (altın
+# dosya karşılaştırması sabit bir örnek görselle ~DG dönüşümünü de sınar)
+# =============================================================================
+ZPL_FORMAT = 'NXTERMAL'
+
+def create_thermal_labels_zpl(etiket_listesi, musteri_bilgileri, toplam_etiket_sayisi, logo=True):
+    buffer = io.BytesIO()
+    zpl = ZplYazici(buffer, TERMAL_ALAN)
+    logo_img = logo_getir() if logo is True else logo or None
+    zpl.format_tanimla(ZPL_FORMAT, lambda c: (_termal_statik_ciz(c, logo_img), _termal_siparis_ciz(c, musteri_bilgileri)))
+    for p in etiket_listesi:
+        zpl.etiket_yaz(ZPL_FORMAT, lambda c: _termal_koli_ciz(c, p, toplam_etiket_sayisi))
+    buffer.seek(0)
+    return buffer
+
+# =============================================================================
+# ÇOK SİPARİŞLİ TERMAL ETİKET KUYRUĞU (SPOOL)
+# Günün tüm siparişlerinin etiketleri tek bir 80x120 mm PDF'e yazılır. Sayfalar
+# pdf_akisi ile üretildikleri anda hedefe akar; etiket sayısı ne olursa olsun
+# bellek sabit kalır. Her siparişin önüne bir ayırıcı sayfa konur, PAKET n / N
+# numaralandırması her siparişte kendi içinde sürer.
+# =============================================================================
+def _siparis_ayirici_ciz(c, sira, musteri_bilgileri, toplam_etiket_sayisi):
+    _termal_dondur(c)
+    d_width, d_height = TERMAL_ALAN
+
+    c.setLineWidth(2)
+    c.line(3*mm, d_height - 6*mm, d_width - 3*mm, d_height - 6*mm)
+    c.setFont("Helvetica-Bold", 20)
+    c.drawCentredString(d_width / 2.0, d_height - 20*mm, f"SIPARIS {sira}")
+
+    alici_ad = tr_clean_for_pdf(musteri_bilgileri.get('AD_SOYAD', '') or 'MUSTERI ADI')
+    ad_font = font_sigdir(alici_ad, "Helvetica-Bold", d_width - 10*mm, 17, 7)
+    c.setFont("Helvetica-Bold", ad_font)
+    c.drawCentredString(d_width / 2.0, d_height - 34*mm, alici_ad)
+
+    il_ilce_metni = tr_clean_for_pdf(musteri_bilgileri.get('IL_ILCE', '')).upper()
+    if il_ilce_metni:
+        c.setFont("Helvetica-Bold", 12)
+        c.drawCentredString(d_width / 2.0, d_height - 44*mm, il_ilce_metni)
+
+    c.setFont("Helvetica-Bold", 16)
+    c.drawCentredString(d_width / 2.0, d_height - 60*mm, f"{toplam_etiket_sayisi} PAKET")
+    c.line(3*mm, d_height - 74*mm, d_width - 3*mm, d_height - 74*mm)
+    c.restoreState()
+
+class _ParcaToplayici:
+    def __init__(self): self.parcalar = []
+    def write(self, veri): self.parcalar.append(veri)
+    def al(self):
+        veri = b''.join(self.parcalar); self.parcalar.clear()
+        return veri
+
+def _spool_adimlari(pdf, siparisler, ayirici):
+    # Her sayfa yazıldıktan sonra bir kez yield eder. Statik şablon tüm spool için,
+    # sipariş şablonu (statik + alıcı bilgileri) her sipariş için bir kez yazılır.
+    logo_img = logo_getir()
+    pdf.form_tanimla('statik', TERMAL_ALAN, lambda f: _termal_statik_ciz(f, logo_img))
+    for sira, (etiket_listesi, musteri_bilgileri, toplam_etiket_sayisi) in enumerate(siparisler, 1):
+        if ayirici:
+            sayfa = pdf.yeni_sayfa()
+            _siparis_ayirici_ciz(sayfa, sira, musteri_bilgileri, toplam_etiket_sayisi)
+            pdf.sayfa_yaz(sayfa); yield
+        sablon = f"siparis{sira}"
+        pdf.form_tanimla(sablon, TERMAL_ALAN, lambda f: (f.doForm('statik'), _termal_siparis_ciz(f, musteri_bilgileri)))
+        for p in etiket_listesi:
+            sayfa = pdf.yeni_sayfa()
+            _termal_dondur(sayfa)
+            sayfa.doForm(sablon)
+            _termal_koli_ciz(sayfa, p, toplam_etiket_sayisi)
+            sayfa.restoreState()
+            pdf.sayfa_yaz(sayfa); yield
+    pdf.kapat(); yield
+
+def termal_spool_yaz(siparisler, hedef, ayirici=True):
+    # siparisler: (etiket_listesi, musteri_bilgileri, toplam_etiket_sayisi) üçlüleri; tembel bir üreteç olabilir.
+    # hedef: write() metodu olan ikili dosya benzeri nesne.
+    pdf = AkisPDF(hedef, (80*mm, 120*mm))
+    for _ in _spool_adimlari(pdf, siparisler, ayirici): pass
+
+def termal_spool_parcalari(siparisler, ayirici=True):
+    # Parçalı (chunked) HTTP yanıtı için: her sayfanın baytları üretildikçe verilir
+    toplayici = _ParcaToplayici()
+    pdf = AkisPDF(toplayici, (80*mm, 120*mm))
+    for _ in _spool_adimlari(pdf, siparisler, ayirici):
+        veri = toplayici.al()
+        if veri: yield veri
@@ -0,0 +1,173 @@
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentetik_dia import BICIMLER, dosya_uret, kullanilabilir_bicimler
+
+# =============================================================================
+# PERFORMANS ÖLÇÜMÜ
+# Sentetik Dia dökümleri üzerinde başlık tarama, okuma, sınıflandırma, analiz, ortak koli
+# planı ve belgelerin üretimini ölçer. 'okuma' tam okumadır (başlık taraması dahil);
+# 'baslik_tarama' yalnızca kodlama / çalışma kitabı açma ve başlık aramasıdır. Her aşama için en iyi süre, tepe bellek (tracemalloc) ve
+# çıktı boyutu JSON'a yazılır; önceki bir JSON ile karşılaştırılabilir.
+#
+#   python benchmarks/olcum.py -o taban.json
+#   python benchmarks/olcum.py --boyutlar 10 1000 --karsilastir taban.json
+# =============================================================================
+
+BOYUTLAR = (10, 100, 1000, 10000)
+TEKRAR = 3
+GERILEME_ESIGI = 0.25  # %25'ten fazla yavaşlama gerileme sayılır
+GURULTU_MS = 5.0  # bundan küçük farklar yok sayılır
+
+
+def _olc(islem, tekrar, hazirla=None, bellek=True):
+    # (en iyi süre ms, tepe bellek KB, sonuç). Bellek ayrı bir çalıştırmada ölçülür, süreyi bozmasın diye.
+    en_iyi, sonuc = None, None
+    for _ in range(tekrar):
+        if hazirla: hazirla()
+        t = time.perf_counter()
+        sonuc = islem()
+        sure = (time.perf_counter() - t) * 1000
+        en_iyi = sure if en_iyi is None else min(en_iyi, sure)
+    if not bellek: return en_iyi, 0.0, sonuc
+    if hazirla: hazirla()
+    tracemalloc.start()
+    try:
+        islem()
+        _, tepe = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return en_iyi, tepe / 1024, sonuc
+
+
+def _bayt(sonuc):
+    if hasattr(sonuc, 'getvalue'): return len(sonuc.getvalue())
+    if isinstance(sonuc, (bytes, bytearray)): return len(sonuc)
+    return None
+
+
+def calistir(boyutlar=BOYUTLAR, bicimler=BICIMLER, tekrar=TEKRAR, bellek_olc=True, yazdir=print):
+    import pandas as pd
+    from hesaplama import siniflandirici, hesapla_ve_analiz_et, etiket_listesi_olustur, proje_toplamlari
+    from ice_aktarim import baslik_tara, dia_dosyasi_oku
+    from siparis_analizi import urunleri_siniflandir, siparisi_analiz_et
+    from stok_onbellegi import stok_onbellegi
+    from konsolidasyon import konsolide_et
+    from belgeler import create_cargo_pdf, create_production_pdf, create_thermal_labels_8x12_rotated, create_thermal_labels_zpl
+
+    # Analiz her seferinde baştan hesaplansın: kalıcı stok önbelleği ölçüm boyunca kapalı
+    stok_onbellegi.devre_disi = True
+    musteri = {'AD_SOYAD': 'Örnek İnşaat Taahhüt Ltd. Şti.', 'TELEFON': '0555 555 55 55',
+               'ADRES': 'Atatürk Mah. Cumhuriyet Cad. No: 12 Daire: 3', 'IL_ILCE': 'Kadıköy / İstanbul', 'ODEME_TIPI': 'ALICI'}
+    sonuclar = []
+    olc = lambda islem, hazirla=None: _olc(islem, tekrar, hazirla, bellek_olc)
+
+    def kaydet(bicim, satir, asama, sure, bellek, cikti):
+        sonuclar.append({'bicim': bicim, 'satir': satir, 'asama': asama, 'sure_ms': round(sure, 3),
+                         'tepe_bellek_kb': round(bellek, 1), 'cikti_bayt': cikti})
+        yazdir(f"{bicim:>10} {satir:>6} {asama:<14} {sure:10.1f} ms {bellek:10.0f} KB" + (f" {cikti:>10} B" if cikti is not None else ""))
+
+    bicimler, atlanan = kullanilabilir_bicimler(bicimler)
+    if atlanan: yazdir(f"xlwt kurulu değil, atlanan biçimler: {', '.join(atlanan)} (pip install -r requirements-dev.txt)")
+    if not bicimler: return sonuclar
+
+    for satir in boyutlar:
+        df = None
+        for bicim in bicimler:
+            ad, veri = dosya_uret(bicim, satir)
+            sure, bellek, _ = olc(lambda: baslik_tara(ad, io.BytesIO(veri)))
+            kaydet(bicim, satir, 'baslik_tarama', sure, bellek, None)
+            sure, bellek, sonuc = olc(lambda: dia_dosyasi_oku(ad, io.BytesIO(veri)))
+            kaydet(bicim, satir, 'okuma', sure, bellek, len(veri))
+            if df is None: df = sonuc
+
+        # Aşağıdaki aşamalar biçimden bağımsızdır; ilk biçimin okuduğu çerçeve üzerinde bir kez ölçülür
+        adlar = pd.unique(df['Stok Adı'].astype(str))
+        sure, bellek, _ = olc(lambda: urunleri_siniflandir(adlar))
+        kaydet('-', satir, 'siniflandirma', sure, bellek, None)
+
+        # Tekil yol (manuel hesap / eski satır döngüsü): sınıflandırıcı önbelleği her turda boşaltılır
+        miktarlar = pd.to_numeric(df['Miktar'], errors='coerce').fillna(0).tolist()
+        stoklar = df['Stok Adı'].astype(str).tolist()
+        tekil = lambda: [hesapla_ve_analiz_et(s, m) for s, m in zip(stoklar, miktarlar) if m > 0]
+        sure, bellek, _ = olc(tekil, hazirla=siniflandirici.siniflandir.cache_clear)
+        kaydet('-', satir, 'tekil_analiz', sure, bellek, None)
+
+        sure, bellek, (ham_veri, malzeme_listesi) = olc(lambda: siparisi_analiz_et(df))
+        kaydet('-', satir, 'analiz', sure, bellek, None)
+
+        sure, bellek, _ = olc(lambda: konsolide_et(ham_veri))
+        kaydet('-', satir, 'konsolidasyon', sure, bellek, None)
+
+        toplam_parca, toplam_desi, _ = proje_toplamlari(pd.DataFrame(ham_veri))
+        etiketler = etiket_listesi_olustur(ham_veri)
+        belgeler = {
+            'kargo': lambda: create_cargo_pdf(toplam_desi, toplam_parca, musteri, etiketler),
+            'uretim': lambda: create_production_pdf(malzeme_listesi, etiketler, musteri),
+            'termal': lambda: create_thermal_labels_8x12_rotated(etiketler, musteri, int(toplam_parca)),
+            'zpl': lambda: create_thermal_labels_zpl(etiketler, musteri, int(toplam_parca)),
+        }
+        for tur, olustur in belgeler.items():
+            sure, bellek, sonuc = olc(olustur)
+            kaydet('-', satir, tur, sure, bellek, _bayt(sonuc))
+
+    stok_onbellegi.devre_disi = False
+    return sonuclar
+
+
+def ortam():
+    surumler = {}
+    for paket in ('pandas', 'numpy', 'reportlab', 'openpyxl', 'xlrd', 'xlwt'):
+        try: surumler[paket] = __import__(paket).__version__
+        except Exception: surumler[paket] = None
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'islemci': platform.processor() or platform.machine(), **surumler}
+
+
+def karsilastir(taban, yeni, esik=GERILEME_ESIGI, yazdir=print):
+    # Aynı (biçim, satır, aşama) ölçümlerini oranlar; gerileme listesini döndürür
+    eski = {(s['bicim'], s['satir'], s['asama']): s for s in taban['sonuclar']}
+    gerilemeler = []
+    for s in yeni['sonuclar']:
+        o = eski.get((s['bicim'], s['satir'], s['asama']))
+        if o is None or not o['sure_ms']: continue
+        oran = s['sure_ms'] / o['sure_ms']
+        gerileme = oran > 1 + esik and s['sure_ms'] - o['sure_ms'] > GURULTU_MS
+        if gerileme: gerilemeler.append({**s, 'taban_ms': o['sure_ms'], 'oran': round(oran, 3)})
+        yazdir(f"{s['bicim']:>10} {s['satir']:>6} {s['asama']:<14} {o['sure_ms']:10.1f} -> {s['sure_ms']:10.1f} ms  x{oran:5.2f}" + ("  GERİLEME" if gerileme else ""))
+    return gerilemeler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sentetik Dia dökümleriyle okuma, analiz ve PDF üretim sürelerini ölçer.")
+    parser.add_argument('--boyutlar', type=int, nargs='+', default=list(BOYUTLAR), help="Satır sayıları (varsayılan: 10 100 1000 10000)")
+    parser.add_argument('--bicimler', nargs='+', choices=BICIMLER, default=list(BICIMLER))
+    parser.add_argument('--tekrar', type=int, default=TEKRAR, help="Aşama başına tekrar; en iyi süre alınır")
+    parser.add_argument('--bellek-yok', action='store_true', help="Tepe belleği ölçme (tracemalloc'lu tur atlanır, çok daha hızlı)")
+    parser.add_argument('-o', '--cikti', help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--karsilastir', help="Karşılaştırılacak önceki sonuç JSON'u")
+    parser.add_argument('--esik', type=float, default=GERILEME_ESIGI, help="Gerileme sayılacak yavaşlama oranı (varsayılan: 0.25)")
+    args = parser.parse_args(argv)
+
+    rapor = {'ortam': ortam(), 'tekrar': args.tekrar, 'sonuclar': calistir(args.boyutlar, args.bicimler, args.tekrar, not args.bellek_yok)}
+    if args.cikti:
+        with open(args.cikti, 'w', encoding='utf-8') as f: json.dump(rapor, f, ensure_ascii=False, indent=2)
+    if args.karsilastir:
+        with open(args.karsilastir, encoding='utf-8') as f: taban = json.load(f)
+        print()
+        gerilemeler = karsilastir(taban, rapor, args.esik)
+        if gerilemeler:
+            print(f"{len(gerilemeler)} aşamada gerileme var.")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import csv
+import io
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hesaplama import MODEL_DERINLIKLERI, ZORUNLU_HAVLUPANLAR, RENKLER, tr_upper
+
+# =============================================================================
+# SENTETİK DIA DÖKÜMLERİ
+# Gerçek dökümlere benzeyen sipariş dosyaları: başlık satırından önce rapor
+# başlığı / tarih satırları, Stok Kodu - Stok Adı - Birim - Miktar sütunları,
+# MODEL_DERINLIKLERI'ndeki tüm modeller, aksesuarlar ve sınıflandırılmayan
+# satırlar (nakliye, hizmet). Aynı tohumla her çalıştırmada aynı dosya üretilir.
+# xls yazmak için xlwt gerekir (requirements-dev.txt); kurulu değilse xls
+# biçimi atlanır, diğer biçimler yalnızca uygulama bağımlılıklarıyla üretilir.
+# =============================================================================
+
+BICIMLER = ('xls', 'xlsx', 'csv-utf8', 'csv-cp1254')
+BASLIK = ['Stok Kodu', 'Stok Adı', 'Birim', 'Miktar', 'Birim Fiyat', 'Tutar']
+
+RADYATOR_OLCULERI = ['600/400', '600/600', '600/800', '600/1000', '600/1200', '600/1600', '500/1000', '900/500', '1800/450']
+HAVLUPAN_OLCULERI = ['500/700', '500/1000', '600/1200', '500x1500', '450 / 800', '600/700']
+AKSESUARLAR = [
+    '1/2 TERMOSTATİK VANA BEYAZ', 'KÖŞE VANA SET KROM', '1/2 KÖR TAPA', 'VOLAN 1/2', 'HAVLUPAN AKSESUAR SETİ',
+    'TERMOSTATİK KAFA', 'RADYATÖR MONTAJ SETİ', 'ÜNİVERSAL VANA TAKIMI',
+]
+DIGER = ['NAKLİYE BEDELİ', 'MONTAJ HİZMETİ', 'AMBALAJ FARKI', 'İSKONTO']
+
+
+def kullanilabilir_bicimler(bicimler=BICIMLER):
+    # (üretilebilen biçimler, atlananlar)
+    try:
+        import xlwt  # noqa: F401
+        return list(bicimler), []
+    except ImportError:
+        return [b for b in bicimler if b != 'xls'], [b for b in bicimler if b == 'xls']
+
+
+def _urun_adi(rnd):
+    model = rnd.choice(list(MODEL_DERINLIKLERI))
+    ad = tr_upper(model)
+    # Dökümlerde model adı bazen büyük harf, bazen ilk harfi büyük yazılır
+    if rnd.random() < 0.3: ad = model.capitalize()
+    renk = rnd.choice(RENKLER)
+    if model in ZORUNLU_HAVLUPANLAR or rnd.random() < 0.15:
+        return f"{ad} {rnd.choice(HAVLUPAN_OLCULERI)} {renk} HAVLUPAN"
+    dilim = f" {rnd.randint(4, 20)} DILIM" if rnd.random() < 0.2 else ""
+    return f"{ad} {rnd.choice(RADYATOR_OLCULERI)}{dilim} {renk} {rnd.choice(['RADYATÖR', 'PANEL RADYATÖR', 'Radyatör'])}"
+
+
+def satirlar_uret(satir_sayisi, tohum=0):
+    # [Stok Kodu, Stok Adı, Birim, Miktar, Birim Fiyat, Tutar]; ürün %70, aksesuar %22, diğer %8
+    rnd = random.Random(tohum)
+    satirlar = []
+    for i in range(satir_sayisi):
+        r = rnd.random()
+        if r < 0.70: ad, birim = _urun_adi(rnd), 'ADET'
+        elif r < 0.92: ad, birim = rnd.choice(AKSESUARLAR), rnd.choice(['ADET', 'TAKIM'])
+        else: ad, birim = rnd.choice(DIGER), 'HİZMET'
+        miktar = rnd.choice([1, 1, 1, 2, 2, 3, 4, 5, 10]) if rnd.random() > 0.03 else 0
+        fiyat = round(rnd.uniform(50, 6000), 2)
+        satirlar.append([f"NX{10000 + i:05d}", ad, birim, miktar, fiyat, round(fiyat * miktar, 2)])
+    return satirlar
+
+
+def _ust_bilgi(rnd):
+    # Başlık satırından önceki rapor satırları (sayısı dosyadan dosyaya değişir)
+    ust = [['SİPARİŞ DETAY RAPORU', '', '', '', '', ''], ['Tarih: 18.10.2026', '', '', '', '', '']]
+    ust += [['', '', '', '', '', '']] * rnd.randint(0, 3)
+    return ust
+
+
+def dosya_uret(bicim, satir_sayisi, tohum=0):
+    # (dosya adı, bayt) döndürür
+    rnd = random.Random(tohum + 1)
+    tablo = _ust_bilgi(rnd) + [BASLIK] + satirlar_uret(satir_sayisi, tohum)
+    if bicim.startswith('csv'):
+        metin = io.StringIO()
+        csv.writer(metin).writerows(tablo)
+        kodlama = 'utf-8' if bicim == 'csv-utf8' else 'cp1254'
+        return f"siparis_{satir_sayisi}.csv", metin.getvalue().encode(kodlama)
+    if bicim == 'xlsx':
+        from openpyxl import Workbook
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Sayfa1')
+        for satir in tablo: ws.append([v if v != '' else None for v in satir])
+        cikti = io.BytesIO(); wb.save(cikti)
+        return f"siparis_{satir_sayisi}.xlsx", cikti.getvalue()
+    if bicim == 'xls':
+        import xlwt
+        wb = xlwt.Workbook(encoding='utf-8')
+        ws = wb.add_sheet('Sayfa1')
+        for r, satir in enumerate(tablo):
+            for c, v in enumerate(satir):
+                if v != '': ws.write(r, c, v)
+        cikti = io.BytesIO(); wb.save(cikti)
+        return f"siparis_{satir_sayisi}.xls", cikti.getvalue()
+    raise ValueError(f"Bilinmeyen biçim: {bicim}")
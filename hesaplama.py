@@ -0,0 +1,285 @@
+import re
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
+from itertools import accumulate
+
+# =============================================================================
+# 1. AYARLAR
+# =============================================================================
+
+AYARLAR = {
+    'HAVLUPAN': {'PAY_GENISLIK': 1.5, 'PAY_YUKSEKLIK': 0.5, 'PAY_DERINLIK': 0.5},
+    'RADYATOR': {'PAY_GENISLIK': 3.5, 'PAY_YUKSEKLIK': 0.5, 'PAY_DERINLIK': 3.0}
+}
+
+MODEL_DERINLIKLERI = {
+    'nirvana': 5.0, 'kumbaros': 4.5, 'floransa': 4.8, 'prag': 4.0,
+    'lizyantus': 4.0, 'lisa': 4.5, 'akasya': 4.0, 'hazal': 3.0,
+    'aspar': 4.0, 'livara': 4.5, 'livera': 4.5
+}
+
+ZORUNLU_HAVLUPANLAR = ['hazal', 'lisa', 'lizyantus', 'kumbaros']
+
+MODEL_AGIRLIKLARI = {
+    'nirvana': 1.10, 'prag': 0.71, 'livara': 0.81, 'livera': 0.81,
+    'akasya': 0.75, 'aspar': 1.05, 'lizyantus': 0.750, 'kumbaros': 0.856
+}
+
+HAVLUPAN_BORU_CETVELI = {
+    'lizyantus': {70: 6, 100: 8, 120: 10, 150: 12},
+    'kumbaros': {70: 5, 100: 7, 120: 8, 150: 10}
+}
+
+AKSESUAR_KELIMELERI = ['volan', 'tapa', 'aksesuar', 'set', 'termo', 'köşe']
+URUN_KELIMELERI = ['radyatör', 'havlupan', 'radyator']
+BOYUT_DESENI = r'(\d+)\s*[/xX]\s*(\d+)'
+DILIM_DESENI = r'(\d+)\s*DILIM'
+
+RENKLER = ["BEYAZ", "ANTRASIT", "SIYAH", "KROM", "ALTIN", "GRI", "KIRMIZI", "BRONZ", "INOX", "MAT SIYAH", "MAT BEYAZ", "RAL"]
+
+# =============================================================================
+# 2. YARDIMCI FONKSİYONLAR
+# =============================================================================
+
+def tr_clean_for_pdf(text):
+    if not isinstance(text, str): return str(text)
+    text = text.replace('\n', '<br/>')
+    mapping = {'ğ': 'g', 'Ğ': 'G', 'ş': 's', 'Ş': 'S', 'ı': 'i', 'İ': 'I', 'ç': 'c', 'Ç': 'C', 'ö': 'o', 'Ö': 'O', 'ü': 'u', 'Ü': 'U'}
+    for k, v in mapping.items(): text = text.replace(k, v)
+    return text
+
+def tr_lower(text): return text.replace('İ', 'i').replace('I', 'ı').lower()
+def tr_upper(text): return text.replace('i', 'İ').replace('ı', 'I').upper()
+
+def isim_kisalt(stok_adi):
+    return tr_clean_for_pdf(tr_upper(stok_adi).strip())
+
+def get_standart_paket_icerigi(tip, model_adi):
+    amb = "GENEL AMBALAJLAMA (Karton+ balon + Strec)"
+    if tip == 'HAVLUPAN': return [(1, "Adet", "1/2 PURJOR"), (1, "Takim", "3 LU HAVLUPAN MONTAJ SETI"), (3, "Adet", "DUBEL"), (3, "Adet", "MONTAJ VIDASI"), (1, "Set", amb)]
+    else:
+        ayak = f"{tr_clean_for_pdf(model_adi)} AYAK TAKIMI" if model_adi != "STANDART" else "RADYATOR AYAK TAKIMI"
+        return [(1, "Adet", "1/2 KOR TAPA"), (1, "Adet", "1/2 PURJOR"), (1, "Takim", ayak), (8, "Adet", "DUBEL"), (8, "Adet", "MONTAJ VIDASI"), (1, "Set", amb)]
+
+# =============================================================================
+# ÜRÜN SINIFLANDIRICI
+# Stok adındaki tüm anahtar kelimeler, ölçü ve dilim bilgisi tek bir derlenmiş
+# desenle tek geçişte bulunur. Aynı SKU'lar siparişlerde sürekli tekrarlandığı
+# için sonuç stok adına göre LRU ile saklanır.
+# =============================================================================
+
+Siniflandirma = namedtuple('Siniflandirma', 'model_key model_adi derinlik birim_kg tip sinif genislik yukseklik dilim')
+
+class UrunSiniflandirici:
+    def __init__(self, model_derinlikleri, zorunlu_havlupanlar, model_agirliklari, aksesuar_kelimeleri, urun_kelimeleri, onbellek_boyutu=4096):
+        self.model_derinlikleri = dict(model_derinlikleri)
+        self.model_agirliklari = dict(model_agirliklari)
+        self.havlupan_kelimeleri = frozenset(['havlupan', *zorunlu_havlupanlar])
+        self.aksesuar_kelimeleri = frozenset(aksesuar_kelimeleri)
+        self.urun_kelimeleri = frozenset(urun_kelimeleri)
+        kelimeler = set(self.model_derinlikleri) | self.havlupan_kelimeleri | self.aksesuar_kelimeleri | self.urun_kelimeleri | {'vana', 'nirvana'}
+        alternatif = '|'.join(re.escape(k) for k in sorted(kelimeler, key=len, reverse=True))
+        # İleri bakış (?=...) sayesinde çakışan kelimeler de (nirvana/vana gibi) her konumda yakalanır.
+        # Tarama tr_lower edilmiş ad üzerinde yapılır: 'X' -> 'x', tr_upper'daki 'DILIM' de burada 'dılım' olur.
+        self._desen = re.compile(rf'(?=(?P<kelime>{alternatif})|(?P<b1>\d+)\s*[/x]\s*(?P<b2>\d+)|(?P<dilim>\d+)\s*dılım)')
+        self.siniflandir = lru_cache(maxsize=onbellek_boyutu)(self._siniflandir)
+
+    def _siniflandir(self, stok_adi):
+        bulunan, boyut, dilim = set(), None, None
+        for m in self._desen.finditer(tr_lower(stok_adi)):
+            if m.group('kelime'): bulunan.add(m.group('kelime'))
+            elif m.group('b1'):
+                if boyut is None: boyut = (int(m.group('b1')), int(m.group('b2')))
+            elif dilim is None: dilim = int(m.group('dilim'))
+
+        # Model önceliği MODEL_DERINLIKLERI sırasıdır, metindeki konum değil
+        model_key = next((m for m in self.model_derinlikleri if m in bulunan), 'standart')
+        model_adi = "Standart" if model_key == 'standart' else ("Livara" if model_key == 'livera' else model_key.capitalize())
+        tip = 'HAVLUPAN' if bulunan & self.havlupan_kelimeleri else 'RADYATOR'
+        if ('vana' in bulunan and 'nirvana' not in bulunan) or bulunan & self.aksesuar_kelimeleri: sinif = 'AKSESUAR'
+        elif bulunan & self.urun_kelimeleri: sinif = 'URUN'
+        else: sinif = 'DIGER'
+
+        genislik = yukseklik = None
+        if boyut:
+            v1, v2 = boyut[0] / 10, boyut[1] / 10
+            if tip == 'HAVLUPAN': genislik, yukseklik = v1, v2
+            else: yukseklik, genislik = v1, v2
+        return Siniflandirma(model_key, model_adi, self.model_derinlikleri.get(model_key, 4.5), self.model_agirliklari.get(model_key),
+                             tip, sinif, genislik, yukseklik, dilim)
+
+siniflandirici = UrunSiniflandirici(MODEL_DERINLIKLERI, ZORUNLU_HAVLUPANLAR, MODEL_AGIRLIKLARI, AKSESUAR_KELIMELERI, URUN_KELIMELERI)
+
+def agirlik_hesapla(stok_adi, genislik_cm, yukseklik_cm, model_key):
+    if model_key not in MODEL_AGIRLIKLARI: return 0
+    
+    if model_key not in ['lizyantus', 'kumbaros']:
+        dilim_sayisi = siniflandirici.siniflandir(stok_adi).dilim if stok_adi else None
+        if dilim_sayisi is None:
+            if model_key in ['nirvana', 'prag']: dilim_sayisi = round((genislik_cm + 1) / 8)
+            elif model_key == 'akasya': dilim_sayisi = round((genislik_cm + 3) / 6)
+            elif model_key in ['livara', 'livera']: dilim_sayisi = round((genislik_cm + 0.5) / 6)
+            elif model_key == 'aspar': dilim_sayisi = round((genislik_cm + 1) / 10)
+            else: return 0
+        kg_per_dilim = (yukseklik_cm / 60) * MODEL_AGIRLIKLARI[model_key]
+        return round(dilim_sayisi * kg_per_dilim, 2)
+    else:
+        boru_sayisi = 0
+        if model_key in HAVLUPAN_BORU_CETVELI:
+            if int(yukseklik_cm) in HAVLUPAN_BORU_CETVELI[model_key]:
+                boru_sayisi = HAVLUPAN_BORU_CETVELI[model_key][int(yukseklik_cm)]
+            else:
+                div = 12.5 if model_key == 'lizyantus' else 15.0
+                boru_sayisi = round(yukseklik_cm / div)
+        else: boru_sayisi = round(yukseklik_cm / 7.5)
+        ref_agirlik = MODEL_AGIRLIKLARI.get(model_key, 0)
+        genislik_katsayisi = genislik_cm / 50.0
+        agirlik = boru_sayisi * ref_agirlik * genislik_katsayisi
+        return round(agirlik, 2)
+
+def hesapla_ve_analiz_et(stok_adi, adet):
+    if not isinstance(stok_adi, str): return None
+    sinif = siniflandirici.siniflandir(stok_adi)
+    tip = sinif.tip
+    
+    reçete = get_standart_paket_icerigi(tip, tr_upper(sinif.model_adi))
+    
+    paylar = AYARLAR[tip].copy()
+    if sinif.model_key == 'prag':
+        paylar['PAY_DERINLIK'] = 2.0
+
+    if sinif.genislik is not None:
+        genislik, yukseklik = sinif.genislik, sinif.yukseklik
+        k_en, k_boy, k_derin = genislik + paylar['PAY_GENISLIK'], yukseklik + paylar['PAY_YUKSEKLIK'], sinif.derinlik + paylar['PAY_DERINLIK']
+        desi = round((k_en * k_boy * k_derin) / 3000, 2)
+        agirlik_sonuc = agirlik_hesapla(stok_adi, genislik, yukseklik, sinif.model_key)
+        kisa_isim, boyut_str = isim_kisalt(stok_adi), f"{k_en}x{k_boy}x{k_derin}cm"
+        
+        return {
+            'Adet': int(adet), 
+            'Reçete': reçete,
+            'Etiket': {'kisa_isim': kisa_isim, 'boyut_str': boyut_str, 'desi_val': desi},
+            'Toplam_Desi': desi * adet, 
+            'Toplam_Agirlik': agirlik_sonuc * adet,
+            'Ürün': kisa_isim,
+            'Ölçü': boyut_str,
+            'Birim_Desi': desi,
+            'Toplam_Agirlik_Gosterim': round(agirlik_sonuc * adet, 1)
+        }
+    return None
+
+def manuel_hesapla(model_secimi, genislik, yukseklik, adet=1):
+    sinif = siniflandirici.siniflandir(model_secimi)
+    tip, base_derinlik, model_key = sinif.tip, sinif.derinlik, sinif.model_key
+    
+    paylar = AYARLAR[tip].copy()
+    if model_key == 'prag':
+        paylar['PAY_DERINLIK'] = 2.0
+    
+    k_en, k_boy, k_derin = genislik + paylar['PAY_GENISLIK'], yukseklik + paylar['PAY_YUKSEKLIK'], base_derinlik + paylar['PAY_DERINLIK']
+    desi = round((k_en * k_boy * k_derin) / 3000, 2)
+    birim_kg = agirlik_hesapla("", genislik, yukseklik, model_key)
+    return desi, f"{k_en}x{k_boy}x{k_derin}cm", round(birim_kg * adet, 2)
+
+# ham_veri satırlarının taşıdığı tekil koli ölçüsü (cm); tabloda gösterilmez, ortak koli planı kullanır.
+# Elle eklenen ya da ürünü / ölçüsü düzenlenen satırda bulunmaz, o zaman 'Ölçü' metni okunur.
+KOLI_OLCU_ALANLARI = ('k_en', 'k_boy', 'k_derin')
+
+def proje_toplamlari(df):
+    # (toplam koli, toplam desi, toplam ağırlık) — ham_veri / düzenlenmiş tablo sütunlarından
+    toplam_parca = df["Adet"].sum()
+    proje_toplam_desi = (df["Birim Desi"] * df["Adet"]).sum()
+    proje_toplam_agirlik = df["Toplam Ağırlık"].sum()
+    return toplam_parca, proje_toplam_desi, proje_toplam_agirlik
+
+# Koli listesi fiziksel koli başına bir sözlük yerine ardışık aynı ürünlerin
+# (ürün, ölçü, desi, adet, ilk sıra no) koşuları olarak tutulur. Uzunluk ve
+# toplam desi sabit zamanda okunur; koli görünümleri yalnızca gezinirken üretilir.
+class Koli:
+    __slots__ = ('sira_no', 'kisa_isim', 'boyut_str', 'desi_val')
+
+    def __init__(self, sira_no, kisa_isim, boyut_str, desi_val):
+        self.sira_no, self.kisa_isim, self.boyut_str, self.desi_val = sira_no, kisa_isim, boyut_str, desi_val
+
+    # Çizim kodu eskisi gibi p['sira_no'] ile okur
+    def __getitem__(self, alan): return getattr(self, alan)
+
+    def __repr__(self): return f"Koli(#{self.sira_no} {self.kisa_isim})"
+
+
+class PaketListesi:
+    __slots__ = ('_urunler', '_olculer', '_desiler', '_adetler', '_baslangiclar', '_uzunluk', '_toplam_desi', '_kumulatif')
+
+    def __init__(self):
+        self._urunler, self._olculer = [], []
+        self._desiler, self._adetler, self._baslangiclar = array('d'), array('q'), array('q')
+        self._uzunluk, self._toplam_desi = 0, 0.0
+        self._kumulatif = None  # koşu sonlarının konumu; indeksleme için ilk kullanımda kurulur
+
+    def ekle(self, urun, olcu, desi, adet, baslangic=None):
+        if adet <= 0: return
+        if baslangic is None: baslangic = self._baslangiclar[-1] + self._adetler[-1] if self._adetler else 1
+        self._urunler.append(urun); self._olculer.append(olcu)
+        self._desiler.append(desi); self._adetler.append(adet); self._baslangiclar.append(baslangic)
+        self._uzunluk += adet; self._toplam_desi += desi * adet
+        self._kumulatif = None
+
+    def __len__(self): return self._uzunluk
+
+    @property
+    def toplam_desi(self): return self._toplam_desi
+
+    def ilk_kosular(self, n):
+        # İlk n koşudan oluşan yeni liste; bu liste değişmez (artımlı yeniden kurulumda öneki korumak için)
+        yeni = PaketListesi()
+        yeni._urunler, yeni._olculer = self._urunler[:n], self._olculer[:n]
+        yeni._desiler, yeni._adetler, yeni._baslangiclar = self._desiler[:n], self._adetler[:n], self._baslangiclar[:n]
+        # ekle ile aynı sırada toplanır; tamamını baştan kurmakla aynı toplam çıkar
+        for desi, adet in zip(yeni._desiler, yeni._adetler):
+            yeni._uzunluk += adet; yeni._toplam_desi += desi * adet
+        return yeni
+
+    def kosular(self):
+        # (ürün, ölçü, desi, adet, ilk sıra no)
+        return zip(self._urunler, self._olculer, self._desiler, self._adetler, self._baslangiclar)
+
+    def __iter__(self):
+        for urun, olcu, desi, adet, bas in self.kosular():
+            for sira in range(bas, bas + adet): yield Koli(sira, urun, olcu, desi)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            # Dilim koli sırasıyla alınır, sıra numaraları korunur (sayfalara bölme için)
+            bas, bit, adim = i.indices(self._uzunluk)
+            if adim != 1: raise ValueError("PaketListesi dilimi adımsız olmalı")
+            yeni, konum = PaketListesi(), 0
+            for urun, olcu, desi, adet, ilk in self.kosular():
+                alt, ust = max(bas, konum), min(bit, konum + adet)
+                if alt < ust: yeni.ekle(urun, olcu, desi, ust - alt, ilk + alt - konum)
+                konum += adet
+                if konum >= bit: break
+            return yeni
+        if i < 0: i += self._uzunluk
+        if not 0 <= i < self._uzunluk: raise IndexError(i)
+        if self._kumulatif is None: self._kumulatif = array('q', accumulate(self._adetler))
+        kumulatif = self._kumulatif
+        k = bisect_right(kumulatif, i)
+        return Koli(self._baslangiclar[k] + i - (kumulatif[k - 1] if k else 0), self._urunler[k], self._olculer[k], self._desiler[k])
+
+
+def paket_listesi(etiketler):
+    # PaketListesi aynen döner; koli sözlükleri / Koli nesnelerinden oluşan düz liste koşulara çevrilir
+    if isinstance(etiketler, PaketListesi): return etiketler
+    liste = PaketListesi()
+    for p in etiketler: liste.ekle(p['kisa_isim'], p['boyut_str'], p['desi_val'], 1, p['sira_no'])
+    return liste
+
+
+def etiket_listesi_olustur(satirlar):
+    # Her fiziksel koli için bir etiket; sıra numarası tüm sipariş boyunca devam eder
+    etiket_listesi = PaketListesi()
+    for row in satirlar:
+        etiket_listesi.ekle(row['Ürün'], row['Ölçü'], row['Birim Desi'], int(row['Adet']))
+    return etiket_listesi
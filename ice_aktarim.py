@@ -0,0 +1,170 @@
+import codecs
+import csv
+import io
+
+import pandas as pd
+
+# =============================================================================
+# DIA DOSYASI İÇE AKTARMA
+# Kodlama dosyanın ilk birkaç KB'ından, başlık satırı ilk BASLIK_ARAMA_SATIRI
+# satırdan tespit edilir, ardından sadece 'Stok Adı' ve 'Miktar' sütunları
+# okunur. Başlık bu sınırın ötesindeyse dosyanın tamamı taranır (yavaş yol).
+# CSV başlık kaydının bayt konumundan okunur; tırnaklı çok satırlı hücreler ve
+# boş satırlar satır sayımını kaydırmaz. xlsx openpyxl'in salt-okunur akış
+# modu ile, xls ise xlrd ile sadece ilk sayfa yüklenerek okunur.
+# =============================================================================
+
+GEREKLI_SUTUNLAR = ['Stok Adı', 'Miktar']
+BASLIK_ANAHTARI = "Stok Adı"
+BASLIK_ARAMA_SATIRI = 200
+ORNEK_BAYT = 64 * 1024
+
+
+def _baslik_mi(hucreler):
+    return BASLIK_ANAHTARI in " ".join(str(v) for v in hucreler if v is not None)
+
+def _sutun_indeksleri(baslik):
+    # Başlıkta iki sütun da varsa onların yeri, yoksa eski davranıştaki gibi 1. ve 3. sütun
+    adlar = [str(v).strip() if v is not None else '' for v in baslik]
+    if all(s in adlar for s in GEREKLI_SUTUNLAR): return [adlar.index(s) for s in GEREKLI_SUTUNLAR]
+    return [0, 2]
+
+def _cerceve(stok, miktar):
+    # Sütunlar her okuma yolunda object (pandas 3 metin listesinden str dtype çıkarır); yükleme önbelleğinin diskten kurduğu çerçeveyle aynı
+    df = pd.DataFrame({'Stok Adı': pd.Series(stok, dtype=object), 'Miktar': pd.Series(miktar, dtype=object)})
+    return df.dropna(subset=['Stok Adı'])
+
+def kodlama_tespit_et(veri):
+    ornek = veri[:ORNEK_BAYT]
+    if ornek.startswith(codecs.BOM_UTF8): return 'utf-8-sig'
+    try:
+        # final=False: örneğin sonunda yarıda kalan çok baytlı karakter hata sayılmaz
+        codecs.getincrementaldecoder('utf-8')().decode(ornek, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1254'
+
+def _satirlarda_baslik(satirlar, sinir=BASLIK_ARAMA_SATIRI):
+    # (başlık satır no, sütun indeksleri) ya da None; satırlar bir yineleyiciyse başlıktan sonrası okunmadan kalır
+    for i, hucreler in enumerate(satirlar):
+        if sinir is not None and i >= sinir: return None
+        if _baslik_mi(hucreler): return i, _sutun_indeksleri(hucreler)
+    return None
+
+def _csv_kayitlari(veri, kodlama, konumlar):
+    # csv.reader kayıtları; her kaydın başladığı bayt konumu konumlar listesine eklenir.
+    # Fiziksel satırlar bayt olarak bölünür; '\n' utf-8 ve cp1254'te çok baytlı karakterin parçası olamaz
+    okunan = [0]
+    def satirlar():
+        for satir in io.BytesIO(veri):
+            okunan[0] += len(satir)
+            yield satir.decode(kodlama, errors='ignore')
+    konum = 0
+    for hucreler in csv.reader(satirlar()):
+        konumlar.append(konum)
+        yield hucreler
+        konum = okunan[0]
+
+def _csv_baslik(veri, sinir=BASLIK_ARAMA_SATIRI):
+    # (kodlama, (başlık kaydının bayt konumu, sütun indeksleri) ya da None)
+    kodlama, konumlar = kodlama_tespit_et(veri), []
+    bulunan = _satirlarda_baslik(_csv_kayitlari(veri, kodlama, konumlar), sinir)
+    if bulunan is None: return kodlama, None
+    return kodlama, (konumlar[bulunan[0]], bulunan[1])
+
+def _csv_oku(veri):
+    kodlama, bulunan = _csv_baslik(veri)
+    if bulunan is None:
+        # Başlık ilk BASLIK_ARAMA_SATIRI kayıtta yok: dosyanın tamamı taranır
+        kodlama, bulunan = _csv_baslik(veri, sinir=None)
+        if bulunan is None: return None
+
+    konum, indeksler = bulunan
+    for k in dict.fromkeys([kodlama, 'cp1254']):
+        try:
+            # Başlık kaydının bayt konumundan okunur; pandas'ın satır sayımına (skiprows) güvenilmez
+            df = pd.read_csv(io.BytesIO(veri[konum:]), encoding=k, header=0, usecols=indeksler, dtype=object)
+            break
+        except UnicodeDecodeError:
+            # Örnek temiz çıktı ama dosyanın devamı UTF-8 değil
+            continue
+    else:
+        return None
+    # usecols sütunları dosyadaki sırayla döndürür
+    sirali = sorted(indeksler)
+    return _cerceve(df.iloc[:, sirali.index(indeksler[0])].tolist(), df.iloc[:, sirali.index(indeksler[1])].tolist())
+
+def _xlsx_oku(veri):
+    from openpyxl import load_workbook
+    wb = load_workbook(io.BytesIO(veri), read_only=True, data_only=True)
+    try:
+        satirlar = wb.worksheets[0].iter_rows(values_only=True)
+        bulunan = _satirlarda_baslik(satirlar)
+        if bulunan is None: return None
+        s_i, m_i = bulunan[1]
+        stok, miktar = [], []
+        for hucreler in satirlar:
+            stok.append(hucreler[s_i] if s_i < len(hucreler) else None)
+            miktar.append(hucreler[m_i] if m_i < len(hucreler) else None)
+        return _cerceve(stok, miktar)
+    finally:
+        wb.close()
+
+def _xls_hucre(v):
+    # xlrd boş hücreyi '' ve tam sayıyı float döndürür; pandas'ın okuduğu değerlere çevrilir
+    if v == '': return None
+    if isinstance(v, float) and v.is_integer(): return int(v)
+    return v
+
+def _xls_oku(veri):
+    import xlrd
+    wb = xlrd.open_workbook(file_contents=veri, on_demand=True)
+    try:
+        sayfa = wb.sheet_by_index(0)
+        bulunan = _satirlarda_baslik(sayfa.row_values(i) for i in range(sayfa.nrows))
+        if bulunan is None: return None
+        i, (s_i, m_i) = bulunan
+        stok = [_xls_hucre(v) for v in sayfa.col_values(s_i, start_rowx=i + 1)] if s_i < sayfa.ncols else [None] * (sayfa.nrows - i - 1)
+        miktar = [_xls_hucre(v) for v in sayfa.col_values(m_i, start_rowx=i + 1)] if m_i < sayfa.ncols else [None] * (sayfa.nrows - i - 1)
+        return _cerceve(stok, miktar)
+    finally:
+        wb.release_resources()
+
+def _tam_oku(veri):
+    # Tanınmayan biçimler (ör. .xls uzantılı HTML) ve başlığı arama sınırının ötesinde kalan
+    # çalışma kitapları için eski yol: tüm sayfa okunup başlık aranır
+    df_raw = pd.read_excel(io.BytesIO(veri))
+    for i, hucreler in enumerate(df_raw.itertuples(index=False)):
+        if _baslik_mi(hucreler):
+            s_i, m_i = _sutun_indeksleri(hucreler)
+            return _cerceve(df_raw.iloc[i + 1:, s_i].tolist(), df_raw.iloc[i + 1:, m_i].tolist())
+    return None
+
+def baslik_tara(dosya_adi, dosya):
+    # Yalnızca başlık tespiti (kodlama / çalışma kitabı açma + başlık arama); (satır no, sütun indeksleri) ya da None.
+    # Okuma yolundaki adımın aynısıdır; benchmarks/olcum.py bu aşamayı ayrı ölçer.
+    veri = dosya.getvalue() if hasattr(dosya, 'getvalue') else dosya.read()
+    if dosya_adi.lower().endswith('.csv'): return _csv_baslik(veri)[1]
+    if veri[:2] == b'PK':
+        from openpyxl import load_workbook
+        wb = load_workbook(io.BytesIO(veri), read_only=True, data_only=True)
+        try: return _satirlarda_baslik(wb.worksheets[0].iter_rows(values_only=True))
+        finally: wb.close()
+    if veri[:4] == b'\xd0\xcf\x11\xe0':
+        import xlrd
+        wb = xlrd.open_workbook(file_contents=veri, on_demand=True)
+        try:
+            sayfa = wb.sheet_by_index(0)
+            return _satirlarda_baslik(sayfa.row_values(i) for i in range(sayfa.nrows))
+        finally: wb.release_resources()
+    return None
+
+def dia_dosyasi_oku(dosya_adi, dosya):
+    # 'Stok Adı' / 'Miktar' çerçevesi döner; başlık bulunamazsa None.
+    veri = dosya.getvalue() if hasattr(dosya, 'getvalue') else dosya.read()
+    if dosya_adi.lower().endswith('.csv'): return _csv_oku(veri)
+    if veri[:2] == b'PK': df = _xlsx_oku(veri)
+    elif veri[:4] == b'\xd0\xcf\x11\xe0': df = _xls_oku(veri)
+    else: return _tam_oku(veri)
+    # Başlık ilk BASLIK_ARAMA_SATIRI satırda yoksa tüm sayfa okunarak aranır
+    return df if df is not None else _tam_oku(veri)
@@ -0,0 +1,85 @@
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+# =============================================================================
+# AÇILIŞ (İÇE AKTARMA) BÜTÇESİ
+# app.py'nin en üst düzeyde içe aktardığı modüller temiz bir yorumlayıcıda
+# yüklenir ve süresi ölçülür. Ağır kütüphanelerden biri açılışta yüklenmişse ya
+# da süre bütçeyi aşarsa 1 ile çıkar; dağıtım öncesi kontrol olarak çalıştırılır.
+#
+#   python ithalat_butcesi.py
+#   python ithalat_butcesi.py --butce 80 --tekrar 10
+# =============================================================================
+
+KOK = os.path.dirname(os.path.abspath(__file__))
+ACILIS_BUTCESI_MS = 150  # streamlit hariç, uygulamanın kendi modülleri
+YASAK_MODULLER = ('pandas', 'numpy', 'reportlab', 'matplotlib', 'requests', 'openpyxl', 'xlrd', 'PIL')
+HARIC = ('streamlit',)  # her durumda yüklenen, ölçümü bizim elimizde olmayan paketler
+
+_OLCUM = """
+import json, sys, time
+t = time.perf_counter()
+{ithalatlar}
+ms = (time.perf_counter() - t) * 1000
+print(json.dumps({{'ms': ms, 'moduller': sorted(m.split('.')[0] for m in sys.modules)}}))
+"""
+
+
+def acilis_modulleri(uygulama=os.path.join(KOK, 'app.py')):
+    # app.py'nin modül düzeyindeki import satırları (fonksiyon / blok içindeki tembel importlar hariç)
+    with open(uygulama, encoding='utf-8') as f: agac = ast.parse(f.read())
+    moduller = []
+    for dugum in agac.body:
+        if isinstance(dugum, ast.Import): moduller += [a.name for a in dugum.names]
+        elif isinstance(dugum, ast.ImportFrom) and dugum.module: moduller.append(dugum.module)
+    return [m for m in dict.fromkeys(moduller) if m.split('.')[0] not in HARIC]
+
+
+def olc(moduller):
+    # Ayrı süreçte bir ölçüm: (süre ms, yüklenen üst düzey paketler, -X importtime çıktısı)
+    kod = _OLCUM.format(ithalatlar='\n'.join(f"import {m}" for m in moduller))
+    sonuc = subprocess.run([sys.executable, '-X', 'importtime', '-c', kod], cwd=KOK, capture_output=True, text=True, check=True)
+    veri = json.loads(sonuc.stdout.strip().splitlines()[-1])
+    return veri['ms'], set(veri['moduller']), sonuc.stderr
+
+
+def _ust_duzey_importlar(importtime_ciktisi):
+    # "import time: self [us] | cumulative | imported package" satırlarından en üst düzey paketler
+    for satir in importtime_ciktisi.splitlines():
+        if not satir.startswith('import time:') or 'cumulative' in satir: continue
+        _, birikimli, ad = satir[len('import time:'):].split('|')
+        if ad.startswith('  '): continue  # iç içe import
+        yield int(birikimli) / 1000, ad.strip()
+
+
+def en_agirlar(importtime_ciktisi, yorumlayici_ciktisi='', adet=8):
+    # Yorumlayıcının kendi açılışında yüklenenler (site, encodings ...) listelenmez
+    acilis = {ad for _, ad in _ust_duzey_importlar(yorumlayici_ciktisi)}
+    return sorted((s, ad) for s, ad in _ust_duzey_importlar(importtime_ciktisi) if ad not in acilis)[::-1][:adet]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Uygulama açılışında içe aktarılan modüllerin süresini bütçeyle karşılaştırır.")
+    parser.add_argument('--butce', type=float, default=ACILIS_BUTCESI_MS, help=f"Milisaniye cinsinden bütçe (varsayılan: {ACILIS_BUTCESI_MS})")
+    parser.add_argument('--tekrar', type=int, default=5, help="Ölçüm sayısı; en iyisi alınır (varsayılan: 5)")
+    args = parser.parse_args(argv)
+
+    moduller = acilis_modulleri()
+    olcumler = [olc(moduller) for _ in range(max(1, args.tekrar))]
+    ms, yuklenen, importtime = min(olcumler, key=lambda o: o[0])
+    yasak = sorted(set(YASAK_MODULLER) & yuklenen)
+
+    print(f"Açılış modülleri: {', '.join(moduller)}")
+    print(f"Süre: {ms:.1f} ms (bütçe {args.butce:.0f} ms, {len(olcumler)} ölçümün en iyisi)")
+    for sure, ad in en_agirlar(importtime, olc([])[2]): print(f"  {sure:8.1f} ms  {ad}")
+    if yasak: print(f"HATA: açılışta yüklenmemesi gereken modüller: {', '.join(yasak)}")
+    if ms > args.butce: print("HATA: bütçe aşıldı")
+    return 1 if yasak or ms > args.butce else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
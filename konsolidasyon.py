@@ -0,0 +1,259 @@
+import argparse
+import re
+import sys
+from collections import namedtuple
+from itertools import permutations
+
+from hesaplama import AYARLAR, KOLI_OLCU_ALANLARI, PaketListesi, siniflandirici
+
+# =============================================================================
+# SEVKİYAT KONSOLİDASYONU (ORTAK KOLİ PLANI)
+# Normalde her ürün kendi kolisinde gider ve her koli ayrı desi öder. Burada
+# ürünler tekil ambalaj payları (AYARLAR) çıkarılmış ölçüleriyle, aralarına
+# ARA_PAY bırakılarak KARTONLAR'daki ortak kolilere yerleştirilir.
+# Yerleşim uç nokta (extreme point) tabanlı ilk uygun, hacmi azalan sezgiseldir:
+# her ürün son açılan kolilerdeki köşe noktalarına 6 yönelimle denenir, sığmazsa
+# en küçük uygun karton açılır. Dolan koli içeriği daha küçük kartonlara sığıyorsa
+# küçültülür. Bir ortak koli yalnızca desisi içindeki ürünlerin kendi kolileri
+# toplamından düşükse kabul edilir; kalan ürünler eskisi gibi tek tek gider.
+# Koli ölçüsü analizin satıra koyduğu k_en / k_boy / k_derin alanlarından alınır.
+#
+#   python konsolidasyon.py                 (ORNEK_SIPARIS; plan desiyi düşürmezse 1 ile çıkar)
+#   python konsolidasyon.py siparis.xls     (Dia dökümü için planı gösterir)
+# =============================================================================
+
+# (ad, dış en, dış boy, dış derinlik cm, en çok kg)
+Karton = namedtuple('Karton', 'ad en boy derin max_kg')
+
+KARTONLAR = [
+    Karton('K60-10', 62, 82, 10, 25),
+    Karton('K60-16', 62, 82, 16, 30),
+    Karton('K105-14', 105, 65, 14, 35),
+    Karton('K105-20', 105, 65, 20, 40),
+    Karton('K125-14', 127, 65, 14, 35),
+    Karton('K125-20', 127, 65, 20, 40),
+    Karton('K165-14', 165, 65, 14, 40),
+    Karton('K185-14', 185, 65, 14, 40),
+]
+KARTON_DUVARI = 1.0  # dış ölçüden iç ölçüye her boyutta düşülen (iki duvar)
+ARA_PAY = 1.0  # ortak kolide her ürüne her boyutta eklenen balon / köpük payı
+ACIK_KARTON_PENCERESI = 8  # ürün yalnızca son açılan bu kadar kolide denenir (hacme göre sıralı geldiği için yeterli)
+KONSOLIDASYON_SINIRI = 2000  # bundan çok kolili siparişte plan çıkarılmaz (tek tek gönderilir)
+
+# Tipik bir daire siparişi (Stok Adı, Miktar): aynı ölçüde üst üste konabilen radyatörler, havlupan, aksesuar
+ORNEK_SIPARIS = [
+    ('Nirvana 600/1000 radyatör beyaz', 2), ('Nirvana 600/1200 radyatör beyaz', 3), ('Prag 600/600 radyatör antrasit', 2),
+    ('Akasya 600/800 radyatör', 1), ('Lizyantus havlupan 500/700 beyaz', 2), ('1/2 termostatik vana beyaz', 7),
+]
+
+_OLCU_DESENI = re.compile(r'([\d.]+)\s*x\s*([\d.]+)\s*x\s*([\d.]+)')
+_EPS = 1e-6
+
+
+def _desi(en, boy, derin): return round((en * boy * derin) / 3000, 2)
+
+
+def _olcu_str(en, boy, derin): return f"{en}x{boy}x{derin}cm"
+
+
+def _cipla_olcu(satir):
+    # Koli ölçüsünden (k_en x k_boy x k_derin) tekil ambalaj payları düşülür. Ölçü alanları yoksa
+    # (elle eklenen / ölçüsü düzenlenen satır) 'Ölçü' metni okunur; o da okunamazsa None
+    olcu = [satir.get(s) for s in KOLI_OLCU_ALANLARI]
+    if any(v is None or v != v for v in olcu):
+        m = _OLCU_DESENI.search(str(satir.get('Ölçü') or ''))
+        if m is None: return None
+        olcu = m.groups()
+    sinif = siniflandirici.siniflandir(str(satir['Ürün']))
+    paylar = AYARLAR[sinif.tip]
+    pay_derinlik = 2.0 if sinif.model_key == 'prag' else paylar['PAY_DERINLIK']
+    k_en, k_boy, k_derin = (float(v) for v in olcu)
+    return (max(k_en - paylar['PAY_GENISLIK'], 0.5) + ARA_PAY, max(k_boy - paylar['PAY_YUKSEKLIK'], 0.5) + ARA_PAY,
+            max(k_derin - pay_derinlik, 0.5) + ARA_PAY)
+
+
+# Yerleştirilecek tek fiziksel ürün: satır sırası, ad, tekil koli ölçüsü / desisi, ambalajsız ölçü, kg
+Parca = namedtuple('Parca', 'sira urun olcu desi boyut kg')
+
+
+class _AcikKarton:
+    __slots__ = ('karton', 'ic', 'bos_hacim', 'yerlesimler', 'noktalar', 'parcalar', 'kg', 'sigmayanlar')
+
+    def __init__(self, karton):
+        self.karton = karton
+        self.ic = (karton.en - KARTON_DUVARI, karton.boy - KARTON_DUVARI, karton.derin - KARTON_DUVARI)
+        self.bos_hacim = self.ic[0] * self.ic[1] * self.ic[2]
+        self.yerlesimler, self.parcalar = [], []
+        self.noktalar = [(0.0, 0.0, 0.0)]
+        self.kg = 0.0
+        # Yerleşim yalnızca dolarak değiştiği için bir kez sığmayan ölçü bir daha denenmez
+        self.sigmayanlar = set()
+
+    def _bos_mu(self, x, y, z, w, h, d):
+        W, H, D = self.ic
+        if x + w > W + _EPS or y + h > H + _EPS or z + d > D + _EPS: return False
+        for px, py, pz, pw, ph, pd in self.yerlesimler:
+            if x < px + pw - _EPS and px < x + w - _EPS and y < py + ph - _EPS and py < y + h - _EPS and z < pz + pd - _EPS and pz < z + d - _EPS:
+                return False
+        return True
+
+    def yerlestir(self, parca):
+        if self.kg + parca.kg > self.karton.max_kg + _EPS or parca.boyut in self.sigmayanlar: return False
+        w, h, d = parca.boyut
+        if w * h * d > self.bos_hacim + _EPS: return False
+        yonelimler = set(permutations(parca.boyut))
+        # Alt-arka-sol köşeden başlayarak ilk uygun nokta / yönelim
+        for nokta in sorted(self.noktalar, key=lambda n: (n[2], n[1], n[0])):
+            x, y, z = nokta
+            for w, h, d in sorted(yonelimler):
+                if self._bos_mu(x, y, z, w, h, d):
+                    self.yerlesimler.append((x, y, z, w, h, d))
+                    self.noktalar.remove(nokta)
+                    self.noktalar += [(x + w, y, z), (x, y + h, z), (x, y, z + d)]
+                    self.parcalar.append(parca)
+                    self.kg += parca.kg
+                    self.bos_hacim -= w * h * d
+                    return True
+        self.sigmayanlar.add(parca.boyut)
+        return False
+
+
+def _sigar_mi(karton, parca):
+    ic = sorted((karton.en - KARTON_DUVARI, karton.boy - KARTON_DUVARI, karton.derin - KARTON_DUVARI))
+    return parca.kg <= karton.max_kg + _EPS and all(b <= i + _EPS for b, i in zip(sorted(parca.boyut), ic))
+
+
+def _kucult(acik, kartonlar):
+    # Aynı içerik daha küçük desili bir kartona sığıyorsa orada yeniden yerleştirilir
+    for karton in kartonlar:
+        if _desi(karton.en, karton.boy, karton.derin) >= _desi(acik.karton.en, acik.karton.boy, acik.karton.derin): break
+        yeni = _AcikKarton(karton)
+        if all(yeni.yerlestir(p) for p in acik.parcalar): return yeni
+    return acik
+
+
+def _yerlestir(parcalar, kartonlar):
+    # (ortak koliler, tek giden parçalar)
+    acik_kartonlar, tekler = [], []
+    for parca in sorted(parcalar, key=lambda p: (-p.boyut[0] * p.boyut[1] * p.boyut[2], p.sira)):
+        if any(a.yerlestir(parca) for a in acik_kartonlar[-ACIK_KARTON_PENCERESI:]): continue
+        karton = next((k for k in kartonlar if _sigar_mi(k, parca)), None)
+        acik = _AcikKarton(karton) if karton is not None else None
+        if acik is not None and acik.yerlestir(parca): acik_kartonlar.append(acik)
+        else: tekler.append(parca)
+    ortak = []
+    for acik in acik_kartonlar:
+        acik = _kucult(acik, kartonlar)
+        karton_desi = _desi(acik.karton.en, acik.karton.boy, acik.karton.derin)
+        if len(acik.parcalar) > 1 and karton_desi < sum(p.desi for p in acik.parcalar) - _EPS: ortak.append(acik)
+        else: tekler += acik.parcalar
+    return ortak, tekler
+
+
+# Plandaki bir sevk kolisi; karton None ise ürün kendi kolisinde gider
+SevkKolisi = namedtuple('SevkKolisi', 'sira karton urun olcu desi kg icerik')
+
+
+def _icerik_adi(icerik):
+    return ' + '.join(f"{adet} x {urun}" for urun, adet in icerik)
+
+
+class SevkPlani:
+    __slots__ = ('koliler', 'onceki_parca', 'onceki_desi', '_etiketler')
+
+    def __init__(self, koliler, onceki_parca, onceki_desi):
+        self.koliler, self.onceki_parca, self.onceki_desi = koliler, onceki_parca, onceki_desi
+        self._etiketler = None
+
+    def __len__(self): return len(self.koliler)
+
+    @property
+    def toplam_parca(self): return len(self.koliler)
+
+    @property
+    def toplam_desi(self): return sum(k.desi for k in self.koliler)
+
+    @property
+    def toplam_agirlik(self): return sum(k.kg for k in self.koliler)
+
+    @property
+    def ortak_koli_sayisi(self): return sum(1 for k in self.koliler if k.karton is not None)
+
+    @property
+    def etiket_listesi(self):
+        # Kargo fişi ve termal etiketler için koli listesi; art arda aynı koliler tek koşu olur
+        if self._etiketler is None:
+            self._etiketler = PaketListesi()
+            onceki, adet = None, 0
+            for k in self.koliler:
+                anahtar = (k.urun, k.olcu, k.desi)
+                if anahtar == onceki: adet += 1; continue
+                if onceki is not None: self._etiketler.ekle(*onceki, adet)
+                onceki, adet = anahtar, 1
+            if onceki is not None: self._etiketler.ekle(*onceki, adet)
+        return self._etiketler
+
+    def tablo(self):
+        # Arayüzde gösterilecek ortak koliler
+        return [{"Koli": k.karton, "İçerik": _icerik_adi(k.icerik), "Ölçü": k.olcu, "Desi": k.desi, "Ağırlık": round(k.kg, 1)}
+                for k in self.koliler if k.karton is not None]
+
+
+def konsolide_et(satirlar, kartonlar=None):
+    # satirlar: ham_veri / düzenlenmiş tablo satırları (Ürün, Ölçü, Birim Desi, Adet, Toplam Ağırlık, varsa k_en / k_boy / k_derin)
+    kartonlar = sorted(kartonlar or KARTONLAR, key=lambda k: (_desi(k.en, k.boy, k.derin), k.ad))
+    parcalar = []
+    for sira, satir in enumerate(satirlar):
+        adet = int(satir.get('Adet') or 0)
+        if adet <= 0: continue
+        kg = (satir.get('Toplam Ağırlık') or 0) / adet
+        boyut = _cipla_olcu(satir)
+        parcalar += [Parca(sira, satir['Ürün'], satir['Ölçü'], satir.get('Birim Desi') or 0, boyut, kg)] * adet
+    onceki_parca, onceki_desi = len(parcalar), sum(p.desi for p in parcalar)
+
+    yerlesecek = [p for p in parcalar if p.boyut is not None]
+    sinirda = len(yerlesecek) <= KONSOLIDASYON_SINIRI
+    ortak, tekler = _yerlestir(yerlesecek, kartonlar) if sinirda else ([], [])
+    tekler += [p for p in parcalar if p.boyut is None or not sinirda]
+
+    koliler = []
+    for acik in ortak:
+        icerik = {}
+        for p in sorted(acik.parcalar, key=lambda p: p.sira): icerik[p.urun] = icerik.get(p.urun, 0) + 1
+        icerik = list(icerik.items())
+        k = acik.karton
+        koliler.append(SevkKolisi(min(p.sira for p in acik.parcalar), k.ad, _icerik_adi(icerik), _olcu_str(k.en, k.boy, k.derin),
+                                  _desi(k.en, k.boy, k.derin), acik.kg, icerik))
+    koliler += [SevkKolisi(p.sira, None, p.urun, p.olcu, p.desi, p.kg, [(p.urun, 1)]) for p in tekler]
+    koliler.sort(key=lambda k: (k.sira, k.karton is None))
+    return SevkPlani(koliler, onceki_parca, onceki_desi)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Siparişin ortak koli planını tek tek gönderimle karşılaştırır.")
+    parser.add_argument('dosyalar', nargs='*', help="Dia dökümleri (.xls / .xlsx / .csv); verilmezse ORNEK_SIPARIS")
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+    from ice_aktarim import dia_dosyasi_oku
+    from siparis_analizi import siparisi_analiz_et
+    if args.dosyalar:
+        siparisler = []
+        for yol in args.dosyalar:
+            with open(yol, 'rb') as f: siparisler.append((yol, dia_dosyasi_oku(yol, f)))
+    else:
+        siparisler = [('ORNEK_SIPARIS', pd.DataFrame(ORNEK_SIPARIS, columns=['Stok Adı', 'Miktar']))]
+
+    kazancsiz = 0
+    for ad, df in siparisler:
+        ham_veri = siparisi_analiz_et(df)[0] if df is not None else []
+        plan = konsolide_et(ham_veri)
+        print(f"{ad}: tek tek {plan.onceki_parca} koli / {plan.onceki_desi:.2f} desi -> "
+              f"plan {plan.toplam_parca} koli / {plan.toplam_desi:.2f} desi ({plan.ortak_koli_sayisi} ortak koli)")
+        for k in plan.tablo(): print(f"  {k['Koli']:<8} {k['Desi']:6.2f} desi {k['Ağırlık']:5.1f} kg  {k['İçerik']}")
+        if plan.toplam_desi >= plan.onceki_desi - _EPS: kazancsiz += 1
+    return 1 if kazancsiz and not args.dosyalar else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+from functools import lru_cache
+
+from reportlab.pdfbase import pdfmetrics
+
+# =============================================================================
+# METİN SIĞDIRMA
+# Standart Type1 fontların (Helvetica ailesi) karakter genişlikleri font başına
+# bir kez tabloya alınır. Font boyutu birer birer küçültülerek aranmaz,
+# genişlik boyutla doğrusal olduğundan doğrudan hesaplanır; satır kırma da her
+# kelimeyi bir kez ölçerek doğrusal zamanda yapılır. Sonuçlar (metin, font,
+# kutu) anahtarıyla saklanır. Genişlikler pdfmetrics.stringWidth ile birebir aynıdır.
+# =============================================================================
+
+
+class _GenislikTablosu:
+    def __init__(self, font_adi):
+        self.font = pdfmetrics.getFont(font_adi)
+        self._tablo = {}
+
+    def karakter(self, ch):
+        w = self._tablo.get(ch)
+        if w is None:
+            try: kod = ch.encode(self.font.encName)
+            except UnicodeEncodeError: return None  # yedek fonta düşen karakter
+            w = self._tablo[ch] = sum(self.font.widths[b] for b in kod)
+        return w
+
+_tablolar = {}
+
+def _tablo(font_adi):
+    t = _tablolar.get(font_adi)
+    if t is None: t = _tablolar[font_adi] = _GenislikTablosu(font_adi)
+    return t
+
+@lru_cache(maxsize=8192)
+def birim_genislik(text, font_adi):
+    # 1000 birimlik em karesinde genişlik (tam sayı)
+    t, toplam = _tablo(font_adi), 0
+    for ch in text:
+        w = t.karakter(ch)
+        if w is None: return round(pdfmetrics.stringWidth(text, font_adi, 1000))
+        toplam += w
+    return toplam
+
+def metin_genisligi(text, font_adi, boyut):
+    # pdfmetrics.stringWidth ile aynı işlem sırası: toplam * 0.001 * boyut
+    return birim_genislik(text, font_adi) * 0.001 * boyut
+
+@lru_cache(maxsize=4096)
+def font_sigdir(text, font_adi, max_genislik, en_buyuk, en_kucuk):
+    # en_buyuk'ten başlayıp 1'er azaltarak genişlik max_genislik'i geçmeyene (ya da en_kucuk'e) kadar
+    # inilen döngünün sonucunu doğrudan verir.
+    birim = birim_genislik(text, font_adi)
+    if birim <= 0: return en_buyuk
+    boyut = min(en_buyuk, max(en_kucuk, int(max_genislik / (birim * 0.001))))
+    # Kayan nokta sınırında döngüyle aynı kararı vermek için komşu değerler kontrol edilir
+    while boyut > en_kucuk and birim * 0.001 * boyut > max_genislik: boyut -= 1
+    while boyut < en_buyuk and not birim * 0.001 * (boyut + 1) > max_genislik: boyut += 1
+    return boyut
+
+@lru_cache(maxsize=1024)
+def satir_kir(text, font_adi, boyut, max_genislik):
+    # Açgözlü kelime kaydırma; satırlar sonda boşluk bırakılarak döner. Sığmayan tek kelime
+    # kendi satırına yazılır.
+    bosluk = birim_genislik(" ", font_adi)
+    satirlar, satir, satir_birim = [], [], 0
+    for word in text.split():
+        w = birim_genislik(word, font_adi)
+        if (satir_birim + w) * 0.001 * boyut < max_genislik:
+            satir.append(word); satir_birim += w + bosluk
+        elif not satir:
+            satirlar.append(word)
+        else:
+            satirlar.append(" ".join(satir) + " ")
+            satir, satir_birim = [word], w + bosluk
+    if satir: satirlar.append(" ".join(satir) + " ")
+    return tuple(satirlar)
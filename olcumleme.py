@@ -0,0 +1,89 @@
+import io
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+# =============================================================================
+# ÖLÇÜMLEME (AŞAMA SÜRELERİ / SAYAÇLAR / PROFİL)
+# Her Streamlit çalıştırması için bir Olcer kurulur; kapalıyken asama() hazır
+# bir boş bağlam döndürür, yani ölçüm kodunun maliyeti bir öznitelik kontrolüdür.
+# Çalıştırma dışında olan işler (indirme anında üretilen PDF'ler, arka plan
+# hazırlığı, logo indirme) süreç geneli `arka_plan` ölçerine yazılır.
+# NIXRAD_OLCUM_LOGU verilirse kayıtlar bu dosyaya satır başına bir JSON olarak eklenir.
+# =============================================================================
+
+OLCUM_LOGU = os.environ.get('NIXRAD_OLCUM_LOGU')
+ARKA_PLAN_KAYIT = 50  # arka plan ölçerinde tutulan son aşama sayısı
+PROFIL_SATIR = 25
+
+_bos = nullcontext()
+_log_kilidi = threading.Lock()
+
+
+def json_logla(kaynak, veri):
+    if not OLCUM_LOGU: return
+    satir = json.dumps({'zaman': round(time.time(), 3), 'kaynak': kaynak, **veri}, ensure_ascii=False, default=str)
+    try:
+        with _log_kilidi, open(OLCUM_LOGU, 'a', encoding='utf-8') as f: f.write(satir + '\n')
+    except OSError:
+        pass
+
+
+class Olcer:
+    def __init__(self, etkin=False, kaynak='calistirma', max_kayit=None, anlik_log=False):
+        self.etkin, self.kaynak, self.anlik_log = etkin, kaynak, anlik_log
+        self.asamalar = deque(maxlen=max_kayit)
+        self.sayaclar = {}
+        self._kilit = threading.Lock()
+        self._profil = None
+        self._baslangic = time.perf_counter()
+
+    def asama(self, ad, **bilgi):
+        # with olcer.asama('analiz') as kayit: ...  (kapalıyken kayit None'dır)
+        if not self.etkin: return _bos
+        return self._asama(ad, bilgi)
+
+    @contextmanager
+    def _asama(self, ad, bilgi):
+        kayit = {'asama': ad, **bilgi}
+        bas = time.perf_counter()
+        try:
+            yield kayit
+        finally:
+            kayit['sure_ms'] = round((time.perf_counter() - bas) * 1000, 3)
+            with self._kilit: self.asamalar.append(kayit)
+            if self.anlik_log: json_logla(self.kaynak, kayit)
+
+    def say(self, ad, adet=1):
+        if not self.etkin: return
+        with self._kilit: self.sayaclar[ad] = self.sayaclar.get(ad, 0) + adet
+
+    def profil_baslat(self):
+        import cProfile
+        self._profil = cProfile.Profile()
+        self._profil.enable()
+
+    def profil_bitir(self, satir=PROFIL_SATIR):
+        # Kümülatif süreye göre ilk satırlar (pstats metni); profil alınmadıysa None
+        if self._profil is None: return None
+        import pstats
+        self._profil.disable()
+        cikti = io.StringIO()
+        pstats.Stats(self._profil, stream=cikti).sort_stats('cumulative').print_stats(satir)
+        self._profil = None
+        return cikti.getvalue()
+
+    def rapor(self):
+        with self._kilit:
+            return {'toplam_ms': round((time.perf_counter() - self._baslangic) * 1000, 3),
+                    'asamalar': list(self.asamalar), 'sayaclar': dict(self.sayaclar)}
+
+    def logla(self, **ek):
+        if self.etkin: json_logla(self.kaynak, {**self.rapor(), **ek})
+
+
+# Tek tek olaylar olduğu için her aşama anında loglanır; maliyeti ölçülen işin yanında önemsizdir
+arka_plan = Olcer(etkin=True, kaynak='arka_plan', max_kayit=ARKA_PLAN_KAYIT, anlik_log=True)
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# =============================================================================
+# BELGE ÖNBELLEĞİ
+# PDF çıktıları girdilerinin özetine göre saklanır; Streamlit yeniden
+# çalıştığında girdisi değişmeyen belge tekrar üretilmez. İstenirse belge
+# arka planda tek işçili bir havuzda önceden hazırlanır.
+# =============================================================================
+
+BELGE_BAYT_BUTCESI = 64 * 1024 * 1024
+
+
+def _kullanici_onbellegi():
+    # $XDG_CACHE_HOME/nixrad, yoksa ~/.cache/nixrad (XDG: göreli yol yok sayılır)
+    xdg = os.environ.get('XDG_CACHE_HOME', '')
+    return os.path.join(xdg if os.path.isabs(xdg) else os.path.join(os.path.expanduser('~'), '.cache'), 'nixrad')
+
+# Disk önbelleklerinin (stok_onbellegi, yukleme_onbellegi) varsayılan klasörü; kaynak ağacına yazılmaz
+KALICI_ONBELLEK_KLASORU = _kullanici_onbellegi()
+
+
+def _duzle(deger):
+    # numpy / pandas skalerleri ve demetler JSON'a kararlı biçimde girsin
+    if isinstance(deger, dict): return {str(k): _duzle(v) for k, v in deger.items()}
+    if isinstance(deger, (list, tuple)): return [_duzle(v) for v in deger]
+    # Koşu uzunluklu koli listesi (hesaplama.PaketListesi) koli koli açılmadan koşularıyla özetlenir
+    if hasattr(deger, 'kosular'): return [_duzle(list(k)) for k in deger.kosular()]
+    if hasattr(deger, 'item') and callable(deger.item):
+        try: return deger.item()
+        except (ValueError, TypeError): pass
+    if isinstance(deger, (str, int, float, bool)) or deger is None: return deger
+    return str(deger)
+
+
+def girdi_ozeti(*girdiler):
+    metin = json.dumps(_duzle(girdiler), sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(metin.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class BelgeOnbellegi:
+    # Bayt bütçeli LRU: bütçe aşılınca en uzun süredir kullanılmayan belge atılır.
+    def __init__(self, bayt_butcesi=BELGE_BAYT_BUTCESI):
+        self.bayt_butcesi = bayt_butcesi
+        self._veri = OrderedDict()
+        self._toplam_bayt = 0
+        self._kilit = threading.Lock()
+        self._bekleyen = {}  # anahtar -> arka planda üretilmekte olan Future
+        self._havuz = None
+        self.isabet, self.iskalama = 0, 0
+
+    def _bul(self, anahtar):
+        # self._kilit tutulurken çağrılır
+        veri = self._veri.get(anahtar)
+        if veri is None:
+            self.iskalama += 1
+            return None
+        self._veri.move_to_end(anahtar)
+        self.isabet += 1
+        return veri
+
+    def _koy(self, anahtar, veri):
+        if len(veri) > self.bayt_butcesi: return
+        with self._kilit:
+            eski = self._veri.pop(anahtar, None)
+            if eski is not None: self._toplam_bayt -= len(eski)
+            self._veri[anahtar] = veri
+            self._toplam_bayt += len(veri)
+            while self._toplam_bayt > self.bayt_butcesi:
+                _, atilan = self._veri.popitem(last=False)
+                self._toplam_bayt -= len(atilan)
+
+    def _uret(self, anahtar, olusturucu, girdiler):
+        # olusturucu(*girdiler) BytesIO ya da bytes döndürür; önbellekte her zaman bytes tutulur.
+        sonuc = olusturucu(*girdiler)
+        veri = sonuc.getvalue() if hasattr(sonuc, 'getvalue') else bytes(sonuc)
+        self._koy(anahtar, veri)
+        return veri
+
+    def getir(self, tur, olusturucu, *girdiler):
+        anahtar = (tur, girdi_ozeti(*girdiler))
+        # Arama ve bekleyen kontrolü aynı kilitte: arka plan üretimi ikisinin arasında bitip belge iki kez üretilmez
+        with self._kilit:
+            veri = self._bul(anahtar)
+            gelecek = self._bekleyen.get(anahtar) if veri is None else None
+        if veri is not None: return veri
+        # Arka planda zaten üretiliyorsa ikinci kez üretmek yerine onu bekle
+        if gelecek is not None: return gelecek.result()
+        return self._uret(anahtar, olusturucu, girdiler)
+
+    def hazirla(self, tur, olusturucu, *girdiler):
+        # Belgeyi sayfayı bekletmeden arka planda üretir; önbellekte ya da kuyruktaysa bir şey yapmaz.
+        anahtar = (tur, girdi_ozeti(*girdiler))
+        with self._kilit:
+            if anahtar in self._veri or anahtar in self._bekleyen: return
+            if self._havuz is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._havuz = ThreadPoolExecutor(max_workers=1, thread_name_prefix='belge')
+            gelecek = self._havuz.submit(self._uret, anahtar, olusturucu, girdiler)
+            self._bekleyen[anahtar] = gelecek
+        gelecek.add_done_callback(lambda _: self._bekleyen_sil(anahtar))
+
+    def _bekleyen_sil(self, anahtar):
+        with self._kilit: self._bekleyen.pop(anahtar, None)
+
+    def temizle(self):
+        with self._kilit:
+            self._veri.clear(); self._toplam_bayt = 0
+
+    def istatistik(self):
+        with self._kilit:
+            return {'isabet': self.isabet, 'iskalama': self.iskalama, 'belge': len(self._veri), 'bayt': self._toplam_bayt, 'bekleyen': len(self._bekleyen)}
+
+
+belge_onbellegi = BelgeOnbellegi()
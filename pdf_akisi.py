@@ -0,0 +1,222 @@
+import math
+import zlib
+from array import array
+
+from reportlab.pdfbase.pdfmetrics import standardFonts, stringWidth
+
+# =============================================================================
+# AKAN (STREAMING) PDF YAZICI
+# ReportLab canvas'ı tüm sayfaları save() anına kadar bellekte tutar. Bu yazıcı
+# her sayfayı bittiği anda hedefe yazar; sayfa içeriği bellekte tutulmaz.
+# Termal etiketin kullandığı canvas metotlarının (drawString, line, beginText,
+# drawImage, doForm ...) bir alt kümesini aynı adlarla sunar, böylece aynı
+# çizim fonksiyonu iki hedefte de çalışır.
+# Sınırlar:
+#   - Bellek sabit değildir, sayfa sayısıyla doğrusal ama küçük büyür: xref için
+#     nesne başına 8 bayt konum (_konumlar) ve Kids için sayfa başına 8 bayt
+#     (_sayfa_idleri) tutulur; sayfa başına ~24 bayt, 100.000 etikette ~2,4 MB.
+#     Gömülen görseller ve formlar belge boyunca bir kez yazılır.
+#   - Yalnızca PDF'in 14 standart Type1 fontu (Helvetica, Times, Courier ailesi,
+#     Symbol, ZapfDingbats) WinAnsi kodlamasıyla kullanılabilir; TTF gömme yoktur,
+#     cp1252 dışındaki karakterler '?' olur. Başka bir font adı ValueError verir.
+#   - drawImage maskesi: None, 'auto' (alfa kanalı -> SMask, saydam palet rengi
+#     -> renk anahtarı) ya da [min max ...] renk anahtarı listesi; başka değerler
+#     ValueError verir.
+# Çıktı pdf_dogrula.py ile ayrıştırılarak sınanır.
+# =============================================================================
+
+PARCA = 1024  # kapanışta tek seferde yazılan xref / Kids girdisi
+
+
+def _sayi(x):
+    if isinstance(x, int): return str(x)
+    s = f"{x:.4f}".rstrip('0').rstrip('.')
+    return s if s not in ('', '-0') else '0'
+
+def _metin(text):
+    veri = str(text).encode('cp1252', errors='replace')
+    return b'(' + veri.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+class _MetinNesnesi:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+        self.font, self.size, self.leading = None, None, None
+        self.satirlar = []
+
+    def setFont(self, font, size, leading=None):
+        self.font, self.size = font, size
+        if leading is not None: self.leading = leading
+
+    def setLeading(self, leading): self.leading = leading
+
+    def textLine(self, text=''): self.satirlar.append(text)
+
+
+class AkisSayfasi:
+    def __init__(self, yazici, genislik, yukseklik):
+        self._yazici = yazici
+        self.genislik, self.yukseklik = genislik, yukseklik
+        self._komutlar = []
+        self._font, self._size = 'Helvetica', 12
+
+    def _ekle(self, komut): self._komutlar.append(komut)
+
+    def saveState(self): self._ekle(b'q')
+    def restoreState(self): self._ekle(b'Q')
+
+    def rotate(self, derece):
+        a = math.radians(derece); c, s = math.cos(a), math.sin(a)
+        self._ekle(f"{_sayi(c)} {_sayi(s)} {_sayi(-s)} {_sayi(c)} 0 0 cm".encode())
+
+    def translate(self, x, y): self._ekle(f"1 0 0 1 {_sayi(x)} {_sayi(y)} cm".encode())
+
+    def setLineWidth(self, w): self._ekle(f"{_sayi(w)} w".encode())
+
+    def line(self, x1, y1, x2, y2):
+        self._ekle(f"{_sayi(x1)} {_sayi(y1)} m {_sayi(x2)} {_sayi(y2)} l S".encode())
+
+    def setFont(self, font, size, leading=None): self._font, self._size = font, size
+
+    def stringWidth(self, text, font=None, size=None):
+        return stringWidth(text, font or self._font, size if size is not None else self._size)
+
+    def drawString(self, x, y, text):
+        ad = self._yazici._font_adi(self._font)
+        self._ekle(b'BT /' + ad + f" {_sayi(self._size)} Tf 1 0 0 1 {_sayi(x)} {_sayi(y)} Tm ".encode() + _metin(text) + b' Tj ET')
+
+    def drawRightString(self, x, y, text): self.drawString(x - self.stringWidth(text), y, text)
+    def drawCentredString(self, x, y, text): self.drawString(x - self.stringWidth(text) / 2.0, y, text)
+
+    def beginText(self, x=0, y=0): return _MetinNesnesi(x, y)
+
+    def drawText(self, nesne):
+        if not nesne.satirlar: return
+        font, size = nesne.font or self._font, nesne.size if nesne.size is not None else self._size
+        leading = nesne.leading if nesne.leading is not None else size * 1.2
+        parcalar = [b'BT /' + self._yazici._font_adi(font) + f" {_sayi(size)} Tf {_sayi(leading)} TL 1 0 0 1 {_sayi(nesne.x)} {_sayi(nesne.y)} Tm".encode()]
+        parcalar += [_metin(s) + b" Tj T*" for s in nesne.satirlar]
+        self._ekle(b' '.join(parcalar) + b' ET')
+
+    def drawImage(self, image, x, y, width=None, height=None, mask=None):
+        ad, (g, y_) = self._yazici._gorsel_adi(image, mask)
+        width, height = width or g, height or y_
+        self._ekle(f"q {_sayi(width)} 0 0 {_sayi(height)} {_sayi(x)} {_sayi(y)} cm /".encode() + ad + b' Do Q')
+
+    def doForm(self, ad): self._ekle(b'/' + self._yazici._formlar[ad][0] + b' Do')
+
+
+class AkisPDF:
+    # hedef: write(bytes) metodu olan herhangi bir nesne (dosya, soket, parça toplayıcı)
+    def __init__(self, hedef, sayfa_boyutu, sikistir=True):
+        self._hedef = hedef
+        self.sayfa_boyutu = sayfa_boyutu
+        self._sikistir = sikistir
+        self._konum = 0
+        self._konumlar = array('q')  # nesne no - 1 -> dosyadaki konum
+        self._sonraki_id = 1
+        self._sayfa_idleri = array('q')
+        self._fontlar, self._gorseller, self._formlar = {}, {}, {}
+        self._sayfalar_id = self._id_ayir()
+        self._kaynaklar_id = self._id_ayir()
+        self._yaz(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    def _id_ayir(self):
+        i = self._sonraki_id; self._sonraki_id += 1
+        self._konumlar.append(0)
+        return i
+
+    def _yaz(self, veri):
+        self._hedef.write(veri); self._konum += len(veri)
+
+    def _nesne_yaz(self, nid, govde):
+        self._konumlar[nid - 1] = self._konum
+        self._yaz(f"{nid} 0 obj\n".encode() + govde + b"\nendobj\n")
+
+    def _akis_yaz(self, nid, veri, sozluk=b''):
+        if self._sikistir:
+            veri = zlib.compress(veri); sozluk += b' /Filter /FlateDecode'
+        self._nesne_yaz(nid, b'<< /Length ' + str(len(veri)).encode() + sozluk + b' >>\nstream\n' + veri + b'\nendstream')
+
+    def _font_adi(self, font):
+        if font not in self._fontlar:
+            if font not in standardFonts: raise ValueError(f"AkisPDF yalnızca standart Type1 fontları destekler: {font}")
+            nid = self._id_ayir(); ad = f"F{len(self._fontlar) + 1}".encode()
+            self._nesne_yaz(nid, b'<< /Type /Font /Subtype /Type1 /BaseFont /' + font.encode() + b' /Encoding /WinAnsiEncoding >>')
+            self._fontlar[font] = (ad, nid)
+        return self._fontlar[font][0]
+
+    def _gorsel_adi(self, image, mask=None):
+        # Aynı ImageReader + maske tüm belge boyunca tek bir XObject olarak gömülür
+        anahtar = (id(image), mask if mask is None or isinstance(mask, str) else tuple(mask))
+        if anahtar not in self._gorseller:
+            if mask is not None and mask != 'auto' and not isinstance(mask, (list, tuple)):
+                raise ValueError(f"Desteklenmeyen drawImage maskesi: {mask!r}")
+            g, y = image.getSize()
+            veri = bytes(image.getRGBData())  # getRGBData mode / _dataA alanlarını doldurur
+            renk = {'L': 1, 'RGB': 3, 'CMYK': 4}.get(getattr(image, 'mode', 'RGB'), 3)
+            uzay = {1: 'DeviceGray', 3: 'DeviceRGB', 4: 'DeviceCMYK'}[renk]
+            maske = ''
+            if mask == 'auto':
+                alfa = getattr(image, '_dataA', None)
+                saydam = None if alfa is not None else image.getTransparent()
+                if alfa is not None:
+                    smask_id = self._id_ayir()
+                    self._akis_yaz(smask_id, bytes(alfa.getRGBData()),
+                                   f" /Type /XObject /Subtype /Image /Width {g} /Height {y} /ColorSpace /DeviceGray /BitsPerComponent 8".encode())
+                    maske = f" /SMask {smask_id} 0 R"
+                elif saydam is not None:
+                    maske = f" /Mask [{' '.join(str(c) for c in saydam[:renk] for _ in (0, 1))}]"
+            elif mask is not None:
+                if len(mask) != 2 * renk: raise ValueError(f"{uzay} görsel için maske {2 * renk} değer içermeli: {mask!r}")
+                maske = f" /Mask [{' '.join(str(int(m)) for m in mask)}]"
+            nid = self._id_ayir(); ad = f"Im{len(self._gorseller) + 1}".encode()
+            sozluk = f" /Type /XObject /Subtype /Image /Width {g} /Height {y} /ColorSpace /{uzay} /BitsPerComponent 8{maske}".encode()
+            self._akis_yaz(nid, veri, sozluk)
+            self._gorseller[anahtar] = (ad, nid, (g, y), image)
+        kayit = self._gorseller[anahtar]
+        return kayit[0], kayit[2]
+
+    def form_tanimla(self, ad, boyut, ciz):
+        # Tekrarlanan çizimi bir kez form XObject olarak yazar; sayfalar doForm(ad) ile damgalar
+        g, y = boyut
+        form = AkisSayfasi(self, g, y)
+        ciz(form)
+        nid = self._id_ayir(); xad = f"Fm{len(self._formlar) + 1}".encode()
+        sozluk = f" /Type /XObject /Subtype /Form /BBox [0 0 {_sayi(g)} {_sayi(y)}] /Resources {self._kaynaklar_id} 0 R".encode()
+        self._akis_yaz(nid, b'\n'.join(form._komutlar), sozluk)
+        self._formlar[ad] = (xad, nid)
+
+    def yeni_sayfa(self):
+        g, y = self.sayfa_boyutu
+        return AkisSayfasi(self, g, y)
+
+    def sayfa_yaz(self, sayfa):
+        icerik_id, sayfa_id = self._id_ayir(), self._id_ayir()
+        self._akis_yaz(icerik_id, b'\n'.join(sayfa._komutlar))
+        self._nesne_yaz(sayfa_id, (
+            f"<< /Type /Page /Parent {self._sayfalar_id} 0 R /MediaBox [0 0 {_sayi(sayfa.genislik)} {_sayi(sayfa.yukseklik)}] "
+            f"/Resources {self._kaynaklar_id} 0 R /Contents {icerik_id} 0 R >>"
+        ).encode())
+        self._sayfa_idleri.append(sayfa_id)
+
+    def kapat(self):
+        fontlar = b' '.join(b'/' + ad + f" {nid} 0 R".encode() for ad, nid in self._fontlar.values())
+        xnesneler = [b'/' + k[0] + f" {k[1]} 0 R".encode() for k in self._gorseller.values()]
+        xnesneler += [b'/' + ad + f" {nid} 0 R".encode() for ad, nid in self._formlar.values()]
+        self._nesne_yaz(self._kaynaklar_id, b'<< /ProcSet [/PDF /Text /ImageB /ImageC] /Font << ' + fontlar + b' >> /XObject << ' + b' '.join(xnesneler) + b' >> >>')
+        # Kids ve xref tabloları parça parça yazılır; kapanışta ek olarak yalnızca PARCA girdilik metin tamponu oluşur
+        self._konumlar[self._sayfalar_id - 1] = self._konum
+        self._yaz(f"{self._sayfalar_id} 0 obj\n<< /Type /Pages /Count {len(self._sayfa_idleri)} /Kids [".encode())
+        for i in range(0, len(self._sayfa_idleri), PARCA):
+            self._yaz(''.join(f"{k} 0 R " for k in self._sayfa_idleri[i:i + PARCA]).encode())
+        self._yaz(b"] >>\nendobj\n")
+        katalog_id = self._id_ayir()
+        self._nesne_yaz(katalog_id, f"<< /Type /Catalog /Pages {self._sayfalar_id} 0 R >>".encode())
+
+        xref_konum = self._konum
+        self._yaz(f"xref\n0 {self._sonraki_id}\n0000000000 65535 f \n".encode())
+        for i in range(0, len(self._konumlar), PARCA):
+            self._yaz(''.join(f"{k:010d} 00000 n \n" for k in self._konumlar[i:i + PARCA]).encode())
+        self._yaz(f"trailer\n<< /Size {self._sonraki_id} /Root {katalog_id} 0 R >>\nstartxref\n{xref_konum}\n%%EOF\n".encode())
+        self._gorseller.clear()
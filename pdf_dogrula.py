@@ -0,0 +1,165 @@
+import argparse
+import io
+import re
+import sys
+
+from hesaplama import etiket_listesi_olustur
+from zpl_dogrula import ORNEKLER
+
+# =============================================================================
+# AKAN PDF AYRIŞTIRMA DOĞRULAMASI
+# pdf_akisi ile üretilen termal spool ve görsel örnekleri pypdf ile geri okunur:
+#   - xref tablosundaki her konum gerçekten "n 0 obj" başlığını göstermeli
+#   - sayfa sayısı ve her etiket sayfasının metni ReportLab canvas çıktısıyla aynı
+#     olmalı (PyMuPDF kuruluysa kelime konumları da 0,1 pt hassasiyetle karşılaştırılır)
+#   - gri / RGB / alfa / saydam paletli görseller doğru renk uzayı ve maske ile okunmalı
+#   - desteklenmeyen font ve maske değerleri ValueError vermeli
+# Ağa çıkılmaz (logo yerel kopyadan). pypdf gerekir
+# (requirements-dev.txt).
+#
+#   python pdf_dogrula.py
+#   python pdf_dogrula.py -v
+# =============================================================================
+
+
+def _siparisler():
+    for musteri, satirlar in ORNEKLER.values():
+        etiketler = etiket_listesi_olustur([{'Ürün': u, 'Ölçü': o, 'Birim Desi': d, 'Adet': a} for u, o, d, a in satirlar])
+        yield etiketler, musteri, len(etiketler)
+
+
+def _xref_hatalari(veri):
+    # startxref -> xref tablosu -> her nesnenin başlığı
+    konum = int(re.search(rb'startxref\s+(\d+)\s+%%EOF\s*$', veri).group(1))
+    bas = re.match(rb'xref\s+0 (\d+)\s+', veri[konum:])
+    if bas is None: return ["startxref bir xref tablosunu göstermiyor"]
+    hatalar, adet, i = [], int(bas.group(1)), konum + bas.end()
+    for nid in range(adet):
+        girdi = veri[i + 20 * nid:i + 20 * nid + 20]
+        if nid == 0 or girdi[17:18] != b'n': continue
+        nesne_konum = int(girdi[:10])
+        if not veri.startswith(f"{nid} 0 obj".encode(), nesne_konum): hatalar.append(f"xref: {nid}. nesne {nesne_konum} konumunda değil")
+    return hatalar
+
+
+def _metinler(okuyucu):
+    # pypdf boşlukları konum aralığından tahmin eder; karşılaştırma boşluksuz yapılır
+    return [''.join(s.extract_text().split()) for s in okuyucu.pages]
+
+
+def _kelimeler(veri):
+    try:
+        import fitz
+    except ImportError:
+        return None
+    with fitz.open(stream=veri, filetype='pdf') as belge:
+        return [[(round(k[0], 1), round(k[1], 1), k[4]) for k in s.get_text('words')] for s in belge]
+
+
+def spool_kontrol(PdfReader):
+    from belgeler import create_thermal_labels_8x12_rotated, termal_spool_yaz
+    hedef = io.BytesIO()
+    siparisler = list(_siparisler())
+    termal_spool_yaz(iter(siparisler), hedef, ayirici=True)
+    veri = hedef.getvalue()
+    hatalar = _xref_hatalari(veri)
+    okuyucu = PdfReader(io.BytesIO(veri), strict=True)
+    sayfalar, kelimeler = _metinler(okuyucu), _kelimeler(veri)
+    beklenen_sayfa = sum(n + 1 for _, _, n in siparisler)
+    if len(sayfalar) != beklenen_sayfa: hatalar.append(f"spool: {len(sayfalar)} sayfa, beklenen {beklenen_sayfa}")
+
+    # Aynı siparişin ReportLab canvas ile üretilen etiketleriyle sayfa sayfa metin karşılaştırması
+    i = 0
+    for sira, (etiketler, musteri, n) in enumerate(siparisler, 1):
+        if f"SIPARIS{sira}" not in (sayfalar[i] if i < len(sayfalar) else ''): hatalar.append(f"spool: {sira}. ayırıcı sayfa bulunamadı")
+        referans_veri = create_thermal_labels_8x12_rotated(etiketler, musteri, n).getvalue()
+        referans = _metinler(PdfReader(io.BytesIO(referans_veri)))
+        for j, metin in enumerate(referans):
+            uretilen = sayfalar[i + 1 + j] if i + 1 + j < len(sayfalar) else ''
+            if uretilen != metin: hatalar.append(f"spool: sipariş {sira} etiket {j + 1} metni farklı\n    beklenen: {metin}\n    okunan:   {uretilen}")
+        if kelimeler is not None and kelimeler[i + 1:i + 1 + n] != _kelimeler(referans_veri):
+            hatalar.append(f"spool: sipariş {sira} etiketlerinde kelime konumları ReportLab çıktısından farklı")
+        i += n + 1
+    return hatalar, veri
+
+
+def _ornek_gorseller():
+    from PIL import Image
+    from reportlab.lib.utils import ImageReader
+    rgb = Image.new('RGB', (6, 4), (200, 30, 30))
+    gri = Image.new('L', (5, 3), 128)
+    alfa = Image.new('RGBA', (4, 4), (0, 0, 255, 0)); alfa.putpixel((1, 1), (0, 0, 255, 255))
+    # PNG'den okunan saydam palet alfa kanalına (SMask), bellekteki saydam palet renk anahtarına (Mask) çevrilir (ReportLab ile aynı)
+    palet = Image.new('P', (3, 3), 1); palet.putpalette([255, 255, 255, 10, 20, 30] + [0] * 762); palet.info['transparency'] = 0
+    palet_png = io.BytesIO(); palet.save(palet_png, 'PNG', transparency=0); palet_png.seek(0)
+    # ad -> (görsel, maske, beklenen renk uzayı, beklenen maske anahtarı)
+    return {
+        'rgb': (ImageReader(rgb), None, '/DeviceRGB', None),
+        'gri': (ImageReader(gri), 'auto', '/DeviceGray', None),
+        'alfa': (ImageReader(alfa), 'auto', '/DeviceRGB', '/SMask'),
+        'palet_png': (ImageReader(palet_png), 'auto', '/DeviceRGB', '/SMask'),
+        'palet': (ImageReader(palet), 'auto', '/DeviceRGB', '/Mask'),
+        'renk_anahtari': (ImageReader(rgb), [200, 200, 30, 30, 30, 30], '/DeviceRGB', '/Mask'),
+    }
+
+
+def gorsel_kontrol(PdfReader):
+    from pdf_akisi import AkisPDF
+    hatalar, hedef = [], io.BytesIO()
+    pdf = AkisPDF(hedef, (200, 200))
+    ornekler = _ornek_gorseller()
+    for ad, (gorsel, maske, _, _) in ornekler.items():
+        sayfa = pdf.yeni_sayfa()
+        sayfa.drawImage(gorsel, 10, 10, width=50, height=50, mask=maske)
+        sayfa.setFont('Times-Roman', 10); sayfa.drawString(10, 100, ad)
+        pdf.sayfa_yaz(sayfa)
+
+    sayfa = pdf.yeni_sayfa()
+    for yanlis in (lambda: sayfa.drawImage(ornekler['rgb'][0], 0, 0, mask='yok'),
+                   lambda: sayfa.drawImage(ornekler['rgb'][0], 0, 0, mask=[0, 255]),
+                   lambda: (sayfa.setFont('DejaVuSans', 10), sayfa.drawString(0, 0, 'x'))):
+        try: yanlis()
+        except ValueError: continue
+        hatalar.append("görsel: desteklenmeyen font / maske ValueError vermedi")
+    pdf.kapat()
+
+    veri = hedef.getvalue()
+    hatalar += _xref_hatalari(veri)
+    okuyucu = PdfReader(io.BytesIO(veri), strict=True)
+    for (ad, (gorsel, _, uzay, maske_anahtari)), s in zip(ornekler.items(), okuyucu.pages):
+        xnesneler = s['/Resources']['/XObject']
+        resimler = [xnesneler[k].get_object() for k in s.get_contents().get_data().decode().split() if k.startswith('/Im')]
+        if len(resimler) != 1 or ad not in s.extract_text():
+            hatalar.append(f"görsel {ad}: sayfada görsel ya da metin okunamadı"); continue
+        resim = resimler[0]
+        if (resim['/Width'], resim['/Height']) != gorsel.getSize(): hatalar.append(f"görsel {ad}: boyut {resim['/Width']}x{resim['/Height']}")
+        if resim['/ColorSpace'] != uzay: hatalar.append(f"görsel {ad}: renk uzayı {resim['/ColorSpace']}, beklenen {uzay}")
+        bilesen = {'/DeviceGray': 1, '/DeviceRGB': 3}[uzay]
+        if len(resim.get_data()) != gorsel.getSize()[0] * gorsel.getSize()[1] * bilesen: hatalar.append(f"görsel {ad}: veri uzunluğu tutmuyor")
+        bulunan = next((k for k in ('/SMask', '/Mask') if k in resim), None)
+        if bulunan != maske_anahtari: hatalar.append(f"görsel {ad}: maske {bulunan}, beklenen {maske_anahtari}")
+    return hatalar, veri
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Akan PDF çıktısını ayrıştırıp sayfa, metin, görsel ve xref tutarlılığını sınar.")
+    parser.add_argument('-v', '--ayrintili', action='store_true', help="Her kontrolün sonucunu yazdır")
+    args = parser.parse_args(argv)
+
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        print("pypdf kurulu değil: pip install -r requirements-dev.txt")
+        return 2
+
+    toplam = 0
+    for ad, kontrol in (('spool', spool_kontrol), ('gorsel', gorsel_kontrol)):
+        hatalar, veri = kontrol(PdfReader)
+        toplam += len(hatalar)
+        print(f"{'HATALI' if hatalar else 'tamam':<9} {ad} ({len(veri)} bayt)")
+        for hata in hatalar if args.ayrintili or hatalar else (): print(f"  {hata}")
+    return 1 if toplam else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,374 @@
+import argparse
+import io
+import json
+import math
+import os
+import sys
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as GelecekZamanAsimi
+from concurrent.futures.process import BrokenProcessPool
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from olcumleme import json_logla
+
+# =============================================================================
+# BELGE SERVİSİ (ERP İÇİN YEREL HTTP)
+# Streamlit paneli olmadan sipariş alıp belge döndürür. İstekler sınırlı bir
+# süreç havuzuna verilir; her işçi açılışta pandas / ReportLab'ı, font
+# ölçülerini, logoyu ve belge stillerini bir kez yükler (örnek bir sipariş
+# çizerek), sonraki istekler bu sıcak süreçlerde çalışır. Kuyrukta yer yoksa
+# istek beklemeden 503 + Retry-After ile geri çevrilir. Servis ağa hiç çıkmaz:
+# logo yalnızca NIXRAD_LOGO_YOLU / assets altından okunur, yoksa belgeler logosuz üretilir.
+#
+#   python servis.py --port 8765 -j 4
+#   curl -X POST localhost:8765/siparis -H 'Content-Type: application/json' -d @siparis.json -o belgeler.zip
+#   curl -X POST 'localhost:8765/dia?belge=termal&AD_SOYAD=Ahmet' -H 'X-Dosya-Adi: siparis.xlsx' --data-binary @siparis.xlsx -o etiket.pdf
+#   curl -F dosya=@siparis.xlsx -F AD_SOYAD=Ahmet -F belge=kargo,termal localhost:8765/dia -o belgeler.zip
+#   curl localhost:8765/metrikler
+#
+# /siparis gövdesi: {"musteri": {"AD_SOYAD": ...}, "satirlar": [{"Stok Adı": ..., "Miktar": ...}],
+#                    "belgeler": ["kargo", "termal"], "konsolide": false}
+# Tek belge istenirse belgenin kendisi, birden çoksa (ya da bicim=zip) ZIP döner.
+# =============================================================================
+
+PORT = 8765
+ISCI = max(1, min(4, os.cpu_count() or 1))
+KUYRUK_CARPANI = 2  # işçi başına kabul edilen (çalışan + bekleyen) istek
+ZAMAN_ASIMI = 120  # saniye; aşılırsa 504
+MAX_GOVDE = 20 * 1024 * 1024
+METRIK_PENCERESI = 1000  # yüzdelikler son bu kadar istekten hesaplanır
+VARSAYILAN_BELGELER = ('kargo', 'uretim', 'termal')
+MIME = {'.pdf': 'application/pdf', '.zpl': 'text/plain; charset=utf-8'}
+
+ORNEK_SATIRLAR = [{'Stok Adı': 'Nirvana 600/1000 radyatör', 'Miktar': 2}, {'Stok Adı': 'Lizyantus 500/700 havlupan', 'Miktar': 1}]
+
+
+class IstekHatasi(ValueError):
+    def __init__(self, mesaj, durum=400):
+        super().__init__(mesaj)
+        self.durum = durum
+
+
+# ---- İşçi süreci ------------------------------------------------------------
+
+def _siparis_cercevesi(satirlar):
+    # satirlar _satirlari_dogrula'dan geçmiş olarak gelir
+    import pandas as pd
+    return pd.DataFrame(satirlar, columns=['Stok Adı', 'Miktar'])
+
+
+def _uret(is_tanimi):
+    # Bir siparişin belgeleri: {'belgeler': {dosya adı: bayt}, 'etiket': ..., 'baslangic': ..., 'sureler': ...}
+    baslangic = time.time()
+    t = time.perf_counter()
+    import toplu
+    from siparis_analizi import siparisi_analiz_et
+    from yukleme_onbellegi import yukleme_onbellegi
+    sureler = {}
+    if is_tanimi.get('dia') is not None:
+        # ERP aynı dökümü yeniden gönderirse okuma ve analiz yükleme önbelleğinden gelir
+        yukleme = yukleme_onbellegi.cozumle(*is_tanimi['dia'])
+        if yukleme.df is None: raise ValueError("Dosyada 'Stok Adı' başlığı bulunamadı.")
+        ham_veri, malzeme_listesi = yukleme.ham_veri, yukleme.malzeme_listesi
+    else:
+        ham_veri, malzeme_listesi = siparisi_analiz_et(_siparis_cercevesi(is_tanimi['satirlar']))
+    if not ham_veri: raise ValueError("Siparişte radyatör / havlupan satırı yok.")
+    ureticiler, kargo_etiketleri = toplu.belge_ureticileri(ham_veri, malzeme_listesi, is_tanimi['musteri'], is_tanimi.get('konsolide', False))
+    sureler['analiz'] = time.perf_counter() - t
+    belgeler = {}
+    for tur in is_tanimi['belgeler']:
+        t = time.perf_counter()
+        belgeler[toplu.BELGE_ADLARI[tur]] = ureticiler[tur]().getvalue()
+        sureler[tur] = time.perf_counter() - t
+    return {'belgeler': belgeler, 'etiket': len(kargo_etiketleri), 'baslangic': baslangic, 'sureler': sureler}
+
+
+def _isci_hazirla():
+    # Ağır modüller, font ölçüleri, logo ve ReportLab stilleri örnek bir siparişle bir kez yüklenir.
+    # Örnek stok adları kalıcı stok önbelleğine yazılmaz.
+    import toplu
+    from stok_onbellegi import stok_onbellegi
+    onceki, stok_onbellegi.devre_disi = stok_onbellegi.devre_disi, True
+    try:
+        _uret({'satirlar': ORNEK_SATIRLAR, 'musteri': toplu._musteri({}), 'belgeler': list(toplu.BELGE_ADLARI)})
+    finally:
+        stok_onbellegi.devre_disi = onceki
+
+
+def _hazir(): return os.getpid()
+
+
+# ---- Metrikler --------------------------------------------------------------
+
+def _yuzdelik(degerler, oran):
+    if not degerler: return None
+    sirali = sorted(degerler)
+    return round(sirali[min(len(sirali) - 1, int(oran * len(sirali)))] * 1000, 1)
+
+
+class ServisMetrikleri:
+    def __init__(self, pencere=METRIK_PENCERESI):
+        self._kilit = threading.Lock()
+        self.baslangic = time.time()
+        self.durumlar = {}
+        self.reddedilen, self.islenen, self.etiket = 0, 0, 0
+        self.calisan = 0
+        self._sureler = {ad: deque(maxlen=pencere) for ad in ('bekleme', 'isleme', 'toplam')}
+
+    def durum(self, kod):
+        with self._kilit: self.durumlar[kod] = self.durumlar.get(kod, 0) + 1
+
+    def reddedildi(self):
+        with self._kilit: self.reddedilen += 1
+
+    def basladi(self):
+        with self._kilit: self.calisan += 1
+
+    def bitti(self):
+        with self._kilit: self.calisan -= 1
+
+    def kaydet(self, bekleme, isleme, toplam, etiket):
+        with self._kilit:
+            self.islenen += 1; self.etiket += etiket
+            for ad, deger in (('bekleme', bekleme), ('isleme', isleme), ('toplam', toplam)): self._sureler[ad].append(deger)
+
+    def rapor(self, **ek):
+        with self._kilit:
+            gecen = time.time() - self.baslangic
+            return {
+                'calisma_sn': round(gecen, 1), 'islenen': self.islenen, 'reddedilen': self.reddedilen, 'calisan': self.calisan,
+                'etiket': self.etiket, 'siparis_per_sn': round(self.islenen / gecen, 3) if gecen else 0.0,
+                'durumlar': {str(k): v for k, v in sorted(self.durumlar.items())},
+                'gecikme_ms': {ad: {'p50': _yuzdelik(d, 0.50), 'p95': _yuzdelik(d, 0.95), 'p99': _yuzdelik(d, 0.99),
+                                    'max': _yuzdelik(d, 1.0), 'adet': len(d)} for ad, d in self._sureler.items()},
+                **ek,
+            }
+
+
+# ---- Servis -----------------------------------------------------------------
+
+class BelgeServisi:
+    def __init__(self, isci=ISCI, kuyruk=None, zaman_asimi=ZAMAN_ASIMI):
+        self.isci = isci
+        self.kuyruk = kuyruk or isci * KUYRUK_CARPANI
+        self.zaman_asimi = zaman_asimi
+        self.metrikler = ServisMetrikleri()
+        self._yer = threading.BoundedSemaphore(self.kuyruk)
+        self._havuz_kilidi = threading.Lock()
+        self.havuz = ProcessPoolExecutor(max_workers=isci, initializer=_isci_hazirla)
+
+    def _havuzu_yenile(self):
+        with self._havuz_kilidi:
+            if not getattr(self.havuz, '_broken', False): return
+            self.havuz.shutdown(wait=False, cancel_futures=True)
+            self.havuz = ProcessPoolExecutor(max_workers=self.isci, initializer=_isci_hazirla)
+
+    def isit(self):
+        # Tüm işçiler istek gelmeden açılsın (initializer ilk görevden önce çalışır)
+        return sorted({f.result() for f in [self.havuz.submit(_hazir) for _ in range(self.isci)]})
+
+    def _yer_birak(self, _=None):
+        self.metrikler.bitti()
+        self._yer.release()
+
+    def uret(self, is_tanimi):
+        if not self._yer.acquire(blocking=False):
+            self.metrikler.reddedildi()
+            raise IstekHatasi("Kuyruk dolu, biraz sonra tekrar deneyin.", 503)
+        gonderim = time.time()
+        self.metrikler.basladi()
+        try:
+            gelecek = self.havuz.submit(_uret, is_tanimi)
+        except BrokenProcessPool:
+            # Bir işçi çöktüyse (bellek vb.) havuz yenilenir; bu istek 500 döner, sonrakiler çalışır
+            self._yer_birak()
+            self._havuzu_yenile()
+            raise
+        # Yer iş gerçekten bitince bırakılır: zaman aşımında (504) iş havuzda sürerken kuyruk sınırı aşılmaz
+        gelecek.add_done_callback(self._yer_birak)
+        try: sonuc = gelecek.result(timeout=self.zaman_asimi)
+        except GelecekZamanAsimi: raise IstekHatasi("Belge üretimi zaman aşımına uğradı.", 504)
+        except BrokenProcessPool:
+            self._havuzu_yenile()
+            raise
+        bitis = time.time()
+        self.metrikler.kaydet(sonuc['baslangic'] - gonderim, bitis - sonuc['baslangic'], bitis - gonderim, sonuc['etiket'])
+        return sonuc
+
+    def rapor(self): return self.metrikler.rapor(isci=self.isci, kuyruk=self.kuyruk)
+
+    def kapat(self): self.havuz.shutdown(cancel_futures=True)
+
+
+def _belge_turleri(deger):
+    # "kargo,termal" / ["kargo", "termal"] -> doğrulanmış tür listesi
+    import toplu
+    if not deger: return list(VARSAYILAN_BELGELER)
+    if isinstance(deger, str): deger = [deger]
+    turler = [t.strip() for d in deger for t in str(d).split(',') if t.strip()]
+    bilinmeyen = [t for t in turler if t not in toplu.BELGE_ADLARI]
+    if bilinmeyen: raise IstekHatasi(f"Bilinmeyen belge: {', '.join(bilinmeyen)} (geçerli: {', '.join(toplu.BELGE_ADLARI)})")
+    return list(dict.fromkeys(turler))
+
+
+def _satirlari_dogrula(satirlar):
+    # ERP satırları: "Stok Adı" / "Miktar" (Dia sütunları) ya da "stok_adi" / "miktar".
+    # Bozuk satır işçiye gitmeden 400 ile geri çevrilir; Dia sütun adlarıyla yeni liste döner
+    duzgun = []
+    for i, s in enumerate(satirlar):
+        if not isinstance(s, dict): raise IstekHatasi(f"satirlar[{i}] bir nesne olmalı.")
+        ad, miktar = s.get('Stok Adı', s.get('stok_adi')), s.get('Miktar', s.get('miktar'))
+        if not isinstance(ad, str) or not ad.strip(): raise IstekHatasi(f"satirlar[{i}]: 'Stok Adı' boş olmayan bir metin olmalı.")
+        if isinstance(miktar, bool) or not isinstance(miktar, (int, float)) or not math.isfinite(miktar):
+            raise IstekHatasi(f"satirlar[{i}]: 'Miktar' bir sayı olmalı.")
+        duzgun.append({'Stok Adı': ad, 'Miktar': miktar})
+    return duzgun
+
+
+def _form_ayristir(govde, icerik_turu):
+    # multipart/form-data -> (alanlar, (dosya adı, bayt) ya da None)
+    mesaj = BytesParser(policy=policy.HTTP).parsebytes(f"Content-Type: {icerik_turu}\r\n\r\n".encode('latin-1') + govde)
+    alanlar, dosya = {}, None
+    for parca in mesaj.iter_parts():
+        veri = parca.get_payload(decode=True) or b''
+        if parca.get_filename(): dosya = (parca.get_filename(), veri)
+        else: alanlar[parca.get_param('name', header='content-disposition')] = veri.decode('utf-8')
+    return alanlar, dosya
+
+
+def _zip(belgeler):
+    cikti = io.BytesIO()
+    with zipfile.ZipFile(cikti, 'w', zipfile.ZIP_DEFLATED) as z:
+        for ad, veri in belgeler.items(): z.writestr(ad, veri)
+    return cikti.getvalue()
+
+
+class _Isleyici(BaseHTTPRequestHandler):
+    server_version = "NixradBelge/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args): pass  # her istek json_logla ile kaydedilir
+
+    def _yanit(self, durum, govde, icerik_turu='application/json', ek_basliklar=()):
+        if isinstance(govde, (dict, list)): govde = json.dumps(govde, ensure_ascii=False).encode('utf-8')
+        self.send_response(durum)
+        self.send_header('Content-Type', icerik_turu)
+        self.send_header('Content-Length', str(len(govde)))
+        for ad, deger in ek_basliklar: self.send_header(ad, deger)
+        self.end_headers()
+        self.wfile.write(govde)
+        self.server.servis.metrikler.durum(durum)
+
+    def do_GET(self):
+        yol = urlparse(self.path).path
+        if yol == '/saglik': return self._yanit(200, {'durum': 'ok'})
+        if yol == '/metrikler': return self._yanit(200, self.server.servis.rapor())
+        self._yanit(404, {'hata': 'Bulunamadı'})
+
+    def _govde(self):
+        # Gövde okunmadan hata dönülürse bağlantı kapatılır (kalan baytlar sonraki istek sanılmasın)
+        deger = self.headers.get('Content-Length')
+        if deger is None:
+            self.close_connection = True
+            raise IstekHatasi("Content-Length başlığı gerekli.", 411)
+        try: uzunluk = int(deger)
+        except ValueError: uzunluk = -1
+        if uzunluk < 0:
+            self.close_connection = True
+            raise IstekHatasi("Geçersiz Content-Length.")
+        if uzunluk > MAX_GOVDE:
+            self.close_connection = True
+            raise IstekHatasi(f"Gövde en çok {MAX_GOVDE} bayt olabilir.", 413)
+        return self.rfile.read(uzunluk)
+
+    def _is_tanimi(self, yol, sorgu):
+        import toplu
+        govde = self._govde()
+        icerik_turu = self.headers.get('Content-Type', '')
+        if yol == '/siparis':
+            try: istek = json.loads(govde or b'{}')
+            except ValueError: raise IstekHatasi("Gövde geçerli JSON değil.")
+            if not isinstance(istek.get('satirlar'), list) or not istek['satirlar']: raise IstekHatasi("'satirlar' boş olmayan bir liste olmalı.")
+            return {'satirlar': _satirlari_dogrula(istek['satirlar']), 'musteri': toplu._musteri(istek.get('musteri') or istek),
+                    'belgeler': _belge_turleri(istek.get('belgeler') or sorgu.get('belge')), 'konsolide': bool(istek.get('konsolide'))}
+        if yol == '/dia':
+            alanlar, dosya = {k: v[-1] for k, v in sorgu.items()}, None
+            if icerik_turu.startswith('multipart/form-data'):
+                form, dosya = _form_ayristir(govde, icerik_turu)
+                alanlar.update(form)
+            elif govde:
+                dosya = (self.headers.get('X-Dosya-Adi') or alanlar.get('dosya') or 'siparis.xlsx', govde)
+            if not dosya: raise IstekHatasi("Dia dosyası gönderilmedi.")
+            return {'dia': dosya, 'musteri': toplu._musteri(alanlar), 'belgeler': _belge_turleri(alanlar.get('belge')),
+                    'konsolide': alanlar.get('konsolide', '').lower() in ('1', 'true', 'evet')}
+        raise IstekHatasi("Bulunamadı", 404)
+
+    def do_POST(self):
+        t = time.perf_counter()
+        adres = urlparse(self.path)
+        sorgu = parse_qs(adres.query)
+        kayit = {'yol': adres.path}
+        try:
+            is_tanimi = self._is_tanimi(adres.path, sorgu)
+            sonuc = self.server.servis.uret(is_tanimi)
+            belgeler = sonuc['belgeler']
+            kayit.update(etiket=sonuc['etiket'], belgeler=list(belgeler), sureler=sonuc['sureler'])
+            if len(belgeler) == 1 and sorgu.get('bicim', [''])[-1] != 'zip':
+                ad, veri = next(iter(belgeler.items()))
+                self._yanit(200, veri, MIME[os.path.splitext(ad)[1]], [('Content-Disposition', f'attachment; filename="{ad}"')])
+            else:
+                self._yanit(200, _zip(belgeler), 'application/zip', [('Content-Disposition', 'attachment; filename="belgeler.zip"')])
+            kayit['durum'] = 200
+        except IstekHatasi as e:
+            kayit.update(durum=e.durum, hata=str(e))
+            self._yanit(e.durum, {'hata': str(e)}, ek_basliklar=[('Retry-After', '1')] if e.durum == 503 else ())
+        except ValueError as e:
+            kayit.update(durum=422, hata=str(e))
+            self._yanit(422, {'hata': str(e)})
+        except Exception as e:
+            kayit.update(durum=500, hata=repr(e))
+            self._yanit(500, {'hata': 'Belge üretilemedi.'})
+        kayit['sure_ms'] = round((time.perf_counter() - t) * 1000, 3)
+        json_logla('servis', kayit)
+
+
+def sunucu_olustur(servis, adres='127.0.0.1', port=PORT):
+    sunucu = ThreadingHTTPServer((adres, port), _Isleyici)
+    sunucu.daemon_threads = True
+    sunucu.servis = servis
+    return sunucu
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Siparişten kargo fişi, üretim emri ve termal etiket üreten yerel HTTP servisi.")
+    parser.add_argument('--adres', default='127.0.0.1', help="Dinlenecek adres (varsayılan: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('-j', '--isci', type=int, default=ISCI, help=f"Belge üreten süreç sayısı (varsayılan: {ISCI})")
+    parser.add_argument('--kuyruk', type=int, default=None, help=f"Aynı anda kabul edilen istek (varsayılan: işçi x {KUYRUK_CARPANI})")
+    parser.add_argument('--zaman-asimi', type=float, default=ZAMAN_ASIMI, help="İstek başına saniye (varsayılan: 120)")
+    args = parser.parse_args(argv)
+
+    servis = BelgeServisi(args.isci, args.kuyruk, args.zaman_asimi)
+    t = time.perf_counter()
+    surecler = servis.isit()
+    print(f"{len(surecler)} işçi hazır ({time.perf_counter() - t:.1f}s), kuyruk {servis.kuyruk}")
+    sunucu = sunucu_olustur(servis, args.adres, args.port)
+    print(f"http://{args.adres}:{args.port} dinleniyor (POST /siparis, POST /dia, GET /metrikler, GET /saglik)")
+    try:
+        sunucu.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sunucu.server_close()
+        servis.kapat()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+
+from hesaplama import (
+    AYARLAR, MODEL_AGIRLIKLARI, HAVLUPAN_BORU_CETVELI,
+    tr_clean_for_pdf, tr_upper, get_standart_paket_icerigi, siniflandirici,
+)
+
+# =============================================================================
+# 3. TOPLU SİPARİŞ ANALİZİ (VEKTÖREL)
+# Dia dökümü satır satır değil sütun bazında işlenir. Aynı stok adı siparişte
+# defalarca geçtiği için sınıflandırma (hesaplama.siniflandirici) yalnızca
+# benzersiz adlar üzerinde yapılır, ölçü/desi/ağırlık sütun bazında hesaplanır.
+# Sonuçlar hesapla_ve_analiz_et / agirlik_hesapla ile birebir aynıdır.
+# =============================================================================
+
+
+def _seri_tr_upper(seri): return seri.str.replace('i', 'İ', regex=False).str.replace('ı', 'I', regex=False).str.upper()
+
+def _yuvarla(dizi, basamak=2):
+    # Python round() ile birebir aynı sonuç: np.round yalnızca yarım sınırına çok yakın değerlerde
+    # farklı çıkabileceği için o değerler tek tek round() ile düzeltilir
+    dizi = np.asarray(dizi, dtype=float)
+    carpan = 10.0 ** basamak
+    sonuc = np.round(dizi, basamak)
+    kesir = np.abs(np.abs(dizi * carpan) % 1 - 0.5)
+    for i in np.flatnonzero(kesir < 1e-6): sonuc[i] = round(float(dizi[i]), basamak)
+    return sonuc
+
+def _metinler(dizi, bicim=''):
+    # Her benzersiz sayı bir kez biçimlenir (boş biçim str(float) ile aynı)
+    benzersiz, ters = np.unique(dizi, return_inverse=True)
+    return np.array([format(v, bicim) for v in benzersiz.tolist()], dtype=object)[ters]
+
+def _agirlik_vektorel(dilim, genislik, yukseklik, model_key):
+    # agirlik_hesapla'nın sütun karşılığı; işlem sırası aynı tutuldu ki float sonuçlar birebir çıksın
+    agirlik = np.zeros(len(model_key))
+    birim_kg = model_key.map(MODEL_AGIRLIKLARI).to_numpy(dtype=float)
+    havlupan_model = model_key.isin(list(HAVLUPAN_BORU_CETVELI)).to_numpy()
+
+    # dilim: stok adındaki dilim sayısı (yoksa NaN); None ise (manuel hesap) dilim sayısı hep genişlikten bulunur
+    dilim = np.full(len(model_key), np.nan) if dilim is None else np.asarray(dilim, dtype=float)
+    formul = np.select(
+        [model_key.isin(['nirvana', 'prag']), model_key == 'akasya', model_key.isin(['livara', 'livera']), model_key == 'aspar'],
+        [np.rint((genislik + 1) / 8), np.rint((genislik + 3) / 6), np.rint((genislik + 0.5) / 6), np.rint((genislik + 1) / 10)],
+        default=np.nan
+    )
+    dilim = np.where(np.isnan(dilim), formul, dilim)
+    dilimli = ~havlupan_model & ~np.isnan(birim_kg) & ~np.isnan(dilim)
+    agirlik = np.where(dilimli, dilim * ((yukseklik / 60) * birim_kg), agirlik)
+
+    boru = np.full(len(model_key), np.nan)
+    for m_key, cetvel in HAVLUPAN_BORU_CETVELI.items():
+        secim = (model_key == m_key).to_numpy()
+        div = 12.5 if m_key == 'lizyantus' else 15.0
+        tam_yukseklik = pd.Series(np.trunc(yukseklik)).map(cetvel).to_numpy(dtype=float)
+        boru = np.where(secim, np.where(np.isnan(tam_yukseklik), np.rint(yukseklik / div), tam_yukseklik), boru)
+    borulu = havlupan_model & ~np.isnan(birim_kg)
+    agirlik = np.where(borulu, boru * birim_kg * (genislik / 50.0), agirlik)
+    return _yuvarla(agirlik).tolist()
+
+def urunleri_siniflandir(stok_adlari):
+    # Her stok adı için: sınıf (AKSESUAR / URUN / DIGER), model, tip, kutu ölçüleri, desi ve birim ağırlık.
+    # Kurallar (anahtar kelimeler, model önceliği, ölçü / dilim deseni) yalnızca hesaplama.UrunSiniflandirici'dadır;
+    # her benzersiz ad bir kez sınıflandırılır, sayısal kısım sütun bazında hesaplanır.
+    stok_adlari = pd.Series(stok_adlari, dtype=object).astype(str).reset_index(drop=True)
+    upper = _seri_tr_upper(stok_adlari)
+    kodlar, adlar = pd.factorize(stok_adlari)
+    siniflar = [siniflandirici.siniflandir(ad) for ad in adlar]
+    sutun = lambda alan, dtype=object: np.array([getattr(s, alan) for s in siniflar], dtype=dtype)[kodlar]
+
+    sinif = sutun('sinif')
+    model_key = pd.Series(sutun('model_key'), dtype=object)
+    model_adi = pd.Series(sutun('model_adi').tolist())
+    base_derinlik = sutun('derinlik', float)
+    havlupan = sutun('tip') == 'HAVLUPAN'
+    tip = np.where(havlupan, 'HAVLUPAN', 'RADYATOR')
+    sayi = lambda alan: np.array([np.nan if getattr(s, alan) is None else getattr(s, alan) for s in siniflar], dtype=float)[kodlar]
+    genislik, yukseklik, dilim = sayi('genislik'), sayi('yukseklik'), sayi('dilim')
+    gecerli = ~np.isnan(genislik)
+
+    pay_genislik = np.where(havlupan, AYARLAR['HAVLUPAN']['PAY_GENISLIK'], AYARLAR['RADYATOR']['PAY_GENISLIK'])
+    pay_yukseklik = np.where(havlupan, AYARLAR['HAVLUPAN']['PAY_YUKSEKLIK'], AYARLAR['RADYATOR']['PAY_YUKSEKLIK'])
+    pay_derinlik = np.where(havlupan, AYARLAR['HAVLUPAN']['PAY_DERINLIK'], AYARLAR['RADYATOR']['PAY_DERINLIK'])
+    pay_derinlik = np.where((model_key == 'prag').to_numpy(), 2.0, pay_derinlik)
+
+    k_en, k_boy, k_derin = genislik + pay_genislik, yukseklik + pay_yukseklik, base_derinlik + pay_derinlik
+    ham_desi = (k_en * k_boy * k_derin) / 3000
+
+    sonuc = pd.DataFrame({
+        'Stok Adı': stok_adlari, 'sinif': sinif, 'model_key': model_key, 'model_adi': model_adi, 'tip': tip,
+        'gecerli': gecerli, 'genislik': genislik, 'yukseklik': yukseklik,
+        'k_en': k_en, 'k_boy': k_boy, 'k_derin': k_derin,
+    })
+    sonuc['desi'] = [round(d, 2) if g else np.nan for d, g in zip(ham_desi.tolist(), gecerli)]
+    sonuc['birim_agirlik'] = np.where(gecerli, _agirlik_vektorel(dilim, genislik, yukseklik, model_key), np.nan)
+    sonuc['kisa_isim'] = upper.str.strip().map(tr_clean_for_pdf)
+    sonuc['boyut_str'] = [f"{e}x{b}x{d}cm" if g else None for e, b, d, g in zip(k_en.tolist(), k_boy.tolist(), k_derin.tolist(), gecerli)]
+    return sonuc
+
+def siparisi_analiz_et(df):
+    # 'Stok Adı' / 'Miktar' çerçevesinden tek geçişte (ham_veri, malzeme_listesi) üretir.
+    adet = pd.to_numeric(df['Miktar'], errors='coerce').fillna(0).to_numpy(dtype=float)
+    stok = df['Stok Adı'].astype(str).to_numpy()
+    secili = adet > 0
+    adet, stok = adet[secili], stok[secili]
+    if len(stok) == 0: return [], {}
+
+    kodlar, adlar = pd.factorize(stok)
+    # Daha önce görülen stok adları kalıcı önbellekten gelir (stok_onbellegi bu modülü içe aktardığı için burada yüklenir)
+    from stok_onbellegi import stok_onbellegi
+    urunler = stok_onbellegi.siniflandir(adlar)
+    sinif = urunler['sinif'].to_numpy()[kodlar]
+    gecerli = urunler['gecerli'].to_numpy()[kodlar]
+    sira = np.arange(len(stok))
+
+    # Malzeme katkıları (satır sırası, reçete sırası, anahtar, miktar); ilk görülme sırası korunarak toplanır
+    aks = sinif == 'AKSESUAR'
+    katkilar = [pd.DataFrame({'sira': sira[aks], 'j': 0, 'anahtar': [f"{s} (Adet)" for s in stok[aks]], 'miktar': adet[aks]})]
+    analizli = (sinif == 'URUN') & gecerli
+    if analizli.any():
+        # Reçete yalnızca (tip, model) ikilisine bağlı: her ikili için bir kez kurulur
+        recete_kodu = (urunler['tip'] + '|' + urunler['model_adi']).to_numpy()[kodlar]
+        receteler = {r: get_standart_paket_icerigi(r.split('|')[0], tr_upper(r.split('|')[1])) for r in pd.unique(recete_kodu[analizli])}
+        recete_df = pd.DataFrame(
+            [(r, j, f"{ad} ({birim})", miktar) for r, recete in receteler.items() for j, (miktar, birim, ad) in enumerate(recete)],
+            columns=['recete', 'j', 'anahtar', 'recete_miktar']
+        )
+        satirlar = pd.DataFrame({'sira': sira[analizli], 'recete': recete_kodu[analizli], 'adet': adet[analizli]})
+        recete_katki = satirlar.merge(recete_df, on='recete')
+        recete_katki['miktar'] = recete_katki['recete_miktar'] * recete_katki['adet']
+        katkilar.append(recete_katki[['sira', 'j', 'anahtar', 'miktar']])
+    katki = pd.concat(katkilar, ignore_index=True).sort_values(['sira', 'j'], kind='mergesort')
+    toplam = katki.groupby('anahtar', sort=False)['miktar'].sum()
+    malzeme_listesi = dict(zip(toplam.index.tolist(), toplam.tolist()))
+
+    u = urunler.iloc[kodlar[analizli]]
+    a = adet[analizli]
+    ham_veri = [
+        {"Ürün": isim, "Adet": int(n), "Ölçü": boyut, "Birim Desi": desi, "Toplam Ağırlık": round(kg * n, 1), "k_en": en, "k_boy": boy, "k_derin": derin}
+        for isim, n, boyut, desi, kg, en, boy, derin in zip(
+            u['kisa_isim'].tolist(), a.tolist(), u['boyut_str'].tolist(), u['desi'].tolist(), u['birim_agirlik'].tolist(),
+            u['k_en'].tolist(), u['k_boy'].tolist(), u['k_derin'].tolist())
+    ]
+    return ham_veri, malzeme_listesi
+
+# =============================================================================
+# MANUEL HESAPLAYICI — TOPLU MOD
+# manuel_hesapla'nın sütun karşılığı: model / genişlik / yükseklik / adet
+# dizileri tek geçişte kutulu ölçü, desi ve ağırlığa çevrilir. Sınıflandırma
+# yalnızca benzersiz model adları için yapılır. Sonuçlar sayı olarak kalır
+# (toplamlar ve dışa aktarma için); manuel_hesapla ile birebir aynıdır.
+# =============================================================================
+MANUEL_SUTUNLAR = ["Model", "Ölçü (ExB)", "Kutulu Ölçü", "Adet", "Birim Desi", "Toplam Desi", "Toplam Ağırlık"]
+
+def manuel_toplu_hesapla(modeller, genislikler, yukseklikler, adetler):
+    modeller = pd.Series(modeller, dtype=object).astype(str).reset_index(drop=True)
+    genislik = np.asarray(genislikler, dtype=float)
+    yukseklik = np.asarray(yukseklikler, dtype=float)
+    adet = np.asarray(adetler, dtype=int)
+    if len(modeller) == 0: return pd.DataFrame(columns=MANUEL_SUTUNLAR)
+
+    kodlar, adlar = pd.factorize(modeller)
+    siniflar = [siniflandirici.siniflandir(ad) for ad in adlar]
+    model_key = pd.Series(np.array([s.model_key for s in siniflar], dtype=object)[kodlar])
+    havlupan = np.array([s.tip == 'HAVLUPAN' for s in siniflar])[kodlar]
+    base_derinlik = np.array([s.derinlik for s in siniflar], dtype=float)[kodlar]
+
+    pay_genislik = np.where(havlupan, AYARLAR['HAVLUPAN']['PAY_GENISLIK'], AYARLAR['RADYATOR']['PAY_GENISLIK'])
+    pay_yukseklik = np.where(havlupan, AYARLAR['HAVLUPAN']['PAY_YUKSEKLIK'], AYARLAR['RADYATOR']['PAY_YUKSEKLIK'])
+    pay_derinlik = np.where(havlupan, AYARLAR['HAVLUPAN']['PAY_DERINLIK'], AYARLAR['RADYATOR']['PAY_DERINLIK'])
+    pay_derinlik = np.where((model_key == 'prag').to_numpy(), 2.0, pay_derinlik)
+
+    k_en, k_boy, k_derin = genislik + pay_genislik, yukseklik + pay_yukseklik, base_derinlik + pay_derinlik
+    birim_desi = _yuvarla((k_en * k_boy * k_derin) / 3000)
+    birim_kg = np.asarray(_agirlik_vektorel(None, genislik, yukseklik, model_key))
+
+    return pd.DataFrame({
+        "Model": modeller,
+        "Ölçü (ExB)": _metinler(genislik, 'g') + ' x ' + _metinler(yukseklik, 'g'),
+        "Kutulu Ölçü": _metinler(k_en) + 'x' + _metinler(k_boy) + 'x' + _metinler(k_derin) + 'cm',
+        "Adet": adet,
+        "Birim Desi": birim_desi,
+        "Toplam Desi": _yuvarla(birim_desi * adet),
+        "Toplam Ağırlık": _yuvarla(birim_kg * adet),
+    })
@@ -0,0 +1,146 @@
+from bisect import bisect_left
+
+import pandas as pd
+
+from hesaplama import KOLI_OLCU_ALANLARI, PaketListesi
+from onbellek import girdi_ozeti
+
+# =============================================================================
+# SİPARİŞ MODELİ (ARTIMLI GÜNCELLEME)
+# Analiz sonucu bir kez sütunlara alınır; st.data_editor'ün bildirdiği
+# düzenlenen / eklenen / silinen satırlar bir önceki çalıştırmayla
+# karşılaştırılır ve yalnızca değişen satırlar yeniden hesaplanır. Toplamlar
+# satır katkıları eklenip çıkarılarak tutulur; koli listesi ve özeti yalnızca
+# etiketi etkileyen bir alan değiştiğinde, ilk etkilenen satırdan itibaren
+# yeniden kurulur (öncesindeki koşular ve sıra numaraları aynen kalır). Ekle / çıkar
+# sırasında biriken kayan nokta artığı (1e-14, -0.0) okurken yuvarlanarak atılır.
+# =============================================================================
+
+SAYISAL_ALANLAR = ('Adet', 'Birim Desi', 'Toplam Ağırlık')
+ETIKET_ALANLARI = ('Ürün', 'Ölçü', 'Birim Desi', 'Adet')
+PLAN_ALANLARI = ETIKET_ALANLARI + ('Toplam Ağırlık',)  # ortak koli planı ağırlık sınırına da bakar
+TOPLAM_HANESI = 2  # birim desi ve ağırlık girdilerinin hassasiyeti
+
+
+def _sayi(v):
+    # Yeni satırda boş bırakılan hücre toplamlara 0 olarak girer (pandas sum'daki NaN atlama gibi)
+    if v is None or v != v: return 0
+    return v
+
+
+def _adet(v):
+    # data_editor tam sayı sütununa da 3.0 ya da NaN yazabilir; koli sayısı toplamlara tam sayı olarak girer
+    try: return int(float(_sayi(v)))
+    except (TypeError, ValueError): return 0
+
+
+def _satir_duzelt(satir):
+    for s in SAYISAL_ALANLAR: satir[s] = _sayi(satir.get(s))
+    satir['Adet'] = _adet(satir['Adet'])
+    for s in ('Ürün', 'Ölçü'):
+        if satir.get(s) is None: satir[s] = ''
+    return satir
+
+
+class SiparisModeli:
+    def __init__(self, ham_veri, malzeme_listesi):
+        # data_editor'e her çalıştırmada aynı tablolar verilir; düzenlemeler bunların üzerine delta olarak gelir
+        self.tablo = pd.DataFrame(ham_veri)
+        self.malzeme_tablosu = pd.DataFrame([{"Malzeme": k, "Adet": v} for k, v in malzeme_listesi.items()])
+        self._taban = {s: self.tablo[s].tolist() for s in self.tablo.columns}
+        self._taban_sayisi = len(self.tablo)
+        self._duzenlenen, self._eklenen, self._silinen = {}, [], set()
+        # Satır anahtarı: taban satırda tablo sırası, eklenen satırda taban_sayisi + ekleme sırası
+        self._etkin = {k: _satir_duzelt({s: self._taban[s][k] for s in self._taban}) for k in range(self._taban_sayisi)}
+        self.toplam_parca, self.toplam_desi, self.toplam_agirlik = 0, 0.0, 0.0
+        for satir in self._etkin.values(): self._topla(satir, 1)
+        # Koli listesi, listedeki her koşunun satır anahtarı ve yeniden kurulacak ilk satır anahtarı
+        self._etiketler, self._etiket_ozeti = None, None
+        self._kosu_anahtarlari, self._etiket_kirli = [], None
+        self._plan = None
+
+    def _topla(self, satir, isaret):
+        self.toplam_parca += isaret * satir['Adet']
+        self.toplam_desi += isaret * satir['Birim Desi'] * satir['Adet']
+        self.toplam_agirlik += isaret * satir['Toplam Ağırlık']
+
+    def _yeni_satir(self, k, duzenlenen, eklenen, silinen):
+        if k < self._taban_sayisi:
+            if k in silinen: return None
+            satir = {s: self._taban[s][k] for s in self._taban}
+            satir.update(duzenlenen.get(k, {}))
+            # Ürün / ölçü elle değiştiyse analizden gelen koli ölçüsü artık geçerli değil
+            if duzenlenen.get(k, {}).keys() & {'Ürün', 'Ölçü'}:
+                for s in KOLI_OLCU_ALANLARI: satir[s] = None
+            return _satir_duzelt(satir)
+        j = k - self._taban_sayisi
+        return _satir_duzelt(dict(eklenen[j])) if j < len(eklenen) else None
+
+    def guncelle(self, editor_durumu):
+        # editor_durumu: st.session_state[<data_editor key>]; değişen satır anahtarlarını döndürür
+        editor_durumu = editor_durumu or {}
+        duzenlenen = {int(k): v for k, v in editor_durumu.get('edited_rows', {}).items()}
+        eklenen = list(editor_durumu.get('added_rows', []))
+        silinen = set(editor_durumu.get('deleted_rows', []))
+
+        degisen = {k for k in duzenlenen.keys() | self._duzenlenen.keys() if duzenlenen.get(k) != self._duzenlenen.get(k)}
+        degisen |= silinen ^ self._silinen
+        for j in range(max(len(eklenen), len(self._eklenen))):
+            eski = self._eklenen[j] if j < len(self._eklenen) else None
+            yeni = eklenen[j] if j < len(eklenen) else None
+            if eski != yeni: degisen.add(self._taban_sayisi + j)
+
+        for k in degisen:
+            eski = self._etkin.pop(k, None)
+            if eski is not None: self._topla(eski, -1)
+            yeni = self._yeni_satir(k, duzenlenen, eklenen, silinen)
+            if yeni is not None:
+                self._etkin[k] = yeni; self._topla(yeni, 1)
+            if eski is None or yeni is None or any(eski[s] != yeni[s] for s in ETIKET_ALANLARI):
+                self._etiket_kirli = k if self._etiket_kirli is None else min(self._etiket_kirli, k)
+                self._etiket_ozeti = None
+            if eski is None or yeni is None or any(eski[s] != yeni[s] for s in PLAN_ALANLARI):
+                self._plan = None
+
+        if not self._etkin: self.toplam_parca, self.toplam_desi, self.toplam_agirlik = 0, 0.0, 0.0
+        self._duzenlenen = {k: dict(v) for k, v in duzenlenen.items()}
+        self._eklenen = [dict(s) for s in eklenen]
+        self._silinen = silinen
+        return degisen
+
+    def toplamlar(self):
+        # proje_toplamlari ile aynı sıra: (toplam koli, toplam desi, toplam ağırlık); + 0.0 -0.0'ı 0.0 yapar
+        return (self.toplam_parca, round(self.toplam_desi, TOPLAM_HANESI) + 0.0,
+                round(self.toplam_agirlik, TOPLAM_HANESI) + 0.0)
+
+    def _etiketleri_kur(self):
+        # etiket_listesi_olustur ile aynı sonuç; ilk etkilenen satırdan önceki koşular eski listeden kopyalanır.
+        # Eski liste değiştirilmez, arka plan hazırlığı onu kullanıyor olabilir
+        bas = self._etiket_kirli if self._etiketler is not None else 0
+        n = bisect_left(self._kosu_anahtarlari, bas)
+        liste = self._etiketler.ilk_kosular(n) if n else PaketListesi()
+        del self._kosu_anahtarlari[n:]
+        for k in sorted(k for k in self._etkin if k >= bas):
+            satir = self._etkin[k]
+            if satir['Adet'] > 0: self._kosu_anahtarlari.append(k)
+            liste.ekle(satir['Ürün'], satir['Ölçü'], satir['Birim Desi'], satir['Adet'])
+        self._etiketler, self._etiket_kirli = liste, None
+
+    @property
+    def etiket_listesi(self):
+        if self._etiketler is None or self._etiket_kirli is not None: self._etiketleri_kur()
+        return self._etiketler
+
+    @property
+    def etiket_ozeti(self):
+        # Arka plan hazırlığı için tablo özeti; koli listesi değişmedikçe yeniden hesaplanmaz
+        if self._etiket_ozeti is None: self._etiket_ozeti = girdi_ozeti(self.etiket_listesi)
+        return self._etiket_ozeti
+
+    @property
+    def sevk_plani(self):
+        # Ortak koli planı (konsolidasyon.SevkPlani); koli / ağırlık bilgisi değişmedikçe yeniden kurulmaz
+        if self._plan is None:
+            from konsolidasyon import konsolide_et
+            self._plan = konsolide_et([self._etkin[k] for k in sorted(self._etkin)])
+        return self._plan
@@ -0,0 +1,177 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import pandas as pd
+
+import hesaplama
+from onbellek import KALICI_ONBELLEK_KLASORU
+from siparis_analizi import urunleri_siniflandir
+
+# =============================================================================
+# KALICI STOK ADI ÖNBELLEĞİ (SQLite)
+# Aynı stok adları hemen her siparişte tekrar geçer. urunleri_siniflandir'ın
+# stok adı başına ürettiği satır (sınıf, model, kutu ölçüsü, desi, ağırlık ...)
+# diskte saklanır ve tüm oturumlar / toplu işçiler arasında paylaşılır.
+# Kayıtlar normalize edilmiş adla (strip + tr_lower) anahtarlanır: sınıflandırma
+# yalnızca buna bağlıdır, 'Stok Adı' sütunu okurken çağıranın yazımıyla doldurulur.
+# Anahtara sabitlerin (AYARLAR, derinlik / ağırlık tabloları, anahtar kelimeler)
+# özeti girer; sabitler değişince eski kayıtlar kendiliğinden geçersiz olur.
+# Başka sürümlerin kayıtları hemen silinmez (aynı dosyayı kullanan eski sürüm
+# süreçleri çalışıyor olabilir): ESKI_SURUM_OMRU boyunca açılmayanlar ve
+# MAX_KAYIT'ı aşan en eski kayıtlar süreç başına bir kez budanır.
+#
+#   python stok_onbellegi.py katalog.txt        (her satırda bir stok adı)
+#   python stok_onbellegi.py siparisler/*.xls   (Dia dökümleri)
+# =============================================================================
+
+STOK_ONBELLEK_YOLU = os.environ.get('NIXRAD_STOK_ONBELLEGI', os.path.join(KALICI_ONBELLEK_KLASORU, "stok.sqlite3"))
+SEMA_SURUMU = 2  # urunleri_siniflandir'ın çıktısı ya da anahtar biçimi değişirse artırılır
+SORGU_PARCASI = 500  # tek IN (...) sorgusundaki ad sayısı
+KILIT_BEKLEME = 5.0  # saniye; başka bir süreç yazarken beklenecek süre
+ESKI_SURUM_OMRU = 30 * 86400  # saniye; başka sürümün bu süre açılmayan kayıtları silinir
+MAX_KAYIT = 200_000  # aşılırsa en uzun süredir açılmayan kayıtlar silinir
+ERISIM_ADIMI = 86400  # erisim zamanı en çok günde bir güncellenir (okumalar yazmaya dönüşmesin)
+
+SUTUNLAR = ['Stok Adı', 'sinif', 'model_key', 'model_adi', 'tip', 'gecerli', 'genislik', 'yukseklik',
+            'k_en', 'k_boy', 'k_derin', 'desi', 'birim_agirlik', 'kisa_isim', 'boyut_str']
+
+
+def sabitler_surumu():
+    sabitler = [SEMA_SURUMU] + [getattr(hesaplama, ad) for ad in (
+        'AYARLAR', 'MODEL_DERINLIKLERI', 'MODEL_AGIRLIKLARI', 'HAVLUPAN_BORU_CETVELI',
+        'AKSESUAR_KELIMELERI', 'URUN_KELIMELERI', 'ZORUNLU_HAVLUPANLAR', 'BOYUT_DESENI', 'DILIM_DESENI')]
+    metin = json.dumps(sabitler, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(metin.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def stok_anahtari(stok_adi):
+    return hesaplama.tr_lower(stok_adi.strip())
+
+
+class StokOnbellegi:
+    # Bağlantı iş parçacığı başına açılır (Streamlit oturumları ayrı iş parçacıklarında çalışır);
+    # WAL kipi sayesinde okuyucular yazan bir süreci beklemez.
+    def __init__(self, yol=STOK_ONBELLEK_YOLU):
+        self.yol = yol
+        self.surum = sabitler_surumu()
+        self._yerel = threading.local()
+        self._kilit = threading.Lock()
+        self._temizlendi = False
+        self.devre_disi = False
+        self.isabet, self.iskalama = 0, 0
+
+    def _baglanti(self):
+        b = getattr(self._yerel, 'baglanti', None)
+        if b is not None and self._yerel.pid == os.getpid(): return b
+        os.makedirs(os.path.dirname(self.yol) or '.', exist_ok=True)
+        b = sqlite3.connect(self.yol, timeout=KILIT_BEKLEME)
+        b.execute("PRAGMA journal_mode=WAL")
+        b.execute("PRAGMA synchronous=NORMAL")
+        b.execute("CREATE TABLE IF NOT EXISTS stok (surum TEXT NOT NULL, stok_adi TEXT NOT NULL, veri TEXT NOT NULL, PRIMARY KEY (surum, stok_adi))")
+        with self._kilit:
+            if not self._temizlendi:
+                self._buda(b)
+                self._temizlendi = True
+        self._yerel.baglanti, self._yerel.pid = b, os.getpid()
+        return b
+
+    def _buda(self, b):
+        # erisim sütunu sonradan eklendi; eski sürüm süreçlerinin INSERT'leri varsayılan 0 ile çalışır (budamada en eski sayılır)
+        if 'erisim' not in [s[1] for s in b.execute("PRAGMA table_info(stok)")]:
+            with b: b.execute("ALTER TABLE stok ADD COLUMN erisim REAL NOT NULL DEFAULT 0")
+        b.execute("CREATE INDEX IF NOT EXISTS stok_erisim ON stok (erisim)")
+        with b:
+            b.execute("DELETE FROM stok WHERE surum != ? AND erisim < ?", (self.surum, time.time() - ESKI_SURUM_OMRU))
+            fazla = b.execute("SELECT COUNT(*) FROM stok").fetchone()[0] - MAX_KAYIT
+            if fazla > 0: b.execute("DELETE FROM stok WHERE rowid IN (SELECT rowid FROM stok ORDER BY erisim LIMIT ?)", (fazla,))
+
+    def _oku(self, anahtarlar):
+        b, kayitlar, bayat = self._baglanti(), {}, []
+        simdi = time.time()
+        for i in range(0, len(anahtarlar), SORGU_PARCASI):
+            parca = anahtarlar[i:i + SORGU_PARCASI]
+            sorgu = f"SELECT stok_adi, veri, erisim FROM stok WHERE surum = ? AND stok_adi IN ({','.join('?' * len(parca))})"
+            for anahtar, veri, erisim in b.execute(sorgu, [self.surum] + parca):
+                kayitlar[anahtar] = json.loads(veri)
+                if erisim < simdi - ERISIM_ADIMI: bayat.append(anahtar)
+        if bayat:
+            with b: b.executemany("UPDATE stok SET erisim = ? WHERE surum = ? AND stok_adi = ?", [(simdi, self.surum, a) for a in bayat])
+        return kayitlar
+
+    def _yaz(self, kayitlar):
+        # kayitlar: (anahtar, satır) çiftleri
+        b, simdi = self._baglanti(), time.time()
+        with b:
+            b.executemany("INSERT OR REPLACE INTO stok (surum, stok_adi, veri, erisim) VALUES (?, ?, ?, ?)",
+                          [(self.surum, a, json.dumps(k, ensure_ascii=False), simdi) for a, k in kayitlar])
+
+    def siniflandir(self, stok_adlari):
+        # urunleri_siniflandir ile aynı çerçeveyi döndürür; yalnızca önbellekte olmayan adlar hesaplanır.
+        adlar = pd.Series(stok_adlari, dtype=object).astype(str).tolist()
+        if self.devre_disi: return urunleri_siniflandir(adlar)
+        anahtar = {a: stok_anahtari(a) for a in dict.fromkeys(adlar)}
+        temsilci = {}  # anahtar -> o anahtarı veren ilk yazım (eksikse bununla hesaplanır)
+        for a, k in anahtar.items(): temsilci.setdefault(k, a)
+        try:
+            kayitlar = self._oku(list(temsilci))
+        except sqlite3.Error:
+            # Disk / kilit sorunu siparişi durdurmaz: önbellek bu süreçte kapatılır
+            self.devre_disi = True
+            return urunleri_siniflandir(adlar)
+        eksik = [k for k in temsilci if k not in kayitlar]
+        self.isabet += len(temsilci) - len(eksik); self.iskalama += len(eksik)
+        if eksik:
+            yeni = list(zip(eksik, urunleri_siniflandir([temsilci[k] for k in eksik]).to_dict('records')))
+            kayitlar.update(yeni)
+            try: self._yaz(yeni)
+            except sqlite3.Error: pass
+        # Çerçeve urunleri_siniflandir'daki gibi sütun listelerinden kurulur ki dtype'lar birebir aynı çıksın
+        satirlar = [kayitlar[anahtar[a]] for a in adlar]
+        sutunlar = {s: [k[s] for k in satirlar] for s in SUTUNLAR}
+        sutunlar['Stok Adı'] = adlar
+        sutunlar['model_key'] = pd.Series(sutunlar['model_key'], dtype=object)
+        return pd.DataFrame(sutunlar)
+
+    def isit(self, stok_adlari):
+        # Dağıtımdan sonra ilk siparişin beklememesi için kataloğu önceden hesaplar; eklenen ad sayısını döndürür
+        onceki = self.iskalama
+        self.siniflandir(stok_adlari)
+        return self.iskalama - onceki
+
+    def istatistik(self):
+        try: kayit = self._baglanti().execute("SELECT COUNT(*) FROM stok WHERE surum = ?", (self.surum,)).fetchone()[0]
+        except sqlite3.Error: kayit = None
+        return {'isabet': self.isabet, 'iskalama': self.iskalama, 'kayit': kayit, 'surum': self.surum}
+
+
+stok_onbellegi = StokOnbellegi()
+
+
+def _adlari_oku(yol):
+    if yol.lower().endswith(('.xls', '.xlsx', '.csv')):
+        from ice_aktarim import dia_dosyasi_oku
+        with open(yol, 'rb') as f: df = dia_dosyasi_oku(yol, f)
+        return [] if df is None else df['Stok Adı'].astype(str).tolist()
+    with open(yol, encoding='utf-8') as f: return [s.strip() for s in f if s.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ürün kataloğunu kalıcı stok adı önbelleğine önceden yükler.")
+    parser.add_argument('dosyalar', nargs='+', help="Stok adı listesi (.txt, satır başına bir ad) ya da Dia dökümleri (.xls / .xlsx / .csv)")
+    args = parser.parse_args(argv)
+
+    adlar = [ad for yol in args.dosyalar for ad in _adlari_oku(yol)]
+    eklenen = stok_onbellegi.isit(adlar)
+    ist = stok_onbellegi.istatistik()
+    print(f"{len(set(adlar))} stok adı, {eklenen} yeni hesaplandı; önbellekte {ist['kayit']} kayıt (sürüm {ist['surum']}) — {stok_onbellegi.yol}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
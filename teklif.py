@@ -0,0 +1,110 @@
+import io
+import re
+from itertools import product
+
+import pandas as pd
+
+from hesaplama import siniflandirici, tr_lower
+from siparis_analizi import MANUEL_SUTUNLAR, manuel_toplu_hesapla
+
+# =============================================================================
+# TOPLU TEKLİF (MANUEL HESAPLAYICI)
+# Yapıştırılan liste, yüklenen tablo ya da model × yükseklik × genişlik ızgarası
+# (model, genişlik, yükseklik, adet) dizilerine çevrilir ve tek seferde
+# manuel_toplu_hesapla'ya verilir. Sonuç teklif tablosu olarak Excel / CSV
+# indirilir.
+#
+# Liste satırı:  <model> <ölçü 1> x <ölçü 2> [adet]   (cm; "Nirvana 60x100 3",
+# Excel'den kopyalanan sekmeli ya da ; ayraçlı satırlar da olur)
+# Ölçü sırası tekli hesaplayıcıdaki alanlarla aynıdır: havlupanda genişlik x
+# yükseklik, radyatörde yükseklik x genişlik.
+# =============================================================================
+
+_SATIR_DESENI = re.compile(r'^\s*(?P<model>.*?)[\s;,]+(?P<a>\d+(?:[.,]\d+)?)(?:\s*[xX*/;]\s*|\s+)(?P<b>\d+(?:[.,]\d+)?)(?:[\s;,]+(?P<adet>\d+))?\s*$')
+_ARALIK_DESENI = re.compile(r'^(\d+(?:\.\d+)?)-(\d+(?:\.\d+)?)(?::(\d+(?:\.\d+)?))?$')
+MAX_SATIR = 50000
+
+# Yüklenen tabloda aranan sütunlar (tr_lower ile karşılaştırılır)
+TABLO_SUTUNLARI = {'model': 'model', 'genişlik': 'genislik', 'genislik': 'genislik', 'yükseklik': 'yukseklik',
+                   'yukseklik': 'yukseklik', 'adet': 'adet'}
+
+
+def _sayi(metin): return float(metin.replace(',', '.'))
+
+
+def _havlupan_mi(model): return siniflandirici.siniflandir(model).tip == 'HAVLUPAN'
+
+
+def _hesapla(satirlar):
+    # satirlar: (model, genişlik, yükseklik, adet)
+    if len(satirlar) > MAX_SATIR: raise ValueError(f"En çok {MAX_SATIR} satır hesaplanabilir ({len(satirlar)} verildi).")
+    if not satirlar: return manuel_toplu_hesapla([], [], [], [])
+    return manuel_toplu_hesapla(*zip(*satirlar))
+
+
+def liste_hesapla(metin):
+    # (sonuç tablosu, okunamayan satırlar)
+    satirlar, hatali = [], []
+    for satir in metin.splitlines():
+        if not satir.strip(): continue
+        m = _SATIR_DESENI.match(satir)
+        if m is None or not m.group('model').strip():
+            hatali.append(satir.strip()); continue
+        model, a, b = m.group('model').strip(), _sayi(m.group('a')), _sayi(m.group('b'))
+        g, y = (a, b) if _havlupan_mi(model) else (b, a)
+        satirlar.append((model, g, y, int(m.group('adet') or 1)))
+    return _hesapla(satirlar), hatali
+
+
+def tablo_hesapla(ad, dosya):
+    # Model, Genişlik, Yükseklik, Adet sütunlu .csv / .xlsx (başlık adları büyük / küçük harf duyarsız)
+    if ad.lower().endswith('.csv'): df = pd.read_csv(dosya, sep=None, engine='python', dtype=str)
+    else: df = pd.read_excel(dosya, dtype=str)
+    sutunlar = {TABLO_SUTUNLARI[tr_lower(str(s)).strip()]: s for s in df.columns if tr_lower(str(s)).strip() in TABLO_SUTUNLARI}
+    eksik = [s for s in ('model', 'genislik', 'yukseklik') if s not in sutunlar]
+    if eksik: raise ValueError(f"Tabloda eksik sütun: {', '.join(eksik)}")
+    df = df.dropna(subset=[sutunlar['model'], sutunlar['genislik'], sutunlar['yukseklik']])
+    sayi = lambda s: pd.to_numeric(df[s].str.replace(',', '.', regex=False), errors='coerce')
+    genislik, yukseklik = sayi(sutunlar['genislik']), sayi(sutunlar['yukseklik'])
+    adet = sayi(sutunlar['adet']).fillna(1) if 'adet' in sutunlar else pd.Series(1, index=df.index)
+    gecerli = genislik.notna() & yukseklik.notna() & (adet > 0)
+    return _hesapla(list(zip(df.loc[gecerli, sutunlar['model']].str.strip(), genislik[gecerli], yukseklik[gecerli], adet[gecerli].astype(int))))
+
+
+def degerler_ayristir(metin):
+    # "60, 90" ya da "40-100:10" (başlangıç-bitiş:adım, bitiş dahil) -> sıralı sayı listesi; ondalık ayracı nokta
+    degerler = []
+    metin = re.sub(r'\s*([-:])\s*', r'\1', metin.strip())
+    for parca in re.split(r'[;,\s]+', metin) if metin else []:
+        m = _ARALIK_DESENI.match(parca)
+        if m:
+            bas, bit, adim = float(m.group(1)), float(m.group(2)), float(m.group(3) or 10)
+            if adim <= 0: raise ValueError(f"Geçersiz adım: {parca}")
+            n = int((bit - bas) / adim + 1e-9)
+            degerler += [bas + i * adim for i in range(n + 1)]
+        else:
+            degerler.append(float(parca))
+    return sorted(set(degerler))
+
+
+def izgara_hesapla(modeller, yukseklikler, genislikler, adet=1):
+    return _hesapla([(m, g, y, adet) for m, y, g in product(modeller, yukseklikler, genislikler)])
+
+
+def teklif_excel(kayitlar):
+    # Teklif tablosu + toplam satırı (.xlsx baytları)
+    df = pd.DataFrame(kayitlar, columns=MANUEL_SUTUNLAR)
+    toplam = {"Model": "TOPLAM", "Adet": df["Adet"].sum(), "Toplam Desi": round(df["Toplam Desi"].sum(), 2),
+              "Toplam Ağırlık": round(df["Toplam Ağırlık"].sum(), 2)}
+    df = pd.concat([df, pd.DataFrame([toplam])], ignore_index=True)
+    cikti = io.BytesIO()
+    with pd.ExcelWriter(cikti, engine='openpyxl') as yazici:
+        df.to_excel(yazici, index=False, sheet_name='Teklif')
+        sayfa = yazici.sheets['Teklif']
+        for sutun, genislik in zip('ABCDEFG', (28, 14, 22, 8, 12, 12, 16)): sayfa.column_dimensions[sutun].width = genislik
+    return cikti.getvalue()
+
+
+def teklif_csv(kayitlar):
+    # Excel'in Türkçe bölgesel ayarıyla açılabilsin diye ; ayraçlı, BOM'lu UTF-8
+    return pd.DataFrame(kayitlar, columns=MANUEL_SUTUNLAR).to_csv(index=False, sep=';', decimal=',').encode('utf-8-sig')
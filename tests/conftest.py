@@ -0,0 +1,15 @@
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+# Testler kullanıcının önbellek klasörüne dokunmaz: stok önbelleği geçici bir dosyaya yazılır,
+# yükleme önbelleği yalnızca bellekte tutulur. Modüller yol sabitlerini içe aktarılırken okur.
+_GECICI = tempfile.mkdtemp(prefix='nixrad_test_')
+atexit.register(shutil.rmtree, _GECICI, ignore_errors=True)
+os.environ['NIXRAD_STOK_ONBELLEGI'] = os.path.join(_GECICI, 'stok.sqlite3')
+os.environ['NIXRAD_YUKLEME_ONBELLEGI'] = ''
+
+KOK = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [KOK, os.path.join(KOK, 'benchmarks')]
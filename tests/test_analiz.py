@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from hesaplama import hesapla_ve_analiz_et, siniflandirici
+from konsolidasyon import ORNEK_SIPARIS
+from sentetik_dia import satirlar_uret
+from siparis_analizi import siparisi_analiz_et, urunleri_siniflandir
+
+
+def _tekil_analiz(satirlar):
+    # Vektörel motordan önceki satır satır yol (app.py'deki eski iterrows döngüsü)
+    ham_veri, malzeme_listesi = [], {}
+    for stok_adi, miktar in satirlar:
+        try: adet = float(miktar)
+        except (TypeError, ValueError): adet = 0
+        stok_adi = str(stok_adi)
+        if adet <= 0: continue
+        sinif = siniflandirici.siniflandir(stok_adi).sinif
+        if sinif == 'AKSESUAR':
+            anahtar = f"{stok_adi} (Adet)"
+            malzeme_listesi[anahtar] = malzeme_listesi.get(anahtar, 0) + adet
+        elif sinif == 'URUN':
+            analiz = hesapla_ve_analiz_et(stok_adi, adet)
+            if not analiz: continue
+            for miktar_, birim, ad in analiz['Reçete']:
+                anahtar = f"{ad} ({birim})"
+                malzeme_listesi[anahtar] = malzeme_listesi.get(anahtar, 0) + miktar_ * adet
+            ham_veri.append({'Ürün': analiz['Etiket']['kisa_isim'], 'Adet': int(adet), 'Ölçü': analiz['Etiket']['boyut_str'],
+                             'Birim Desi': analiz['Etiket']['desi_val'], 'Toplam Ağırlık': analiz['Toplam_Agirlik_Gosterim']})
+    return ham_veri, malzeme_listesi
+
+
+def _siparisler():
+    yield 'ornek', list(ORNEK_SIPARIS)
+    for tohum in range(3):
+        yield f'sentetik_{tohum}', [(s[1], s[3]) for s in satirlar_uret(400, tohum)]
+
+
+@pytest.mark.parametrize('ad,satirlar', list(_siparisler()))
+def test_vektorel_analiz_tekil_yolla_ayni(ad, satirlar):
+    ham_veri, malzeme_listesi = siparisi_analiz_et(pd.DataFrame(satirlar, columns=['Stok Adı', 'Miktar']))
+    beklenen_ham, beklenen_malzeme = _tekil_analiz(satirlar)
+    # Koli ölçüsü alanları (k_en, k_boy, k_derin) yalnızca vektörel yolda var
+    assert [{k: s[k] for k in beklenen_ham[0]} for s in ham_veri] == beklenen_ham
+    assert list(malzeme_listesi.items()) == list(beklenen_malzeme.items())
+
+
+def test_urunleri_siniflandir_tekil_yolla_ayni():
+    adlar = [s[1] for s in satirlar_uret(400, 7)] + [ad for ad, _ in ORNEK_SIPARIS]
+    df = urunleri_siniflandir(adlar)
+    for ad, satir in zip(adlar, df.to_dict('records')):
+        analiz = hesapla_ve_analiz_et(ad, 3)
+        if analiz is None or siniflandirici.siniflandir(ad).sinif != 'URUN': continue
+        assert satir['gecerli']
+        assert (satir['kisa_isim'], satir['boyut_str'], satir['desi']) == (analiz['Ürün'], analiz['Ölçü'], analiz['Birim_Desi'])
+        assert round(satir['birim_agirlik'] * 3, 1) == analiz['Toplam_Agirlik_Gosterim']
+
+
+def test_bos_ve_sifir_miktarli_siparis():
+    assert siparisi_analiz_et(pd.DataFrame({'Stok Adı': ['Nirvana 600/1000 radyatör'], 'Miktar': [0]})) == ([], {})
@@ -0,0 +1,50 @@
+import io
+
+import pytest
+
+from ice_aktarim import BASLIK_ARAMA_SATIRI, dia_dosyasi_oku
+from sentetik_dia import dosya_uret, kullanilabilir_bicimler
+
+BASLIK = 'Stok Kodu,Stok Adı,Birim,Miktar\n'
+VERI = 'A1,Nirvana 600/1000 radyatör,ADET,2\nA2,"Prag\n600/600 radyatör",ADET,1\n'
+
+
+def _oku(ad, veri):
+    df = dia_dosyasi_oku(ad, io.BytesIO(veri))
+    return None if df is None else df.values.tolist()
+
+
+@pytest.mark.parametrize('ust', [
+    'Rapor,"çok\nsatırlı\nnot",\nTarih,x,\n',  # tırnaklı çok satırlı hücre
+    'Rapor\n\n\r\n\n',  # boş satırlar
+    '\ufeffRapor,,\r\n',  # BOM ve CRLF
+])
+def test_csv_baslik_kaydinin_konumundan_okunur(ust):
+    assert _oku('a.csv', (ust + BASLIK + VERI).encode('utf-8')) == [['Nirvana 600/1000 radyatör', '2'], ['Prag\n600/600 radyatör', '1']]
+
+
+@pytest.mark.parametrize('kodlama', ['utf-8', 'cp1254'])
+def test_arama_sinirindan_sonraki_baslik_da_bulunur(kodlama):
+    ust = 'Rapor satırı,\n' * (BASLIK_ARAMA_SATIRI + 50)
+    assert _oku('a.csv', (ust + BASLIK + VERI).encode(kodlama))[0] == ['Nirvana 600/1000 radyatör', '2']
+
+
+def test_tablo_arama_sinirindan_sonraki_baslik_da_bulunur():
+    from openpyxl import Workbook
+    wb = Workbook()
+    for _ in range(BASLIK_ARAMA_SATIRI + 50): wb.active.append(['Rapor satırı'])
+    wb.active.append(['Stok Kodu', 'Stok Adı', 'Birim', 'Miktar'])
+    wb.active.append(['A1', 'Nirvana 600/1000 radyatör', 'ADET', 3])
+    cikti = io.BytesIO(); wb.save(cikti)
+    assert _oku('a.xlsx', cikti.getvalue()) == [['Nirvana 600/1000 radyatör', 3]]
+
+
+def test_basliksiz_dosya():
+    assert _oku('a.csv', b'a,b\n1,2\n') is None
+
+
+def test_tum_bicimler_ayni_satirlari_verir():
+    sonuclar = {b: _oku(*dosya_uret(b, 30)) for b in kullanilabilir_bicimler()[0]}
+    beklenen = sonuclar.pop('csv-utf8')
+    for bicim, satirlar in sonuclar.items():
+        assert [[s, str(m)] for s, m in satirlar] == beklenen, bicim
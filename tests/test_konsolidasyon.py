@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+
+import konsolidasyon
+from konsolidasyon import KARTONLAR, ORNEK_SIPARIS, konsolide_et
+from sentetik_dia import satirlar_uret
+from siparis_analizi import siparisi_analiz_et
+
+EPS = 1e-6
+KARTON = {k.ad: k for k in KARTONLAR}
+
+
+def _ham_veri(satirlar):
+    return siparisi_analiz_et(pd.DataFrame(satirlar, columns=['Stok Adı', 'Miktar']))[0]
+
+
+def _siparisler():
+    yield 'ornek', _ham_veri(ORNEK_SIPARIS)
+    for n, tohum in ((5, 0), (20, 1), (60, 2), (150, 3), (300, 4)):
+        yield f'sentetik_{n}', _ham_veri([(s[1], s[3]) for s in satirlar_uret(n, tohum)])
+
+
+@pytest.mark.parametrize('ad,ham_veri', list(_siparisler()))
+def test_plan_desiyi_artirmaz_ve_her_urunu_bir_kez_gonderir(ad, ham_veri):
+    plan = konsolide_et(ham_veri)
+    assert plan.onceki_parca == sum(s['Adet'] for s in ham_veri)
+    assert plan.toplam_desi <= plan.onceki_desi + EPS
+    assert sum(adet for k in plan.koliler for _, adet in k.icerik) == plan.onceki_parca
+    assert plan.toplam_agirlik == pytest.approx(sum(s['Toplam Ağırlık'] for s in ham_veri))
+    assert len(plan.etiket_listesi) == plan.toplam_parca
+    birim_desi = {s['Ürün']: s['Birim Desi'] for s in ham_veri}
+    for k in plan.koliler:
+        if k.karton is None: continue
+        # Ortak koli, içindekilerin tek tek desisinden küçük olmalı ve kartonun ağırlık sınırını aşmamalı
+        assert k.desi < sum(birim_desi[u] * adet for u, adet in k.icerik) - EPS
+        assert k.kg <= KARTON[k.karton].max_kg + EPS
+
+
+def test_ornek_sipariste_ortak_koli_desiyi_dusurur():
+    plan = konsolide_et(_ham_veri(ORNEK_SIPARIS))
+    assert plan.ortak_koli_sayisi >= 1
+    assert plan.toplam_desi < plan.onceki_desi - EPS
+
+
+def test_olcusu_okunamayan_satir_tek_gider():
+    ham_veri = _ham_veri(ORNEK_SIPARIS)
+    # Elle eklenen / düzenlenen satır: koli ölçüsü alanları yok, 'Ölçü' metni okunur ya da okunamaz
+    elle = [{k: v for k, v in s.items() if not k.startswith('k_')} for s in ham_veri]
+    assert konsolide_et(elle).toplam_desi == pytest.approx(konsolide_et(ham_veri).toplam_desi)
+    okunamaz = {'Ürün': 'ÖZEL', 'Ölçü': 'bilinmiyor', 'Birim Desi': 3.0, 'Adet': 2, 'Toplam Ağırlık': 4.0}
+    plan = konsolide_et(ham_veri + [okunamaz])
+    assert [k.karton for k in plan.koliler if k.urun == 'ÖZEL'] == [None, None]
+    assert plan.toplam_desi <= plan.onceki_desi + EPS
+
+
+def test_sinir_ustunde_plan_cikarilmaz(monkeypatch):
+    ham_veri = _ham_veri(ORNEK_SIPARIS)
+    monkeypatch.setattr(konsolidasyon, 'KONSOLIDASYON_SINIRI', 3)
+    plan = konsolide_et(ham_veri)
+    assert plan.ortak_koli_sayisi == 0
+    assert plan.toplam_desi == pytest.approx(plan.onceki_desi)
@@ -0,0 +1,74 @@
+import pytest
+
+from hesaplama import PaketListesi, etiket_listesi_olustur, paket_listesi
+
+SATIRLAR = [
+    {'Ürün': 'NIRVANA', 'Ölçü': '63.5x60.5x8.0cm', 'Birim Desi': 10.24, 'Adet': 3},
+    {'Ürün': 'PRAG', 'Ölçü': '63.5x60.5x6.0cm', 'Birim Desi': 7.68, 'Adet': 0},
+    {'Ürün': 'AKASYA', 'Ölçü': '83.5x60.5x7.0cm', 'Birim Desi': 11.79, 'Adet': 1},
+    {'Ürün': 'LIZYANTUS', 'Ölçü': '51.5x70.5x4.5cm', 'Birim Desi': 5.45, 'Adet': 4},
+]
+
+
+def _acik(satirlar):
+    # Koşu gösteriminden önceki koli başına bir sözlük
+    koliler = []
+    for s in satirlar:
+        for _ in range(int(s['Adet'])):
+            koliler.append((len(koliler) + 1, s['Ürün'], s['Ölçü'], s['Birim Desi']))
+    return koliler
+
+
+def _demet(k): return (k['sira_no'], k['kisa_isim'], k['boyut_str'], k['desi_val'])
+
+
+@pytest.fixture
+def liste(): return etiket_listesi_olustur(SATIRLAR)
+
+
+def test_uzunluk_toplam_ve_yineleme(liste):
+    beklenen = _acik(SATIRLAR)
+    assert len(liste) == len(beklenen) == 8
+    assert [_demet(k) for k in liste] == beklenen
+    assert liste.toplam_desi == pytest.approx(sum(d for *_, d in beklenen))
+    # Adet 0 olan satır koşu üretmez
+    assert [k[0] for k in liste.kosular()] == ['NIRVANA', 'AKASYA', 'LIZYANTUS']
+
+
+def test_indeksleme(liste):
+    beklenen = _acik(SATIRLAR)
+    for i in range(-len(beklenen), len(beklenen)):
+        assert _demet(liste[i]) == beklenen[i]
+    for i in (len(beklenen), -len(beklenen) - 1):
+        with pytest.raises(IndexError): liste[i]
+
+
+@pytest.mark.parametrize('bas,bit', [(0, 8), (0, 3), (2, 5), (3, 4), (5, 100), (-3, None), (4, 4), (7, 2)])
+def test_dilimleme_sira_numaralarini_korur(liste, bas, bit):
+    dilim = liste[bas:bit]
+    assert isinstance(dilim, PaketListesi)
+    assert [_demet(k) for k in dilim] == _acik(SATIRLAR)[bas:bit]
+    # Dilimin dilimi ve indekslemesi de aynı kolileri verir
+    assert [_demet(k) for k in dilim[1:]] == _acik(SATIRLAR)[bas:bit][1:]
+    if len(dilim): assert _demet(dilim[-1]) == _acik(SATIRLAR)[bas:bit][-1]
+
+
+def test_adimli_dilim_desteklenmez(liste):
+    with pytest.raises(ValueError): liste[::2]
+
+
+def test_ilk_kosular_oneki_kopyalar(liste):
+    onek = liste.ilk_kosular(2)
+    assert [_demet(k) for k in onek] == _acik(SATIRLAR)[:4]
+    assert onek.toplam_desi == etiket_listesi_olustur(SATIRLAR[:3]).toplam_desi
+    # Önekle devam edilen liste baştan kurulanla aynıdır; asıl liste değişmez
+    onek.ekle('YENI', '1x1x1cm', 1.0, 2)
+    assert [_demet(k) for k in onek][-2:] == [(5, 'YENI', '1x1x1cm', 1.0), (6, 'YENI', '1x1x1cm', 1.0)]
+    assert len(liste) == 8
+
+
+def test_duz_listeden_donusturme(liste):
+    duz = [{'sira_no': s, 'kisa_isim': u, 'boyut_str': o, 'desi_val': d} for s, u, o, d in _acik(SATIRLAR)][2:6]
+    donusen = paket_listesi(duz)
+    assert [_demet(k) for k in donusen] == _acik(SATIRLAR)[2:6]
+    assert paket_listesi(liste) is liste
@@ -0,0 +1,42 @@
+import re
+
+import pytest
+
+from hesaplama import (AKSESUAR_KELIMELERI, BOYUT_DESENI, DILIM_DESENI, MODEL_DERINLIKLERI, URUN_KELIMELERI,
+                       ZORUNLU_HAVLUPANLAR, siniflandirici, tr_lower, tr_upper)
+from sentetik_dia import satirlar_uret
+
+
+def _eski_kurallar(stok_adi):
+    # Derlenmiş desenden önceki ad başına alt dize aramaları (model, tip, sınıf, ölçü, dilim)
+    kucuk = tr_lower(stok_adi)
+    model_key = next((m for m in MODEL_DERINLIKLERI if m in kucuk), 'standart')
+    tip = 'HAVLUPAN' if 'havlupan' in kucuk or any(z in kucuk for z in ZORUNLU_HAVLUPANLAR) else 'RADYATOR'
+    if ('vana' in kucuk and 'nirvana' not in kucuk) or any(k in kucuk for k in AKSESUAR_KELIMELERI): sinif = 'AKSESUAR'
+    elif any(k in kucuk for k in URUN_KELIMELERI): sinif = 'URUN'
+    else: sinif = 'DIGER'
+    genislik = yukseklik = None
+    boyut = re.search(BOYUT_DESENI, stok_adi)
+    if boyut:
+        v1, v2 = int(boyut.group(1)) / 10, int(boyut.group(2)) / 10
+        genislik, yukseklik = (v1, v2) if tip == 'HAVLUPAN' else (v2, v1)
+    dilim = re.search(DILIM_DESENI, tr_upper(stok_adi))
+    return model_key, tip, sinif, genislik, yukseklik, int(dilim.group(1)) if dilim else None
+
+
+ELLE_ADLAR = [
+    'Nirvana 600/1000 radyatör beyaz', '1/2 termostatik vana beyaz', 'NIRVANA 600 X 1000 RADYATÖR',
+    'Prag 600x600 12 DILIM radyatör', 'Lizyantus havlupan 500/700', 'KUMBAROS 500/1200 KROM', 'Köşe vana seti',
+    'Montaj hizmeti', 'Livera 600/800 radyator', 'Aspar Nirvana 600/1000 radyatör', 'HAZAL 400/800', 'İNOX HAVLUPAN 500/1000',
+]
+
+
+@pytest.mark.parametrize('stok_adi', ELLE_ADLAR + [s[1] for s in satirlar_uret(300, 3)])
+def test_derlenmis_desen_eski_kurallarla_ayni(stok_adi):
+    s = siniflandirici.siniflandir(stok_adi)
+    assert (s.model_key, s.tip, s.sinif, s.genislik, s.yukseklik, s.dilim) == _eski_kurallar(stok_adi)
+
+
+def test_vana_nirvana_ayrimi():
+    assert siniflandirici.siniflandir('Nirvana 600/1000 radyatör').sinif == 'URUN'
+    assert siniflandirici.siniflandir('Radyatör vanası').sinif == 'AKSESUAR'
@@ -0,0 +1,79 @@
+import math
+import random
+
+import pandas as pd
+import pytest
+
+from hesaplama import etiket_listesi_olustur, proje_toplamlari
+from konsolidasyon import ORNEK_SIPARIS
+from siparis_analizi import siparisi_analiz_et
+from siparis_modeli import SiparisModeli, _satir_duzelt
+
+
+@pytest.fixture(scope='module')
+def analiz():
+    return siparisi_analiz_et(pd.DataFrame(ORNEK_SIPARIS, columns=['Stok Adı', 'Miktar']))
+
+
+def _tam_hesap(model):
+    # Her çalıştırmada tablonun baştan toplanması (artımlı modelden önceki yol)
+    satirlar = [model._etkin[k] for k in sorted(model._etkin)]
+    if not satirlar: return (0, 0.0, 0.0), []
+    parca, desi, agirlik = proje_toplamlari(pd.DataFrame(satirlar))
+    return (parca, round(desi, 2) + 0.0, round(agirlik, 2) + 0.0), list(etiket_listesi_olustur(satirlar).kosular())
+
+
+def test_ilk_toplamlar_proje_toplamlariyla_ayni(analiz):
+    model = SiparisModeli(*analiz)
+    parca, desi, agirlik = proje_toplamlari(pd.DataFrame(analiz[0]))
+    assert model.toplamlar() == (parca, round(desi, 2), round(agirlik, 2))
+    assert model.guncelle(None) == set()
+
+
+@pytest.mark.parametrize('deger,beklenen', [(3, 3), (2.0, 2), (float('nan'), 0), (None, 0), ('4', 4), ('', 0)])
+def test_adet_tam_sayiya_cevrilir(deger, beklenen):
+    satir = _satir_duzelt({'Ürün': 'X', 'Ölçü': '1x1x1cm', 'Birim Desi': 1.0, 'Adet': deger, 'Toplam Ağırlık': 1.0})
+    assert satir['Adet'] == beklenen and type(satir['Adet']) is int
+
+
+def test_duzenleme_ekleme_silme_deltalari(analiz):
+    model = SiparisModeli(*analiz)
+    durum = {'edited_rows': {'0': {'Adet': 5.0}}, 'added_rows': [], 'deleted_rows': [2]}
+    assert model.guncelle(durum) == {0, 2}
+    assert model.toplamlar() == _tam_hesap(model)[0]
+    assert type(model.toplam_parca) is int
+
+    # Aynı durum tekrar gelirse hiçbir satır yeniden hesaplanmaz
+    assert model.guncelle(durum) == set()
+
+    durum = {'edited_rows': {'0': {'Adet': float('nan')}}, 'added_rows': [{'Ürün': 'YENI', 'Ölçü': '10x10x10cm', 'Birim Desi': 0.33}],
+             'deleted_rows': []}
+    assert model.guncelle(durum) == {0, 2, len(analiz[0])}
+    assert model.toplamlar() == _tam_hesap(model)[0]
+    assert not math.isnan(model.toplam_parca)
+
+
+def test_tum_satirlar_silinince_toplamlar_sifirlanir(analiz):
+    model = SiparisModeli(*analiz)
+    model.guncelle({'deleted_rows': list(range(len(analiz[0])))})
+    assert model.toplamlar() == (0, 0.0, 0.0)
+    assert len(model.etiket_listesi) == 0
+
+
+def test_rastgele_duzenlemeler_tam_hesapla_ayni(analiz):
+    model, n, rnd = SiparisModeli(*analiz), len(analiz[0]), random.Random(5)
+    duzenlenen, eklenen, silinen = {}, [], set()
+    for _ in range(300):
+        r = rnd.random()
+        if r < 0.45: duzenlenen.setdefault(rnd.randrange(n), {})['Adet'] = rnd.choice([0, 1, 2.0, 3, float('nan'), None])
+        elif r < 0.6: duzenlenen.setdefault(rnd.randrange(n), {})['Birim Desi'] = rnd.choice([1.25, 16.7, None])
+        elif r < 0.7: duzenlenen.setdefault(rnd.randrange(n), {})['Ürün'] = rnd.choice(['A', 'B'])
+        elif r < 0.82: eklenen.append({'Ürün': 'EK', 'Ölçü': '5x5x5cm', 'Birim Desi': 0.04, 'Adet': rnd.choice([1, 2.0, None])})
+        elif r < 0.9 and eklenen: eklenen.pop()
+        else: silinen ^= {rnd.randrange(n)}
+        model.guncelle({'edited_rows': {str(k): dict(v) for k, v in duzenlenen.items()},
+                        'added_rows': [dict(s) for s in eklenen], 'deleted_rows': sorted(silinen)})
+        toplamlar, kosular = _tam_hesap(model)
+        assert model.toplamlar() == toplamlar
+        # Koli listesi ilk değişen satırdan itibaren yeniden kurulur; sonuç baştan kurulanla aynı olmalı
+        if rnd.random() < 0.5: assert list(model.etiket_listesi.kosular()) == kosular
@@ -0,0 +1,79 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import hesaplama
+import stok_onbellegi
+from sentetik_dia import satirlar_uret
+from siparis_analizi import urunleri_siniflandir
+from stok_onbellegi import StokOnbellegi, stok_anahtari
+
+ADLAR = [s[1] for s in satirlar_uret(60, 11)] + ['NIRVANA 600/1000 RADYATÖR ', 'nırvana 600/1000 radyatör']
+
+
+def _kayit_sayisi(yol, surum=None):
+    with sqlite3.connect(yol) as b:
+        if surum is None: return b.execute("SELECT COUNT(*) FROM stok").fetchone()[0]
+        return b.execute("SELECT COUNT(*) FROM stok WHERE surum = ?", (surum,)).fetchone()[0]
+
+
+@pytest.fixture
+def yol(tmp_path): return str(tmp_path / 'stok.sqlite3')
+
+
+def test_anahtar_buyuk_kucuk_harf_ve_bosluktan_bagimsiz():
+    assert stok_anahtari('NIRVANA 600/1000 RADYATÖR ') == stok_anahtari('nırvana 600/1000 radyatör')
+    assert stok_anahtari('Prag 600/600') != stok_anahtari('Prag 600/800')
+
+
+def test_onbellek_sonucu_urunleri_siniflandir_ile_ayni(yol):
+    beklenen = urunleri_siniflandir(ADLAR)
+    ilk = StokOnbellegi(yol)
+    pd.testing.assert_frame_equal(ilk.siniflandir(ADLAR), beklenen)
+    assert ilk.isabet == 0
+    # Yeni süreç (yeni nesne) aynı kayıtları diskten okur; 'Stok Adı' çağıranın yazımıyla gelir
+    ikinci = StokOnbellegi(yol)
+    pd.testing.assert_frame_equal(ikinci.siniflandir(ADLAR), beklenen)
+    assert ikinci.iskalama == 0 and ikinci.isabet == len({stok_anahtari(a) for a in ADLAR})
+
+
+def test_sabitler_degisince_eski_kayitlar_kullanilmaz(yol, monkeypatch):
+    eski = StokOnbellegi(yol)
+    eski.siniflandir(ADLAR)
+    monkeypatch.setattr(hesaplama, 'AYARLAR', {**hesaplama.AYARLAR, 'RADYATOR': {**hesaplama.AYARLAR['RADYATOR'], 'PAY_GENISLIK': 4.0}})
+    yeni = StokOnbellegi(yol)
+    assert yeni.surum != eski.surum
+    yeni.siniflandir(ADLAR)
+    assert yeni.isabet == 0 and yeni.iskalama > 0
+    # Eski sürümün kayıtları ESKI_SURUM_OMRU dolmadan silinmez (eski süreçler hâlâ kullanıyor olabilir)
+    assert _kayit_sayisi(yol, eski.surum) == eski.iskalama
+
+
+def test_sema_surumu_anahtara_girer_ve_eski_surum_budanir(yol, monkeypatch):
+    eski = StokOnbellegi(yol)
+    eski.siniflandir(ADLAR)
+    monkeypatch.setattr(stok_onbellegi, 'SEMA_SURUMU', stok_onbellegi.SEMA_SURUMU + 1)
+    monkeypatch.setattr(stok_onbellegi, 'ESKI_SURUM_OMRU', -1)
+    yeni = StokOnbellegi(yol)
+    assert yeni.surum != eski.surum
+    yeni.siniflandir(ADLAR[:5])
+    assert _kayit_sayisi(yol, eski.surum) == 0
+    assert _kayit_sayisi(yol) == _kayit_sayisi(yol, yeni.surum) == len({stok_anahtari(a) for a in ADLAR[:5]})
+
+
+def test_kayit_siniri_en_eski_kayitlari_budar(yol, monkeypatch):
+    StokOnbellegi(yol).siniflandir(ADLAR)
+    monkeypatch.setattr(stok_onbellegi, 'MAX_KAYIT', 10)
+    StokOnbellegi(yol).istatistik()
+    assert _kayit_sayisi(yol) == 10
+
+
+def test_varsayilan_klasor_kullanici_onbellegi(tmp_path, monkeypatch):
+    from onbellek import _kullanici_onbellegi
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert _kullanici_onbellegi() == str(tmp_path / 'nixrad')
+    # XDG'ye göre göreli yol geçersizdir; ~/.cache kullanılır
+    monkeypatch.setenv('XDG_CACHE_HOME', 'goreli')
+    monkeypatch.setenv('HOME', str(tmp_path))
+    assert _kullanici_onbellegi() == str(tmp_path / '.cache' / 'nixrad')
@@ -0,0 +1,81 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import yukleme_onbellegi
+from sentetik_dia import dosya_uret
+from yukleme_onbellegi import YuklemeOnbellegi
+
+
+@pytest.fixture
+def yol(tmp_path): return str(tmp_path / 'yukleme.sqlite3')
+
+
+@pytest.fixture(scope='module')
+def dosya(): return dosya_uret('csv-utf8', 40)
+
+
+def _kayit_sayisi(yol):
+    with sqlite3.connect(yol) as b: return b.execute("SELECT COUNT(*) FROM yukleme").fetchone()[0]
+
+
+def test_anahtar_icerige_ve_okuma_turune_baglidir(dosya):
+    o = YuklemeOnbellegi('')
+    ad, veri = dosya
+    assert o.anahtar('a.xlsx', veri) == o.anahtar('b.xls', veri)
+    assert o.anahtar('a.csv', veri) == o.anahtar('B.CSV', veri)
+    assert o.anahtar('a.csv', veri) != o.anahtar('a.xlsx', veri)
+    assert o.anahtar('a.csv', veri) != o.anahtar('a.csv', veri + b'\n')
+
+
+@pytest.mark.parametrize('bicim', ['csv-utf8', 'csv-cp1254', 'xlsx'])
+def test_bellek_ve_disk_isabeti(yol, bicim):
+    dosya = dosya_uret(bicim, 40)
+    ilk = YuklemeOnbellegi(yol)
+    yeni = ilk.cozumle(*dosya)
+    assert yeni.kaynak == 'yeni' and yeni.ham_veri
+    # Dosya adı anahtara girmez (yalnızca CSV / tablo ayrımı)
+    tekrar = ilk.cozumle('baska_ad.csv' if bicim.startswith('csv') else 'baska_ad.xls', dosya[1])
+    assert tekrar.kaynak == 'bellek' and tekrar.ham_veri == yeni.ham_veri
+    # Başka süreç (yeni nesne) aynı dosyayı diskten alır
+    diskten = YuklemeOnbellegi(yol).cozumle(*dosya)
+    assert diskten.kaynak == 'disk'
+    assert (diskten.ham_veri, diskten.malzeme_listesi) == (yeni.ham_veri, yeni.malzeme_listesi)
+    pd.testing.assert_frame_equal(diskten.df, yeni.df)
+
+
+def test_surum_degisince_kayit_kullanilmaz_ve_eskisi_budanir(yol, dosya, monkeypatch):
+    YuklemeOnbellegi(yol).cozumle(*dosya)
+    monkeypatch.setattr(yukleme_onbellegi, 'SEMA_SURUMU', yukleme_onbellegi.SEMA_SURUMU + 1)
+    assert YuklemeOnbellegi(yol).cozumle(*dosya).kaynak == 'yeni'
+    assert _kayit_sayisi(yol) == 1  # aynı anahtar yeni sürümle üzerine yazıldı
+
+    # Başka sürümün kaydı ESKI_SURUM_OMRU dolunca ilk bağlantıda silinir
+    monkeypatch.setattr(yukleme_onbellegi, 'SEMA_SURUMU', yukleme_onbellegi.SEMA_SURUMU + 1)
+    monkeypatch.setattr(yukleme_onbellegi, 'ESKI_SURUM_OMRU', -1)
+    YuklemeOnbellegi(yol).istatistik()
+    assert _kayit_sayisi(yol) == 0
+
+
+def test_bayt_butcesi_en_eski_dosyayi_atar(yol):
+    dosyalar = [dosya_uret('csv-utf8', 40, tohum) for tohum in range(3)]
+    o = YuklemeOnbellegi(yol)
+    for d in dosyalar: o.cozumle(*d)
+    butce = o.istatistik()['disk_bayt'] * 2 // 3
+    o = YuklemeOnbellegi(yol, bayt_butcesi=butce)
+    o.cozumle(*dosya_uret('csv-utf8', 40, 9))
+    assert o.istatistik()['disk_bayt'] <= butce
+    assert YuklemeOnbellegi(yol).cozumle(*dosyalar[0]).kaynak == 'yeni'
+
+
+def test_bos_yol_yalnizca_bellek(dosya):
+    assert YuklemeOnbellegi('').cozumle(*dosya).kaynak == 'yeni'
+    assert YuklemeOnbellegi('').cozumle(*dosya).kaynak == 'yeni'
+    assert YuklemeOnbellegi('').istatistik()['disk_kayit'] is None
+
+
+def test_basliksiz_dosya_da_saklanir(yol):
+    o = YuklemeOnbellegi(yol)
+    assert o.cozumle('a.csv', b'a,b\n1,2\n').df is None
+    assert YuklemeOnbellegi(yol).cozumle('a.csv', b'a,b\n1,2\n') == (None, None, None, 'disk')
@@ -0,0 +1,185 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from hesaplama import etiket_listesi_olustur, proje_toplamlari
+from siparis_analizi import siparisi_analiz_et
+from ice_aktarim import dia_dosyasi_oku
+from konsolidasyon import konsolide_et
+from belgeler import create_cargo_pdf, create_production_pdf, create_thermal_labels_8x12_rotated, create_thermal_labels_zpl, termal_spool_yaz
+
+# =============================================================================
+# TOPLU / ARAYÜZSÜZ ÇALIŞTIRMA
+# Gün sonu siparişlerini Streamlit olmadan işler: Dia dökümlerini okur, aynı
+# analizi yapar ve üç PDF'i diske yazar. İşler süreç havuzuna dağıtılır.
+#
+#   python toplu.py siparisler/            (klasör; müşteri bilgisi <ad>.json)
+#   python toplu.py manifest.json          ([{"dosya": ..., "AD_SOYAD": ...}, ...])
+#   python toplu.py manifest.csv           (dosya,AD_SOYAD,TELEFON,ADRES,IL_ILCE,ODEME_TIPI)
+#   python toplu.py siparisler/ --spool gun_sonu_etiketler.pdf
+#   python toplu.py siparisler/ --konsolide     (ürünler ortak kolilerde; kargo fişi ve etiketler plana göre)
+# =============================================================================
+
+DIA_UZANTILARI = ('.xls', '.xlsx', '.csv')
+MUSTERI_ALANLARI = ['AD_SOYAD', 'TELEFON', 'ADRES', 'IL_ILCE', 'ODEME_TIPI']
+BELGE_ADLARI = {'kargo': "Kargo_Fisi.pdf", 'uretim': "Uretim_ve_Etiketler.pdf", 'termal': "Termal_Etiketler.pdf", 'zpl': "Termal_Etiketler.zpl"}
+TOPLU_BELGELER = ('kargo', 'uretim', 'termal')  # toplu çalıştırmada diske yazılanlar
+
+
+def _musteri(kayit):
+    # Arayüzdeki boş alanlarla aynı varsayılanlar
+    musteri = {k: str(kayit.get(k) or '') for k in MUSTERI_ALANLARI}
+    musteri['ODEME_TIPI'] = musteri['ODEME_TIPI'] or 'ALICI'
+    return musteri
+
+def isleri_topla(girdi):
+    # (dosya yolu, müşteri sözlüğü) listesi
+    if os.path.isdir(girdi):
+        isler = []
+        for ad in sorted(os.listdir(girdi)):
+            yol = os.path.join(girdi, ad)
+            if not ad.lower().endswith(DIA_UZANTILARI) or not os.path.isfile(yol): continue
+            yan_dosya = os.path.splitext(yol)[0] + '.json'
+            kayit = {}
+            if os.path.exists(yan_dosya):
+                with open(yan_dosya, encoding='utf-8') as f: kayit = json.load(f)
+            isler.append((yol, _musteri(kayit)))
+        return isler
+
+    kok = os.path.dirname(os.path.abspath(girdi))
+    if girdi.lower().endswith('.json'):
+        with open(girdi, encoding='utf-8') as f: kayitlar = json.load(f)
+    else:
+        with open(girdi, encoding='utf-8-sig', newline='') as f: kayitlar = list(csv.DictReader(f))
+    return [(os.path.join(kok, k['dosya']), _musteri(k)) for k in kayitlar]
+
+def belge_ureticileri(ham_veri, malzeme_listesi, musteri, konsolide=False):
+    # ({tür: BytesIO döndüren üretici}, kargo koli listesi). Belgeler yalnızca istenince üretilir.
+    # Üretim emri ürün başına etiketle kalır; kargo fişi ve termal etiketler ortak koli planından.
+    toplam_parca, proje_toplam_desi, _ = proje_toplamlari(pd.DataFrame(ham_veri))
+    etiket_listesi = etiket_listesi_olustur(ham_veri)
+    kargo_etiketleri = etiket_listesi
+    if konsolide:
+        plan = konsolide_et(ham_veri)
+        toplam_parca, proje_toplam_desi, kargo_etiketleri = plan.toplam_parca, plan.toplam_desi, plan.etiket_listesi
+    return {
+        'kargo': lambda: create_cargo_pdf(proje_toplam_desi, toplam_parca, musteri, kargo_etiketleri),
+        'uretim': lambda: create_production_pdf(malzeme_listesi, etiket_listesi, musteri),
+        'termal': lambda: create_thermal_labels_8x12_rotated(kargo_etiketleri, musteri, int(toplam_parca)),
+        'zpl': lambda: create_thermal_labels_zpl(kargo_etiketleri, musteri, int(toplam_parca)),
+    }, kargo_etiketleri
+
+def cikti_klasorleri(yollar, cikti_klasoru):
+    # Sipariş başına çıktı klasörü: dosya adı (uzantısız); aynı adı taşıyan dosyalar (a.xls / a.csv)
+    # uzantıyla ayrılır (a_xls / a_csv), yine çakışırsa (farklı klasörlerde a.xls) sıra no eklenir.
+    koklar = [os.path.splitext(os.path.basename(y)) for y in yollar]
+    sayac = Counter(k for k, _ in koklar)
+    adlar = [k if sayac[k] == 1 else f"{k}_{u.lstrip('.').lower() or 'dosya'}" for k, u in koklar]
+    goruldu, sonuc = Counter(), []
+    for ad in adlar:
+        goruldu[ad] += 1
+        sonuc.append(os.path.join(cikti_klasoru, ad if goruldu[ad] == 1 else f"{ad}_{goruldu[ad]}"))
+    return sonuc
+
+def siparis_isle(dosya_yolu, musteri, hedef, ham_veri_dondur=False, konsolide=False):
+    # Tek sipariş; alt süreçte çalışır. Belgeler hedef klasöre yazılır, aşama süreleri saniye cinsinden döner.
+    sureler, t0 = {}, time.perf_counter()
+    t = t0
+    def olc(asama):
+        nonlocal t
+        simdi = time.perf_counter(); sureler[asama] = simdi - t; t = simdi
+
+    with open(dosya_yolu, 'rb') as f:
+        df = dia_dosyasi_oku(dosya_yolu, f)
+    if df is None: raise ValueError("Dosyada 'Stok Adı' başlığı bulunamadı.")
+    olc('okuma')
+
+    ham_veri, malzeme_listesi = siparisi_analiz_et(df)
+    if not ham_veri: raise ValueError("Dosyada radyatör / havlupan satırı yok.")
+    ureticiler, kargo_etiketleri = belge_ureticileri(ham_veri, malzeme_listesi, musteri, konsolide)
+    olc('analiz')
+
+    os.makedirs(hedef, exist_ok=True)
+    for tur in TOPLU_BELGELER:
+        with open(os.path.join(hedef, BELGE_ADLARI[tur]), 'wb') as f: f.write(ureticiler[tur]().getvalue())
+        olc(tur)
+
+    sureler['toplam'] = time.perf_counter() - t0
+    sonuc = {'dosya': dosya_yolu, 'cikti': hedef, 'satir': len(ham_veri), 'etiket': len(kargo_etiketleri), 'sureler': sureler}
+    # Spool için satır bazlı ham_veri döner (koli başına etiket değil); etiketler ana süreçte tembel açılır
+    if ham_veri_dondur: sonuc['ham_veri'] = ham_veri
+    return sonuc
+
+def spool_yaz(sonuclar, musteriler, spool_yolu, konsolide=False):
+    # Tüm siparişlerin termal etiketleri, girdi sırasıyla tek PDF'e akıtılır
+    def siparisler():
+        for sonuc in sonuclar:
+            if konsolide: etiket_listesi = konsolide_et(sonuc['ham_veri']).etiket_listesi
+            else: etiket_listesi = etiket_listesi_olustur(sonuc['ham_veri'])
+            yield etiket_listesi, musteriler[sonuc['dosya']], len(etiket_listesi)
+    with open(spool_yolu, 'wb') as f: termal_spool_yaz(siparisler(), f)
+
+def calistir(isler, cikti_klasoru, isci_sayisi=None, yazdir=print, spool_yolu=None, konsolide=False):
+    baslangic = time.perf_counter()
+    sonuclar, hatalar = [], []
+    with ProcessPoolExecutor(max_workers=isci_sayisi) as havuz:
+        hedefler = cikti_klasorleri([yol for yol, _ in isler], cikti_klasoru)
+        gorevler = {havuz.submit(siparis_isle, yol, musteri, hedef, bool(spool_yolu), konsolide): yol
+                    for (yol, musteri), hedef in zip(isler, hedefler)}
+        for gorev in as_completed(gorevler):
+            yol = gorevler[gorev]
+            try:
+                sonuc = gorev.result()
+            except Exception as e:
+                hatalar.append({'dosya': yol, 'hata': str(e)})
+                yazdir(f"HATA  {os.path.basename(yol)}: {e}")
+                continue
+            sonuclar.append(sonuc)
+            s = sonuc['sureler']
+            yazdir(f"OK    {os.path.basename(yol)}: {sonuc['etiket']} etiket, {s['toplam']:.2f}s "
+                   f"(okuma {s['okuma']:.2f} / analiz {s['analiz']:.2f} / kargo {s['kargo']:.2f} / uretim {s['uretim']:.2f} / termal {s['termal']:.2f})")
+    if spool_yolu and sonuclar:
+        sira = {yol: i for i, (yol, _) in enumerate(isler)}
+        sonuclar.sort(key=lambda s: sira[s['dosya']])
+        t = time.perf_counter()
+        spool_yaz(sonuclar, dict(isler), spool_yolu, konsolide)
+        yazdir(f"SPOOL {spool_yolu}: {sum(s['etiket'] for s in sonuclar)} etiket, {time.perf_counter() - t:.2f}s")
+        for s in sonuclar: s.pop('ham_veri', None)
+    gecen = time.perf_counter() - baslangic
+    ozet = {
+        'siparis': len(sonuclar), 'hata': len(hatalar), 'sure': gecen,
+        'siparis_per_sn': len(sonuclar) / gecen if gecen else 0.0,
+        'etiket_per_sn': sum(s['etiket'] for s in sonuclar) / gecen if gecen else 0.0,
+    }
+    yazdir(f"{ozet['siparis']} sipariş ({ozet['hata']} hata) {gecen:.2f}s — {ozet['siparis_per_sn']:.2f} sipariş/sn, {ozet['etiket_per_sn']:.1f} etiket/sn")
+    return {'ozet': ozet, 'siparisler': sonuclar, 'hatalar': hatalar}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dia dökümlerinden kargo fişi, üretim emri ve termal etiketleri toplu üretir.")
+    parser.add_argument('girdi', help="Dia dosyalarının bulunduğu klasör ya da manifest (.json / .csv)")
+    parser.add_argument('-o', '--cikti', default='cikti', help="PDF'lerin yazılacağı klasör (varsayılan: cikti)")
+    parser.add_argument('-j', '--isci', type=int, default=None, help="Süreç sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument('--rapor', help="Süre raporunun yazılacağı JSON dosyası")
+    parser.add_argument('--spool', help="Tüm siparişlerin termal etiketlerinin birleştirileceği tek PDF")
+    parser.add_argument('--konsolide', action='store_true', help="Ürünleri ortak kolilerde birleştir (desiyi düşürüyorsa)")
+    args = parser.parse_args(argv)
+
+    isler = isleri_topla(args.girdi)
+    if not isler:
+        print("İşlenecek Dia dosyası bulunamadı.", file=sys.stderr)
+        return 1
+    rapor = calistir(isler, args.cikti, args.isci, spool_yolu=args.spool, konsolide=args.konsolide)
+    if args.rapor:
+        with open(args.rapor, 'w', encoding='utf-8') as f: json.dump(rapor, f, ensure_ascii=False, indent=2)
+    return 1 if rapor['hatalar'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
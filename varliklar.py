@@ -0,0 +1,119 @@
+import argparse
+import io
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from olcumleme import arka_plan
+
+# =============================================================================
+# LOGO / GÖRSEL VARLIKLAR
+# Streamlit her etkileşimde app.py'yi baştan çalıştırır; bu modül ise
+# sys.modules içinde kalır, yani buradaki önbellek süreç geneli yaşar.
+# Logo yalnızca paketle gelen yerel kopyadan (assets/nixrad_logo.jpg) okunur;
+# belge üretimi ağa hiç çıkmaz. CDN'deki logo yalnızca komut satırından,
+# dağıtımda elle indirilir (ağ gerekir):
+#
+#   python varliklar.py              (yerel kopya yoksa indirir)
+#   python varliklar.py --guncelle   (yerel kopyanın üzerine yazar)
+# =============================================================================
+
+LOGO_URL = "https://static.ticimax.cloud/74661/Uploads/HeaderTasarim/Header1/b2d2993a-93a3-4b7f-86be-cd5911e270b6.jpg"
+LOGO_YEREL_YOL = os.environ.get(
+    'NIXRAD_LOGO_YOLU',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "nixrad_logo.jpg")
+)
+LOGO_AG_ZAMAN_ASIMI = 10  # saniye; yalnızca komut satırından indirirken
+LOGO_TTL = 6 * 3600  # saniye
+HATA_TTL = 60  # saniye; okunamayan yerel kopya (dosya sonradan konabilir) bu kadar süre sonra yeniden denenir
+
+
+class VarlikOnbellegi:
+    # TTL süreli, öğe sayısı sınırlı önbellek; sınır aşılınca en uzun süredir kullanılmayan atılır.
+    # Başarısız yükleme (None) de saklanır ama yalnızca hata_ttl kadar.
+    def __init__(self, max_oge=16, ttl=LOGO_TTL, hata_ttl=HATA_TTL):
+        self.max_oge, self.ttl, self.hata_ttl = max_oge, ttl, hata_ttl
+        self._veri = OrderedDict()
+        self._kilit = threading.Lock()
+        self.isabet, self.iskalama = 0, 0
+
+    def getir(self, anahtar, yukleyici):
+        with self._kilit:
+            simdi = time.monotonic()
+            kayit = self._veri.get(anahtar)
+            if kayit is not None and (kayit[0] is None or simdi < kayit[0]):
+                self._veri.move_to_end(anahtar)
+                self.isabet += 1
+                return kayit[1]
+            self.iskalama += 1
+            # Yükleme (yerel dosya okuma) kilit altında yapılır: aynı anda gelen istekler ikinci kez çözmez.
+            deger = yukleyici()
+            ttl = self.ttl if deger is not None else min(self.hata_ttl, self.ttl or self.hata_ttl)
+            self._veri[anahtar] = (None if ttl is None else simdi + ttl, deger)
+            self._veri.move_to_end(anahtar)
+            while len(self._veri) > self.max_oge: self._veri.popitem(last=False)
+            return deger
+
+    def temizle(self):
+        with self._kilit: self._veri.clear()
+
+    def istatistik(self):
+        with self._kilit:
+            return {'isabet': self.isabet, 'iskalama': self.iskalama, 'oge': len(self._veri)}
+
+
+varlik_onbellegi = VarlikOnbellegi()
+
+
+def _logo_yukle():
+    with arka_plan.asama('logo') as kayit:
+        try:
+            with open(LOGO_YEREL_YOL, 'rb') as f: veri = f.read()
+        except OSError:
+            veri = None
+        if kayit is not None: kayit.update(bayt=len(veri or b''))
+    if not veri: return None  # Başarısızlık da önbelleğe girer; HATA_TTL dolana kadar dosya yeniden aranmaz.
+    from reportlab.lib.utils import ImageReader
+    try: return ImageReader(io.BytesIO(veri))
+    except Exception: return None
+
+
+def logo_getir():
+    # Tek, paylaşılan ImageReader döner (yerel kopya yoksa ya da okunamazsa None)
+    return varlik_onbellegi.getir('logo', _logo_yukle)
+
+
+def logo_indir(hedef=LOGO_YEREL_YOL):
+    # CDN'deki logoyu hedefe yazar (yalnızca komut satırı); indirilen bayt sayısını döndürür
+    import requests
+    response = requests.get(LOGO_URL, timeout=LOGO_AG_ZAMAN_ASIMI)
+    response.raise_for_status()
+    from PIL import Image
+    Image.open(io.BytesIO(response.content)).verify()  # görsel olmayan yanıt (hata sayfası) yerel kopyayı bozmasın
+    os.makedirs(os.path.dirname(hedef) or '.', exist_ok=True)
+    gecici = hedef + '.tmp'
+    with open(gecici, 'wb') as f: f.write(response.content)
+    os.replace(gecici, hedef)
+    return len(response.content)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Logoyu CDN'den indirip paketle gelen yerel kopyaya (LOGO_YEREL_YOL) yazar.")
+    parser.add_argument('--guncelle', action='store_true', help="Yerel kopya varsa da yeniden indir")
+    args = parser.parse_args(argv)
+    if os.path.exists(LOGO_YEREL_YOL) and not args.guncelle:
+        print(f"Yerel kopya zaten var: {LOGO_YEREL_YOL} (yenilemek için --guncelle)")
+        return 0
+    try:
+        bayt = logo_indir()
+    except Exception as e:
+        print(f"Logo indirilemedi ({LOGO_URL}): {e}")
+        return 1
+    print(f"{bayt} bayt -> {LOGO_YEREL_YOL}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from onbellek import KALICI_ONBELLEK_KLASORU
+
+# =============================================================================
+# YÜKLEME ÖNBELLEĞİ (İÇERİK ÖZETİ)
+# Yüklenen Dia dosyası baytlarının özetiyle anahtarlanır. Okunan 'Stok Adı' /
+# 'Miktar' çerçevesi ve analiz sonucu (ham_veri, malzeme_listesi) saklanır.
+# Aynı dosya yeniden analiz edildiğinde ya da başka bir operatör aynı dosyayı
+# yüklediğinde xls / xlsx okuma ve sınıflandırma hiç yapılmaz.
+# İki katmanlıdır:
+#   - bellek: süreç geneli, öğe sayısı sınırlı LRU
+#   - disk (isteğe bağlı): SQLite, bayt bütçeli, oturumlar ve süreçler arasında paylaşılır
+# Anahtara sabitlerin özeti (stok_onbellegi.sabitler_surumu) girer. Başka sürümün
+# kayıtları bayt bütçesiyle ya da ESKI_SURUM_OMRU boyunca açılmayınca silinir;
+# aynı dosyayı kullanan eski sürüm süreçlerinin kayıtları hemen kaybolmaz.
+# =============================================================================
+
+YUKLEME_ONBELLEK_YOLU = os.environ.get(
+    'NIXRAD_YUKLEME_ONBELLEGI', os.path.join(KALICI_ONBELLEK_KLASORU, "yukleme.sqlite3")
+)  # boş bırakılırsa yalnızca bellek katmanı kullanılır
+SEMA_SURUMU = 2  # ice_aktarim / siparisi_analiz_et çıktısı değişirse artırılır
+BELLEK_OGE = 32
+DISK_BAYT_BUTCESI = 256 * 1024 * 1024
+KILIT_BEKLEME = 5.0
+ESKI_SURUM_OMRU = 7 * 86400  # saniye; başka sürümün bu süre açılmayan kayıtları silinir
+
+# kaynak: 'bellek', 'disk' ya da 'yeni'; dosyada başlık yoksa df / ham_veri / malzeme_listesi None
+Yukleme = namedtuple('Yukleme', 'df ham_veri malzeme_listesi kaynak')
+
+
+def _cerceve(kayit):
+    import pandas as pd
+    if kayit is None: return None
+    return pd.DataFrame({'Stok Adı': pd.Series(kayit['Stok Adı'], dtype=object), 'Miktar': pd.Series(kayit['Miktar'], dtype=object)})
+
+
+class YuklemeOnbellegi:
+    def __init__(self, yol=YUKLEME_ONBELLEK_YOLU, max_oge=BELLEK_OGE, bayt_butcesi=DISK_BAYT_BUTCESI):
+        self.yol, self.max_oge, self.bayt_butcesi = yol, max_oge, bayt_butcesi
+        self._surum = None
+        self._veri = OrderedDict()
+        self._kilit = threading.Lock()
+        self._yerel = threading.local()
+        self._budandi = False
+        self.devre_disi = not yol
+        self.bellek_isabet, self.disk_isabet, self.iskalama = 0, 0, 0
+
+    @property
+    def surum(self):
+        # Sabitler özeti stok_onbellegi'nde (pandas yükler); açılışı yavaşlatmamak için ilk kullanımda alınır
+        if self._surum is None:
+            from stok_onbellegi import sabitler_surumu
+            self._surum = f"{SEMA_SURUMU}-{sabitler_surumu()}"
+        return self._surum
+
+    def anahtar(self, dosya_adi, veri):
+        # CSV uzantısına göre okunur (ice_aktarim), diğerleri içerikten tanınır; uzantı türü anahtara girer
+        tur = 'csv' if dosya_adi.lower().endswith('.csv') else 'tablo'
+        return f"{tur}:{hashlib.blake2b(veri, digest_size=16).hexdigest()}"
+
+    def _baglanti(self):
+        b = getattr(self._yerel, 'baglanti', None)
+        if b is not None and self._yerel.pid == os.getpid(): return b
+        os.makedirs(os.path.dirname(self.yol) or '.', exist_ok=True)
+        b = sqlite3.connect(self.yol, timeout=KILIT_BEKLEME)
+        b.execute("PRAGMA journal_mode=WAL")
+        b.execute("PRAGMA synchronous=NORMAL")
+        b.execute("CREATE TABLE IF NOT EXISTS yukleme (anahtar TEXT PRIMARY KEY, surum TEXT NOT NULL, erisim REAL NOT NULL, boyut INTEGER NOT NULL, veri TEXT NOT NULL)")
+        with self._kilit:
+            if not self._budandi:
+                with b: b.execute("DELETE FROM yukleme WHERE surum != ? AND erisim < ?", (self.surum, time.time() - ESKI_SURUM_OMRU))
+                self._budandi = True
+        self._yerel.baglanti, self._yerel.pid = b, os.getpid()
+        return b
+
+    def _bellege_koy(self, anahtar, yukleme):
+        with self._kilit:
+            self._veri[anahtar] = yukleme
+            self._veri.move_to_end(anahtar)
+            while len(self._veri) > self.max_oge: self._veri.popitem(last=False)
+
+    def _diskten_oku(self, anahtar):
+        b = self._baglanti()
+        satir = b.execute("SELECT veri FROM yukleme WHERE anahtar = ? AND surum = ?", (anahtar, self.surum)).fetchone()
+        if satir is None: return None
+        with b: b.execute("UPDATE yukleme SET erisim = ? WHERE anahtar = ?", (time.time(), anahtar))
+        kayit = json.loads(satir[0])
+        return Yukleme(_cerceve(kayit['df']), kayit['ham_veri'], kayit['malzeme_listesi'], 'disk')
+
+    def _diske_yaz(self, anahtar, yukleme):
+        df = None if yukleme.df is None else {s: yukleme.df[s].tolist() for s in ('Stok Adı', 'Miktar')}
+        veri = json.dumps({'df': df, 'ham_veri': yukleme.ham_veri, 'malzeme_listesi': yukleme.malzeme_listesi}, ensure_ascii=False, default=str)
+        if len(veri) > self.bayt_butcesi: return
+        b = self._baglanti()
+        with b:
+            b.execute("INSERT OR REPLACE INTO yukleme (anahtar, surum, erisim, boyut, veri) VALUES (?, ?, ?, ?, ?)",
+                      (anahtar, self.surum, time.time(), len(veri), veri))
+            # Bütçe aşılırsa en uzun süredir açılmayan dosyalar silinir
+            toplam = b.execute("SELECT COALESCE(SUM(boyut), 0) FROM yukleme").fetchone()[0]
+            for eski, boyut in b.execute("SELECT anahtar, boyut FROM yukleme ORDER BY erisim").fetchall():
+                if toplam <= self.bayt_butcesi: break
+                b.execute("DELETE FROM yukleme WHERE anahtar = ?", (eski,))
+                toplam -= boyut
+
+    def bul(self, anahtar):
+        with self._kilit:
+            yukleme = self._veri.get(anahtar)
+            if yukleme is not None:
+                self._veri.move_to_end(anahtar)
+                self.bellek_isabet += 1
+                return yukleme._replace(kaynak='bellek')
+        yukleme = None
+        if not self.devre_disi:
+            try: yukleme = self._diskten_oku(anahtar)
+            except sqlite3.Error: self.devre_disi = True  # disk sorunu analizi durdurmaz
+        if yukleme is None:
+            self.iskalama += 1
+            return None
+        self.disk_isabet += 1
+        self._bellege_koy(anahtar, yukleme)
+        return yukleme
+
+    def koy(self, anahtar, df, ham_veri, malzeme_listesi):
+        yukleme = Yukleme(df, ham_veri, malzeme_listesi, 'yeni')
+        self._bellege_koy(anahtar, yukleme)
+        if not self.devre_disi:
+            try: self._diske_yaz(anahtar, yukleme)
+            except sqlite3.Error: self.devre_disi = True
+        return yukleme
+
+    def cozumle(self, dosya_adi, veri):
+        # Okuma + analiz; aynı baytlar daha önce işlendiyse önbellekten döner
+        anahtar = self.anahtar(dosya_adi, veri)
+        yukleme = self.bul(anahtar)
+        if yukleme is not None: return yukleme
+        import io
+        from ice_aktarim import dia_dosyasi_oku
+        from siparis_analizi import siparisi_analiz_et
+        df = dia_dosyasi_oku(dosya_adi, io.BytesIO(veri))
+        ham_veri, malzeme_listesi = siparisi_analiz_et(df) if df is not None else (None, None)
+        return self.koy(anahtar, df, ham_veri, malzeme_listesi)
+
+    def temizle(self):
+        with self._kilit: self._veri.clear()
+
+    def istatistik(self):
+        kayit = None
+        if not self.devre_disi:
+            try: kayit = self._baglanti().execute("SELECT COUNT(*), COALESCE(SUM(boyut), 0) FROM yukleme").fetchone()
+            except sqlite3.Error: pass
+        return {'bellek_isabet': self.bellek_isabet, 'disk_isabet': self.disk_isabet, 'iskalama': self.iskalama, 'bellek_oge': len(self._veri),
+                'disk_kayit': kayit[0] if kayit else None, 'disk_bayt': kayit[1] if kayit else None}
+
+
+yukleme_onbellegi = YuklemeOnbellegi()
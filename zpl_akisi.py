@@ -0,0 +1,156 @@
+from metin_sigdirma import metin_genisligi
+from pdf_akisi import _MetinNesnesi
+
+# =============================================================================
+# ZPL YAZICI (ZEBRA TERMAL YAZICILAR)
+# Termal etiketin çizim fonksiyonları (drawString, line, beginText, drawImage
+# ...) burada PDF yerine ZPL komutlarına çevrilir; yerleşim PDF ile aynıdır.
+# Çizim alanı yatay (120x80 mm) tanımlıdır, etiket dikey (80x120 mm) basılır:
+# koordinatlar 90° döndürülür ve metin 'B' yönünde (aşağıdan yukarı) yazılır.
+# Değişmeyen kısım (şablon) yazıcıda bir kez ^DF formatı olarak saklanır; her
+# etiket ^XF ile bu formatı çağırıp yalnızca koli alanlarını ekler. Logo bir kez
+# ~DG grafiğine çevrilir.
+# =============================================================================
+
+NOKTA_MM = 8  # 203 dpi
+PT_MM = 25.4 / 72
+
+
+def _nokta(pt): return int(round(pt * PT_MM * NOKTA_MM))
+
+
+def _alan_verisi(text, blok=False):
+    # ^ ve ~ ZPL komut karakterleridir; içeren metin ^FH ile onaltılık kaçışla yazılır.
+    # ^FB bloğunda \ da özeldir (\& satır sonu), çift yazılır.
+    text = str(text)
+    if blok: text = text.replace('\\', '\\\\')
+    if not any(ch in text for ch in '^~_'): return '^FD' + text + '^FS'
+    return '^FH_^FD' + text.replace('_', '_5F').replace('^', '_5E').replace('~', '_7E') + '^FS'
+
+
+_grafikler = {}
+
+def grafik_donustur(image, genislik, yukseklik):
+    # ImageReader -> (toplam bayt, satır baytı, onaltılık veri); 90° döndürülmüş, 1 bit.
+    # Aynı görsel ve boyut için süreç boyunca bir kez hesaplanır.
+    anahtar = (id(image), genislik, yukseklik)
+    kayit = _grafikler.get(anahtar)
+    if kayit is None:
+        from PIL import Image
+        g, y = image.getSize()
+        # getRGBData gri görselde 1, CMYK'da 4 bayt/piksel döndürür; gerçek kip sonra image.mode'dadır
+        veri = bytes(image.getRGBData())
+        resim = Image.frombytes(image.mode, (g, y), veri).convert('L')
+        resim = resim.resize((genislik, yukseklik)).rotate(90, expand=True)
+        satir_bayt = (resim.width + 7) // 8
+        piksel = resim.load()
+        satirlar = []
+        for r in range(resim.height):
+            bitler = 0
+            for s in range(satir_bayt * 8):
+                siyah = s < resim.width and piksel[s, r] < 128
+                bitler = (bitler << 1) | siyah
+            satirlar.append(f"{bitler:0{satir_bayt * 2}X}")
+        kayit = _grafikler[anahtar] = (image, satir_bayt * resim.height, satir_bayt, ''.join(satirlar))
+    return kayit[1:]
+
+
+class ZplCizim:
+    def __init__(self, yazici, alan):
+        self._yazici = yazici
+        self.alan_g, self.alan_y = alan
+        self.komutlar = []
+        self._font, self._size = 'Helvetica', 12
+        self._kalinlik = 1
+
+    def _konum(self, x, y):
+        # Yatay alandaki (x, y) noktası -> dikey etiketteki (sütun, satır) noktası
+        return _nokta(self.alan_y - y), _nokta(self.alan_g - x)
+
+    def setFont(self, font, size, leading=None): self._font, self._size = font, size
+
+    def setLineWidth(self, w): self._kalinlik = max(1, _nokta(w))
+
+    def stringWidth(self, text, font=None, size=None):
+        return metin_genisligi(text, font or self._font, size if size is not None else self._size)
+
+    def line(self, x1, y1, x2, y2):
+        t = self._kalinlik
+        if y1 == y2:
+            # Yatay alandaki yatay çizgi etikette dikey çizgidir
+            sutun, _ = self._konum(0, y1)
+            _, ust = self._konum(max(x1, x2), 0)
+            self.komutlar.append(f"^FO{sutun - t // 2},{ust}^GB{t},{_nokta(abs(x2 - x1))},{t}^FS")
+        elif x1 == x2:
+            sol, _ = self._konum(0, max(y1, y2))
+            _, satir = self._konum(x1, 0)
+            self.komutlar.append(f"^FO{sol},{satir - t // 2}^GB{_nokta(abs(y2 - y1))},{t},{t}^FS")
+        else:
+            raise ValueError("ZPL çizimi yalnızca yatay / dikey çizgi destekler")
+
+    def drawString(self, x, y, text):
+        sutun, satir = self._konum(x, y)
+        h = _nokta(self._size)
+        self.komutlar.append(f"^FT{sutun},{satir}^A0B,{h},{h}" + _alan_verisi(text))
+
+    def _blok(self, x, y, genislik, hiza, text):
+        # Hizalamayı yazıcı yapar (tek satırlık ^FB): metin ^A0 (CG Triumvirate) ile basılır,
+        # Helvetica ölçüleriyle hesaplanan bir başlangıç noktası yazıcıda kayardı
+        sutun, satir = self._konum(x, y)
+        h = _nokta(self._size)
+        self.komutlar.append(f"^FT{sutun},{satir}^A0B,{h},{h}^FB{_nokta(genislik)},1,0,{hiza}" + _alan_verisi(text, blok=True))
+
+    def drawRightString(self, x, y, text): self._blok(0, y, x, 'R', text)
+
+    def drawCentredString(self, x, y, text):
+        yari = min(x, self.alan_g - x)
+        self._blok(x - yari, y, 2 * yari, 'C', text)
+
+    def beginText(self, x=0, y=0): return _MetinNesnesi(x, y)
+
+    def drawText(self, nesne):
+        font, size = nesne.font or self._font, nesne.size if nesne.size is not None else self._size
+        leading = nesne.leading if nesne.leading is not None else size * 1.2
+        self.setFont(font, size)
+        for i, s in enumerate(nesne.satirlar): self.drawString(nesne.x, nesne.y - i * leading, s)
+
+    def drawImage(self, image, x, y, width=None, height=None, mask=None):
+        g, y_ = image.getSize()
+        width, height = width or g, height or y_
+        # Görselin dikey etiketteki sol üst köşesi
+        sol, ust = self._konum(x + width, y + height)
+        ad = self._yazici._grafik_adi(image, _nokta(width), _nokta(height))
+        self.komutlar.append(f"^FO{sol},{ust}^XGR:{ad}.GRF,1,1^FS")
+
+
+class ZplYazici:
+    # hedef: write(bytes) metodu olan herhangi bir nesne; etiketler üretildikçe yazılır
+    def __init__(self, hedef, alan):
+        self._hedef = hedef
+        self.alan = alan
+        self._grafikler = {}
+        self._bekleyen_grafikler = []
+
+    def _yaz(self, metin): self._hedef.write(metin.encode('utf-8'))
+
+    def _grafik_adi(self, image, genislik, yukseklik):
+        anahtar = (id(image), genislik, yukseklik)
+        if anahtar not in self._grafikler:
+            ad = f"NXG{len(self._grafikler) + 1}"
+            toplam, satir_bayt, veri = grafik_donustur(image, genislik, yukseklik)
+            self._grafikler[anahtar] = ad
+            self._bekleyen_grafikler.append(f"~DGR:{ad}.GRF,{toplam},{satir_bayt},{veri}\n")
+        return self._grafikler[anahtar]
+
+    def format_tanimla(self, ad, ciz):
+        # Tüm etiketlerde aynı kalan çizim yazıcı belleğine R:<ad>.ZPL formatı olarak kaydedilir
+        cizim = ZplCizim(self, self.alan)
+        ciz(cizim)
+        for g in self._bekleyen_grafikler: self._yaz(g)
+        self._bekleyen_grafikler.clear()
+        self._yaz(f"^XA^DFR:{ad}.ZPL^FS^PW{_nokta(self.alan[1])}^LL{_nokta(self.alan[0])}^CI28\n" + '\n'.join(cizim.komutlar) + "\n^XZ\n")
+
+    def etiket_yaz(self, format_adi, ciz):
+        cizim = ZplCizim(self, self.alan)
+        ciz(cizim)
+        self._yaz(f"^XA^XFR:{format_adi}.ZPL^FS" + ''.join(cizim.komutlar) + "^XZ\n")
@@ -0,0 +1,101 @@
+import argparse
+import difflib
+import io
+import os
+import sys
+
+from hesaplama import etiket_listesi_olustur
+
+# =============================================================================
+# ZPL ALTIN DOSYA KARŞILAŞTIRMASI
+# Sabit örnek siparişlerin ZPL çıktısı üretilir ve altin_zpl/ altındaki kayıtlı
+# dosyalarla birebir karşılaştırılır. Yazıcı gerekmez, ağa çıkılmaz. Logolu
+# örnek gerçek logo yerine altin_zpl/ornek_logo.png'yi çizer; böylece görselin
+# ~DG grafiğine çevrilmesi (1 bit, 90° döndürme, ^XG çağrısı) da karşılaştırılır.
+# Etiketteki logo genişliği 8'in katı olduğundan satır dolgusu ayrı küçük bir
+# örnekle (grafik_dolgu) sınanır. Yerleşim bilerek değiştirildiyse dosyalar
+# --guncelle ile yenilenir.
+#
+#   python zpl_dogrula.py
+#   python zpl_dogrula.py --guncelle
+# =============================================================================
+
+KOK = os.path.dirname(os.path.abspath(__file__))
+ALTIN_KLASOR = os.path.join(KOK, 'altin_zpl')
+ORNEK_LOGO = os.path.join(ALTIN_KLASOR, 'ornek_logo.png')
+
+# ad -> (müşteri bilgileri, [(Ürün, Ölçü, Birim Desi, Adet)])
+ORNEKLER = {
+    'kisa_adres': (
+        {'AD_SOYAD': 'Ahmet Yılmaz', 'TELEFON': '0532 111 22 33', 'ADRES': 'Atatürk Mah. 12. Sok. No: 5',
+         'IL_ILCE': 'Atakum / Samsun', 'ODEME_TIPI': 'ALICI'},
+        [('NIRVANA', '600/1000', 16.7, 2), ('LİZYANTUS HAVLUPAN', '500/700', 5.45, 1)],
+    ),
+    'uzun_adres': (
+        {'AD_SOYAD': 'Örnek İnşaat Taahhüt Mühendislik Sanayi ve Ticaret Ltd. Şti.', 'TELEFON': '0555 555 55 55',
+         'ADRES': 'Cumhuriyet Mah. Gazi Mustafa Kemal Paşa Bulvarı Şehit Öğretmen Ayşe Çiğdem Sokak No: 124/7 '
+                  'Kat: 3 Daire: 12<br/>Merkez Şantiye Ofisi Yanı, Güneş Apartmanı Arka Girişi',
+         'IL_ILCE': 'Kadıköy / İstanbul', 'ODEME_TIPI': 'GÖNDERİCİ'},
+        [('DELUXE ÇİFT PANEL DİKEY TASARIM RADYATÖR ANTRASİT', '1800/450', 22.15, 3)],
+    ),
+    'ozel_karakter': (
+        {'AD_SOYAD': 'Şule_Çelik ^ ~Test', 'ADRES': 'Adres_Satırı ^FS ~JA', 'ODEME_TIPI': 'ALICI'},
+        [('PAPATYA', '500/1000', 8.4, 1)],
+    ),
+}
+# logolu altın dosya adı -> ORNEKLER'deki sipariş
+LOGOLU_ORNEKLER = {'logolu': 'kisa_adres'}
+DOLGU_ORNEGI = 'grafik_dolgu'
+
+
+def _dolgu_zpl():
+    # 13 pt yükseklik döndürülünce 37 nokta genişlik olur: her satırın son baytında 3 dolgu biti
+    from reportlab.lib.utils import ImageReader
+    from zpl_akisi import ZplYazici
+    hedef = io.BytesIO()
+    ZplYazici(hedef, (60, 40)).format_tanimla('NXGRAFIK', lambda c: c.drawImage(ImageReader(ORNEK_LOGO), 5, 5, width=30, height=13))
+    return hedef.getvalue().decode('utf-8')
+
+
+def ornek_zpl(ad):
+    if ad == DOLGU_ORNEGI: return _dolgu_zpl()
+    from belgeler import create_thermal_labels_zpl
+    logo = False
+    if ad in LOGOLU_ORNEKLER:
+        from reportlab.lib.utils import ImageReader
+        ad, logo = LOGOLU_ORNEKLER[ad], ImageReader(ORNEK_LOGO)
+    musteri, satirlar = ORNEKLER[ad]
+    etiketler = etiket_listesi_olustur([{'Ürün': u, 'Ölçü': o, 'Birim Desi': d, 'Adet': a} for u, o, d, a in satirlar])
+    return create_thermal_labels_zpl(etiketler, musteri, len(etiketler), logo=logo).getvalue().decode('utf-8')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Termal etiket ZPL çıktısını kayıtlı altın dosyalarla karşılaştırır.")
+    parser.add_argument('--guncelle', action='store_true', help="Altın dosyaları mevcut çıktıyla yeniden yaz")
+    args = parser.parse_args(argv)
+
+    farkli = 0
+    for ad in [*ORNEKLER, *LOGOLU_ORNEKLER, DOLGU_ORNEGI]:
+        yol = os.path.join(ALTIN_KLASOR, f"{ad}.zpl")
+        uretilen = ornek_zpl(ad)
+        if args.guncelle:
+            os.makedirs(ALTIN_KLASOR, exist_ok=True)
+            with open(yol, 'w', encoding='utf-8', newline='') as f: f.write(uretilen)
+            print(f"yazıldı   {ad}")
+            continue
+        try:
+            with open(yol, encoding='utf-8', newline='') as f: altin = f.read()
+        except FileNotFoundError:
+            altin = ''
+        if altin == uretilen:
+            print(f"aynı      {ad}")
+            continue
+        farkli += 1
+        print(f"FARKLI    {ad}")
+        fark = difflib.unified_diff(altin.splitlines(), uretilen.splitlines(), f"altin_zpl/{ad}.zpl", 'uretilen', lineterm='', n=1)
+        for satir in list(fark)[:40]: print(f"  {satir}")
+    return 1 if farkli else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())